@@ -1,7 +1,7 @@
 from crewai import Agent
 
 
-def create_analytics_agent():
+def create_analytics_agent(llm=None):
     return Agent(
         role="Campaign Analytics Expert",
         goal="Analyze campaign performance metrics and identify trends and opportunities",
@@ -10,5 +10,6 @@ You've analyzed thousands of campaigns and can spot patterns that others miss.
 You track CTR, CPC, conversion rates, and ROI with precision. You identify
 high-performing and underperforming campaigns and explain why.""",
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        llm=llm,
     )
@@ -1,7 +1,7 @@
 from crewai import Agent
 
 
-def create_bid_optimizer():
+def create_bid_optimizer(llm=None):
     return Agent(
         role="Bid Optimization Specialist",
         goal="Optimize ad bids to maximize ROI while staying within budget constraints",
@@ -10,5 +10,6 @@ You've optimized billions in ad spend and know exactly when to increase or decre
 for maximum campaign performance. You analyze bid patterns, competition, and conversion data.
 You provide specific bid adjustment recommendations with ROI projections.""",
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        llm=llm,
     )
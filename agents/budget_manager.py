@@ -1,7 +1,7 @@
 from crewai import Agent
 
 
-def create_budget_manager():
+def create_budget_manager(llm=None):
     return Agent(
         role="Budget Allocation Strategist",
         goal="Allocate budget optimally across campaigns to maximize overall ROI",
@@ -10,5 +10,6 @@ You've managed millions in ad spend and know how to balance risk and reward.
 You redistribute budget from underperforming to high-performing campaigns.
 You provide specific dollar amounts to reallocate with expected impact.""",
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        llm=llm,
     )
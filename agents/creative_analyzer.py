@@ -1,7 +1,7 @@
 from crewai import Agent
 
 
-def create_creative_analyzer():
+def create_creative_analyzer(llm=None):
     return Agent(
         role="Ad Creative Performance Analyst",
         goal="Evaluate ad creative effectiveness and recommend improvements",
@@ -10,5 +10,6 @@ You've A/B tested thousands of ad variations and know which elements drive engag
 You analyze headlines, images, copy, and CTAs to optimize creative performance.
 You provide actionable recommendations for creative improvements.""",
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        llm=llm,
     )
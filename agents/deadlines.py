@@ -0,0 +1,175 @@
+"""
+Deadlines and cancellation for crew runs
+
+A run carries a RunControl: an overall deadline plus a cancel flag. It
+travels with the run in a context variable (into crewai's worker threads
+too, see crew._submit) and is checked before every LLM call, so a run that
+is cancelled or out of time stops at its next call instead of burning
+tokens to the end. Each task also gets its own deadline; a task that
+overruns it is abandoned and reported as timed out, and the run carries on
+with what the other tasks produced.
+
+    CREW_DEADLINE_SECONDS      whole-run deadline (default 900)
+    AGENT_DEADLINE_SECONDS     per-task deadline (default 300, 0 disables)
+"""
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from monitoring.profiling import profile_thread
+
+CREW_DEADLINE_SECONDS = float(os.getenv("CREW_DEADLINE_SECONDS", "900"))
+AGENT_DEADLINE_SECONDS = float(os.getenv("AGENT_DEADLINE_SECONDS", "300"))
+
+# How often a waiting run re-checks for cancellation
+POLL_INTERVAL = 0.25
+
+_current_run = contextvars.ContextVar("run_control", default=None)
+
+
+class RunCancelled(RuntimeError):
+    """The run (or one of its tasks) was stopped before it finished"""
+
+    def __init__(self, reason="cancelled"):
+        super().__init__(f"Run stopped: {reason}")
+        self.reason = reason
+
+    def __reduce__(self):
+        # Picklable with its reason, e.g. when raised in a crew worker process
+        return type(self), (self.reason,)
+
+
+class DeadlineExceeded(RunCancelled):
+    """The run or task ran out of time"""
+
+    def __init__(self):
+        super().__init__("deadline")
+
+    def __reduce__(self):
+        return type(self), ()
+
+
+class RunControl:
+    """
+    Deadline and cancel flag shared by everything one run does
+
+    Args:
+        timeout: Seconds the run may take (no deadline if None or 0)
+        task_timeout: Seconds each task may take (AGENT_DEADLINE_SECONDS if None)
+        parent: Enclosing control; its deadline and cancellation apply too
+    """
+
+    def __init__(self, timeout=None, task_timeout=None, parent=None):
+        self.parent = parent
+        self.deadline = time.monotonic() + timeout if timeout else None
+        if parent is not None and parent.deadline is not None:
+            self.deadline = min(self.deadline or parent.deadline, parent.deadline)
+        self.task_timeout = AGENT_DEADLINE_SECONDS if task_timeout is None else task_timeout
+        self._reason = None
+
+    def cancel(self, reason="cancelled"):
+        if self._reason is None:
+            self._reason = reason
+
+    @property
+    def reason(self):
+        """Why the run must stop ("deadline", "client_disconnected", ...), or None"""
+        if self._reason is not None:
+            return self._reason
+        if self.parent is not None and self.parent.reason is not None:
+            return self.parent.reason
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "deadline"
+        return None
+
+    def remaining(self):
+        """Seconds left before the deadline (None if there is none)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self):
+        """
+        Raises:
+            DeadlineExceeded: If the deadline has passed
+            RunCancelled: If the run was cancelled
+        """
+        reason = self.reason
+        if reason == "deadline":
+            raise DeadlineExceeded()
+        if reason is not None:
+            raise RunCancelled(reason)
+
+
+def current_run():
+    """RunControl of the run in progress, or None outside a run"""
+    return _current_run.get()
+
+
+@contextmanager
+def run_control(control):
+    """Make ``control`` govern the enclosed code (and threads it submits)"""
+    token = _current_run.set(control)
+    try:
+        yield control
+    finally:
+        _current_run.reset(token)
+
+
+def check_current_run():
+    """Raise if the run in progress must stop; no-op outside a run"""
+    control = current_run()
+    if control is not None:
+        control.check()
+
+
+def call_with_deadline(fn, *args, timeout=None, **kwargs):
+    """
+    Call ``fn`` in a worker thread, giving up after ``timeout`` seconds
+
+    The call also gives up when the enclosing run is cancelled or out of
+    time. A worker that is given up on is not killed (Python cannot) but
+    its run is cancelled, so it stops at its next LLM call.
+
+    Raises:
+        DeadlineExceeded / RunCancelled: If the call was given up on
+    """
+    control = RunControl(timeout, parent=current_run())
+    if control.deadline is None and control.parent is None:
+        return fn(*args, **kwargs)
+    control.check()
+
+    outcome = {}
+    done = threading.Event()
+
+    def work():
+        _current_run.set(control)
+        try:
+            with profile_thread():
+                outcome["value"] = fn(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    worker = threading.Thread(
+        target=contextvars.copy_context().run, args=(work,), name="crew-task", daemon=True
+    )
+    worker.start()
+    while not done.wait(POLL_INTERVAL):
+        reason = control.reason
+        if reason is not None:
+            control.cancel(reason)
+            control.check()
+
+    if "error" in outcome:
+        # An LLM call refused because the run had to stop surfaces as some
+        # crewai error; report the stop instead
+        try:
+            control.check()
+        except RunCancelled as stop:
+            raise stop from outcome["error"]
+        raise outcome["error"]
+    return outcome["value"]
@@ -0,0 +1,98 @@
+"""
+Per-agent LLM model routing
+
+Each agent can run on its own model, e.g. a small fast model for analytics
+and creative review and a stronger one for the orchestrator. Defaults come
+from the environment and can be overridden per request:
+
+    LLM_MODEL                  default for every agent (crewai's default if unset)
+    LLM_MODEL_ANALYTICS        per-agent override; likewise _BID, _BUDGET,
+                               _CREATIVE and _ORCHESTRATION
+    ALLOWED_MODELS             comma-separated models requests may choose
+                               (any model if unset)
+
+The model name "stub" selects a canned local LLM (agents.stub_llm) for
+tests and load tests.
+"""
+import os
+import threading
+
+AGENT_KEYS = ("analytics", "bid", "budget", "creative", "orchestration")
+
+_llm_cache = {}
+_llm_cache_lock = threading.Lock()
+
+
+def configured_models():
+    """Model per agent from the environment; None means crewai's default"""
+    default = os.getenv("LLM_MODEL") or None
+    return {key: os.getenv(f"LLM_MODEL_{key.upper()}") or default for key in AGENT_KEYS}
+
+
+def allowed_models():
+    """Models a request may route to, or None if any model is allowed"""
+    value = os.getenv("ALLOWED_MODELS", "")
+    models = {m.strip() for m in value.split(",") if m.strip()}
+    return models or None
+
+
+def validate_overrides(overrides):
+    """
+    Check per-request model overrides
+
+    Raises:
+        ValueError: For unknown agents or models outside ALLOWED_MODELS
+    """
+    unknown = set(overrides or {}) - set(AGENT_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown agents in models: {sorted(unknown)}")
+    allowed = allowed_models()
+    if allowed is not None:
+        rejected = {m for m in (overrides or {}).values() if m not in allowed}
+        if rejected:
+            raise ValueError(f"Models not allowed: {sorted(rejected)}")
+
+
+def resolve_models(overrides=None):
+    """
+    Final model per agent for one run
+
+    Args:
+        overrides: Optional mapping of agent key -> model for this request
+
+    Returns:
+        dict: Agent key -> model name (None for crewai's default)
+    """
+    validate_overrides(overrides)
+    models = configured_models()
+    models.update({k: v for k, v in (overrides or {}).items() if v})
+    return models
+
+
+def get_llm(model):
+    """
+    Shared LLM client for ``model``, built once per process, whose calls
+    retry rate-limit and transient errors (see agents.rate_limiter)
+
+    Returns:
+        LLM instance, or None for crewai's default model
+    """
+    if not model:
+        return None
+    with _llm_cache_lock:
+        if model not in _llm_cache:
+            if model == "stub":
+                from agents.stub_llm import StubLLM as LLM
+            else:
+                from crewai import LLM
+
+            from agents.rate_limiter import retry_llm_calls
+
+            _llm_cache[model] = retry_llm_calls(LLM(model=model))
+        return _llm_cache[model]
+
+
+def model_name(agent):
+    """Name of the model an agent is currently running on"""
+    llm = agent.llm
+    return getattr(llm, "model", None) or str(llm)
@@ -1,7 +1,7 @@
 from crewai import Agent
 
 
-def create_orchestrator():
+def create_orchestrator(llm=None):
     return Agent(
         role="Campaign Orchestration Lead",
         goal="Coordinate all agents to deliver comprehensive campaign optimization strategy",
@@ -10,5 +10,6 @@ You synthesize insights from bid optimizers, analysts, budget managers, and crea
 to create comprehensive campaign optimization strategies. You prioritize recommendations
 and create actionable implementation roadmaps.""",
         verbose=True,
-        allow_delegation=True
+        allow_delegation=True,
+        llm=llm,
     )
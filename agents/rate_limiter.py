@@ -0,0 +1,392 @@
+"""
+Process-wide rate limiting and retries for LLM calls
+
+Every LLM call made by any crew in this process first takes a request and
+its estimated tokens from shared token buckets (requests/min, tokens/min).
+Callers queue by priority, so interactive optimizations go ahead of batch
+work when the buckets run dry. Failed calls are retried one LLM call at a
+time (retry_llm_calls). Rate-limit answers from the provider pause all
+callers for the advertised time, and repeated hard failures open a circuit
+breaker so runs fail fast instead of burning their deadline.
+"""
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from agents.deadlines import RunCancelled, check_current_run, current_run
+from monitoring.metrics import (
+    llm_circuit_open,
+    llm_queue_depth,
+    llm_rate_limit_wait,
+    llm_retries,
+)
+
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "500"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "200000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+# Lower runs first
+PRIORITIES = {"interactive": 0, "batch": 10}
+
+_current_priority = contextvars.ContextVar("llm_priority", default="interactive")
+
+
+@contextmanager
+def llm_priority(priority):
+    """Run the enclosed LLM calls (including crewai's worker threads) at ``priority``"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the breaker is open"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"LLM circuit breaker open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        return type(self), (self.retry_after,)
+
+
+class TokenBucket:
+    """Bucket holding up to ``per_minute`` units, refilled continuously"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until ``amount`` units are available (0 if they are now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount):
+        # May go negative when charging for usage after the fact
+        self.level -= amount
+
+
+class LLMRateLimiter:
+    """Shared limiter; use get_rate_limiter() rather than building one"""
+
+    def __init__(self, rpm=LLM_RPM_LIMIT, tpm=LLM_TPM_LIMIT,
+                 breaker_threshold=LLM_BREAKER_THRESHOLD, breaker_cooldown=LLM_BREAKER_COOLDOWN):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._failures = 0
+        self._open_until = 0.0
+        self._tripped = False
+
+    def acquire(self, tokens=0, priority=None):
+        """
+        Block until one request and ``tokens`` tokens are available
+
+        Args:
+            tokens: Estimated tokens the call will use
+            priority: "interactive" or "batch"; defaults to the
+                llm_priority() in effect
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+        """
+        priority = priority or _current_priority.get()
+        entry = (PRIORITIES[priority], next(self._seq))
+        start = time.monotonic()
+
+        with self._cond:
+            now = time.monotonic()
+            if now < self._open_until:
+                raise CircuitOpenError(self._open_until - now)
+
+            heapq.heappush(self._waiters, entry)
+            llm_queue_depth.set(len(self._waiters))
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._waiters[0] == entry:
+                        wait = max(
+                            self._paused_until - now,
+                            self.requests.wait_time(1, now),
+                            self.tokens.wait_time(tokens, now),
+                        )
+                        if wait <= 0:
+                            heapq.heappop(self._waiters)
+                            self.requests.consume(1)
+                            self.tokens.consume(tokens)
+                            break
+                    # Non-head waiters are woken when the head leaves
+                    self._cond.wait(timeout=wait)
+            finally:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                llm_queue_depth.set(len(self._waiters))
+                self._cond.notify_all()
+
+        llm_rate_limit_wait.labels(priority=priority).observe(time.monotonic() - start)
+
+    def open_for(self):
+        """Seconds until the breaker closes again (0 when it is closed)"""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def charge_tokens(self, tokens):
+        """Account for tokens only known after the call (the completion)"""
+        with self._cond:
+            self.tokens.consume(tokens)
+
+    def record_success(self):
+        with self._cond:
+            self._failures = 0
+            self._tripped = False
+            llm_circuit_open.set(0)
+
+    def record_rate_limited(self, retry_after):
+        """The provider said 429: hold every caller for ``retry_after`` seconds"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def record_failure(self):
+        """Count a hard failure; open the breaker after too many in a row"""
+        with self._cond:
+            self._failures += 1
+            # Half-open: the first failure after a cooldown reopens immediately
+            if self._failures >= self.breaker_threshold or self._tripped:
+                self._open_until = time.monotonic() + self.breaker_cooldown
+                self._failures = 0
+                self._tripped = True
+                llm_circuit_open.set(1)
+                print(f"⚠️ LLM circuit breaker open for {self.breaker_cooldown:.0f}s")
+
+
+def _error_chain(error):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _status_code(error):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def is_rate_limit_error(error):
+    """True if the provider rejected the call for exceeding a rate limit"""
+    return any(
+        _status_code(e) == 429 or "RateLimit" in type(e).__name__ for e in _error_chain(error)
+    )
+
+
+def is_transient_error(error):
+    """True for provider outages and timeouts worth retrying"""
+    for e in _error_chain(error):
+        if _status_code(e) in (500, 502, 503, 504):
+            return True
+        name = type(e).__name__
+        if any(marker in name for marker in ("Timeout", "APIConnectionError", "ServiceUnavailable")):
+            return True
+    return False
+
+
+def retry_after_seconds(error):
+    """Retry-After advertised by the provider, if any"""
+    for e in _error_chain(error):
+        headers = getattr(getattr(e, "response", None), "headers", None) or {}
+        value = headers.get("retry-after") if hasattr(headers, "get") else None
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return None
+
+
+def call_with_retries(fn, *args, max_retries=None, backoff_base=1.0, backoff_max=60.0, **kwargs):
+    """
+    Call ``fn`` and retry rate-limit and transient provider errors
+
+    Retries use exponential backoff with full jitter; a rate-limit answer
+    waits for its Retry-After, capped at ``backoff_max`` and the current
+    run's remaining time, and also pauses every other caller through the
+    shared limiter.
+    """
+    limiter = get_rate_limiter()
+    max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+
+    for attempt in range(max_retries + 1):
+        check_current_run()
+        if limiter.open_for():
+            raise CircuitOpenError(limiter.open_for())
+        try:
+            result = fn(*args, **kwargs)
+            limiter.record_success()
+            return result
+        except (CircuitOpenError, RunCancelled):
+            raise
+        except Exception as e:
+            # A call refused because the run is out of time is not worth retrying
+            check_current_run()
+            if limiter.open_for():
+                # The LLM hook refused the call because the breaker opened
+                raise CircuitOpenError(limiter.open_for()) from e
+            delay = random.uniform(0, min(backoff_max, backoff_base * 2 ** attempt))
+            if is_rate_limit_error(e):
+                reason = "rate_limit"
+                delay = min(retry_after_seconds(e) or max(delay, backoff_base), backoff_max)
+                limiter.record_rate_limited(delay)
+            elif is_transient_error(e):
+                reason = "transient"
+                limiter.record_failure()
+            else:
+                raise
+
+            if attempt == max_retries:
+                raise
+            run = current_run()
+            if run is not None and run.remaining() is not None:
+                # Never sleep past the run's deadline; the next check stops it
+                delay = min(delay, run.remaining())
+            llm_retries.labels(reason=reason).inc()
+            print(f"🔁 LLM call failed ({reason}), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def estimate_tokens(messages):
+    """Rough token count of a prompt (~4 characters per token)"""
+    if isinstance(messages, str):
+        return len(messages) // 4 + 1
+    return sum(len(str(m.get("content") or "")) for m in messages) // 4 + 1
+
+
+def _install_hooks():
+    """
+    Meter every LLM call through crewai's global LLM hooks
+
+    Returns:
+        bool: False if this crewai version has no hooks; callers then
+            acquire once per task instead
+    """
+    try:
+        from crewai.hooks import register_after_llm_call_hook, register_before_llm_call_hook
+    except ImportError:
+        return False
+
+    def before_llm_call(context):
+        run = current_run()
+        if run is not None and run.reason is not None:
+            # The run was cancelled or is out of time: stop at this call
+            return False
+        try:
+            get_rate_limiter().acquire(estimate_tokens(context.messages))
+        except CircuitOpenError:
+            # crewai swallows hook exceptions; returning False blocks the call
+            return False
+        return None
+
+    def after_llm_call(context):
+        if context.response:
+            get_rate_limiter().charge_tokens(estimate_tokens(context.response))
+        return None
+
+    register_before_llm_call_hook(before_llm_call)
+    register_after_llm_call_hook(after_llm_call)
+    return True
+
+
+_limiter = None
+_hooks_installed = None
+_limiter_lock = threading.Lock()
+_hooks_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return this process's limiter, creating it on first use"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = LLMRateLimiter()
+    return _limiter
+
+
+def configure_rate_limiter(share=1.0):
+    """
+    Replace this process's limiter with one holding ``share`` of the
+    configured budget, e.g. 1/N in each of N crew worker processes
+
+    Returns:
+        LLMRateLimiter: The new limiter
+    """
+    global _limiter
+    with _limiter_lock:
+        _limiter = LLMRateLimiter(
+            rpm=max(1, LLM_RPM_LIMIT * share), tpm=max(1, LLM_TPM_LIMIT * share)
+        )
+    return _limiter
+
+
+def install_llm_hooks():
+    """
+    Route crewai's LLM calls through the shared limiter (idempotent)
+
+    Returns:
+        bool: Whether per-call metering is active
+    """
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed is None:
+            _hooks_installed = _install_hooks()
+    return _hooks_installed
+
+
+def retry_llm_calls(llm):
+    """
+    Make each call of ``llm`` retry rate-limit and transient errors through
+    call_with_retries(), so a failure repeats one LLM call rather than the
+    whole task (idempotent)
+
+    Returns:
+        The same LLM instance
+    """
+    if llm is None or getattr(llm, "_retrying_call", None) is not None:
+        return llm
+    call = llm.call
+
+    def retrying_call(*args, **kwargs):
+        return call_with_retries(call, *args, **kwargs)
+
+    object.__setattr__(llm, "call", retrying_call)
+    object.__setattr__(llm, "_retrying_call", retrying_call)
+    return llm
@@ -0,0 +1,31 @@
+"""
+Canned LLM for tests and load tests
+
+Answers every prompt instantly (or after STUB_LLM_LATENCY seconds, with
+STUB_LLM_JITTER seconds of random spread) by echoing the task it was given,
+so the whole crew and API can be exercised without calling a provider.
+Select it with LLM_MODEL=stub (see agents.models).
+"""
+import os
+import random
+import time
+
+from crewai.llms.base_llm import BaseLLM
+
+STUB_MODEL = "stub"
+
+
+class StubLLM(BaseLLM):
+    """LLM whose answer is the ``Current Task:`` line of the prompt"""
+
+    def call(self, messages, *args, **kwargs):
+        latency = float(os.getenv("STUB_LLM_LATENCY", "0"))
+        jitter = float(os.getenv("STUB_LLM_JITTER", "0"))
+        if latency or jitter:
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+        prompt = messages if isinstance(messages, str) else messages[-1]["content"]
+        task_line = next(
+            (line for line in prompt.splitlines() if line.startswith("Current Task:")), prompt[:80]
+        )
+        return f"Thought: done\nFinal Answer: {task_line}"
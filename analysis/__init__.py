@@ -0,0 +1 @@
+"""Quantitative analysis of campaign data that backs the agents' recommendations"""
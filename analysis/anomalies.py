@@ -0,0 +1,267 @@
+"""
+Streaming anomaly detection over incoming campaign metrics
+
+Each record (one row in PublicDataLoader's standardized columns: campaign_id,
+platform, impressions, clicks, conversions, spend) updates running statistics
+for its campaign and its platform in O(1): a Welford mean/variance over
+everything seen, and an exponentially weighted mean/variance that follows
+recent behaviour. A metric is flagged when it sits more than
+ANOMALY_Z_THRESHOLD standard deviations from the campaign's (or platform's)
+recent mean, so CTR collapses and CPA blow-ups show up as the data arrives
+instead of at the next crew run.
+
+    ANOMALY_Z_THRESHOLD        z-score that counts as an anomaly (default 3)
+    ANOMALY_MIN_OBSERVATIONS   history needed before a key can be flagged (default 5)
+    ANOMALY_EWMA_ALPHA         weight of the newest observation (default 0.1)
+    ANOMALY_MAX_KEYS           campaigns/platforms tracked, least recent dropped (default 100000)
+    ANOMALY_HISTORY            flagged anomalies kept for the API (default 1000)
+"""
+import contextvars
+import math
+import os
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from monitoring.metrics import anomalies_detected
+
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "3"))
+ANOMALY_MIN_OBSERVATIONS = int(os.getenv("ANOMALY_MIN_OBSERVATIONS", "5"))
+ANOMALY_EWMA_ALPHA = float(os.getenv("ANOMALY_EWMA_ALPHA", "0.1"))
+ANOMALY_MAX_KEYS = int(os.getenv("ANOMALY_MAX_KEYS", "100000"))
+ANOMALY_HISTORY = int(os.getenv("ANOMALY_HISTORY", "1000"))
+
+METRICS = ("ctr", "cpa")
+SCOPES = ("campaign", "platform")
+# Deviations smaller than this fraction of the mean are never flagged, so a
+# metric that has been perfectly flat does not alarm on the smallest change
+RELATIVE_STD_FLOOR = 0.05
+
+
+class RunningStats:
+    """Welford mean/variance plus an exponentially weighted mean/variance"""
+
+    __slots__ = ("count", "mean", "m2", "ewma", "ewvar", "alpha")
+
+    def __init__(self, alpha=None):
+        self.alpha = ANOMALY_EWMA_ALPHA if alpha is None else alpha
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ewma = 0.0
+        self.ewvar = 0.0
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if self.count == 1:
+            self.ewma = value
+            return
+        diff = value - self.ewma
+        step = self.alpha * diff
+        self.ewma += step
+        self.ewvar = (1 - self.alpha) * (self.ewvar + diff * step)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def z_score(self, value):
+        """How unusual ``value`` is against recent history"""
+        # Until the EWMA has seen enough to settle, lean on the full-history spread
+        std = max(math.sqrt(self.ewvar), self.std if self.count < 2 / self.alpha else 0.0)
+        std = max(std, RELATIVE_STD_FLOOR * abs(self.ewma))
+        if std == 0:
+            return 0.0
+        return (value - self.ewma) / std
+
+
+def _number(record, key):
+    try:
+        value = float(record.get(key))
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def record_metrics(record):
+    """
+    Ratio metrics of one record, from its raw counts where possible
+
+    Returns:
+        dict: Metric name -> value, for the metrics the record supports
+    """
+    impressions = _number(record, "impressions")
+    clicks = _number(record, "clicks")
+    conversions = _number(record, "conversions")
+    spend = _number(record, "spend")
+
+    metrics = {}
+    if impressions and clicks is not None:
+        metrics["ctr"] = clicks / impressions * 100
+    elif _number(record, "ctr") is not None:
+        metrics["ctr"] = _number(record, "ctr")
+    if conversions and spend is not None:
+        metrics["cpa"] = spend / conversions
+    return metrics
+
+
+class AnomalyDetector:
+    """
+    Per-campaign and per-platform running statistics over a metrics stream
+
+    Thread-safe; one instance is shared by the API (see ``detector``).
+    """
+
+    def __init__(self, threshold=None, min_observations=None, max_keys=None, history=None):
+        self.threshold = ANOMALY_Z_THRESHOLD if threshold is None else threshold
+        self.min_observations = (
+            ANOMALY_MIN_OBSERVATIONS if min_observations is None else min_observations
+        )
+        self.max_keys = max_keys or ANOMALY_MAX_KEYS
+        self._stats = OrderedDict()
+        self._recent = deque(maxlen=history or ANOMALY_HISTORY)
+        self._records = 0
+        self._lock = threading.Lock()
+
+    def _stats_for(self, key):
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = RunningStats()
+            if len(self._stats) > self.max_keys:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+        return stats
+
+    def observe(self, record):
+        """
+        Score one record against history, then fold it in
+
+        Args:
+            record: Campaign metrics dict in PublicDataLoader's columns
+
+        Returns:
+            list: Anomalies the record triggered (dicts)
+        """
+        metrics = record_metrics(record)
+        campaign_id = record.get("campaign_id")
+        platform = record.get("platform")
+        keys = {"campaign": campaign_id, "platform": platform}
+        observed_at = str(record.get("date") or datetime.now().isoformat())
+
+        found = []
+        with self._lock:
+            self._records += 1
+            for scope in SCOPES:
+                if keys[scope] is None:
+                    continue
+                for metric, value in metrics.items():
+                    stats = self._stats_for((scope, str(keys[scope]), metric))
+                    if stats.count >= self.min_observations:
+                        z = stats.z_score(value)
+                        if abs(z) >= self.threshold:
+                            found.append({
+                                "campaign_id": campaign_id,
+                                "platform": platform,
+                                "scope": scope,
+                                "metric": metric,
+                                "value": round(value, 4),
+                                "expected": round(stats.ewma, 4),
+                                "z_score": round(z, 2),
+                                "direction": "spike" if z > 0 else "drop",
+                                "observed_at": observed_at,
+                            })
+                    stats.update(value)
+            self._recent.extend(found)
+
+        for anomaly in found:
+            anomalies_detected.labels(metric=anomaly["metric"], scope=anomaly["scope"]).inc()
+        return found
+
+    def observe_many(self, records):
+        """Observe records in order; returns every anomaly they triggered"""
+        found = []
+        for record in records:
+            found.extend(self.observe(record))
+        return found
+
+    def recent(self, limit=100, campaign_ids=None, platform=None):
+        """Most recent anomalies first, optionally for some campaigns or one platform"""
+        with self._lock:
+            anomalies = list(self._recent)
+        if campaign_ids is not None:
+            wanted = {str(c) for c in campaign_ids}
+            anomalies = [a for a in anomalies if str(a["campaign_id"]) in wanted]
+        if platform is not None:
+            anomalies = [a for a in anomalies if a["platform"] == platform]
+        return anomalies[::-1][:limit]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "records_observed": self._records,
+                "keys_tracked": len(self._stats),
+                "anomalies_kept": len(self._recent),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+            self._records = 0
+
+
+detector = AnomalyDetector()
+
+
+_current_anomalies = contextvars.ContextVar("anomaly_snapshot", default=None)
+
+
+@contextmanager
+def anomaly_scope(anomalies):
+    """
+    Make anomaly_summary() in the enclosed code read ``anomalies`` instead of
+    this process's detector, e.g. in a crew worker process fed by the API's
+    """
+    token = _current_anomalies.set(list(anomalies))
+    try:
+        yield
+    finally:
+        _current_anomalies.reset(token)
+
+
+def recent_anomalies(campaign_data, limit=10):
+    """Recent anomalies of the campaigns in a request, most recent first"""
+    ids = [c.get("campaign_id") for c in campaign_data if c.get("campaign_id") is not None]
+    snapshot = _current_anomalies.get()
+    if snapshot is None:
+        return detector.recent(limit=limit, campaign_ids=ids)
+    wanted = {str(c) for c in ids}
+    return [a for a in snapshot if str(a["campaign_id"]) in wanted][:limit]
+
+
+def anomaly_summary(campaign_data, limit=10):
+    """
+    Recent stream anomalies for the campaigns in a request, for prompts
+
+    Returns:
+        str: One line per anomaly, or a note that none were flagged
+    """
+    anomalies = recent_anomalies(campaign_data, limit)
+    if not anomalies:
+        return "None flagged in the incoming metrics stream."
+    return "\n".join(
+        f"- Campaign {a['campaign_id']} ({a['platform']}): {a['metric'].upper()} {a['direction']} "
+        f"to {a['value']:g} vs expected {a['expected']:g} (z={a['z_score']:+.1f}, "
+        f"vs its {a['scope']}, {a['observed_at']})"
+        for a in anomalies
+    )
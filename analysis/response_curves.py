@@ -0,0 +1,289 @@
+"""
+Spend-response curves for ROI projections
+
+Fits diminishing-returns curves of conversions against spend, either
+per campaign (when the data has several observations per campaign, e.g.
+daily rows) or per segment such as platform, and projects conversions and
+ROI for any proposed spend change.
+
+Two curve families are supported, both with a scale and a half-saturation
+spend ``h``:
+
+    log   conversions = scale * log(1 + spend / h)
+    hill  conversions = scale * (spend / h)^k / (1 + (spend / h)^k)
+
+For a fixed shape (``h``, ``k``) the best scale has a closed form, so every
+group is fitted at once by scanning a grid of shapes with numpy: each grid
+point is one vectorized pass over all rows plus a few bincounts. Fitting
+10k curves over a few hundred thousand rows takes seconds.
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+MODELS = ("log", "hill", "auto")
+# Half-saturation spend, as a multiple of the group's median spend
+HALF_SATURATION_GRID = np.logspace(-2, 2, 41)
+HILL_SLOPES = (0.5, 1.0, 1.5, 2.0, 3.0)
+# Groups with fewer observations use the pooled curve
+MIN_POINTS = int(os.getenv("RESPONSE_CURVE_MIN_POINTS", "3"))
+# Same value per conversion PublicDataLoader uses for ROI
+CONVERSION_VALUE = float(os.getenv("CONVERSION_VALUE", "50"))
+# A campaign's efficiency relative to its segment's curve is clipped to this range
+EFFICIENCY_BOUNDS = (0.2, 5.0)
+
+PARAM_COLUMNS = ["model", "scale", "half_saturation", "slope", "points", "r2"]
+
+
+def _shape(model, ratio, slope):
+    if model == "log":
+        return np.log1p(ratio)
+    powered = ratio ** slope
+    return powered / (1.0 + powered)
+
+
+def _fit_model(model, codes, n_groups, spend, conversions, median):
+    """Best (scale, half-saturation, slope, sse) per group for one curve family"""
+    best_sse = np.full(n_groups, np.inf)
+    best_scale = np.zeros(n_groups)
+    best_half = np.ones(n_groups)
+    best_slope = np.ones(n_groups)
+    sum_yy = np.bincount(codes, conversions * conversions, minlength=n_groups)
+    row_median = median[codes]
+
+    for slope in (HILL_SLOPES if model == "hill" else (1.0,)):
+        for multiple in HALF_SATURATION_GRID:
+            g = _shape(model, spend / (multiple * row_median), slope)
+            sum_yg = np.bincount(codes, conversions * g, minlength=n_groups)
+            sum_gg = np.bincount(codes, g * g, minlength=n_groups)
+            scale = np.divide(sum_yg, sum_gg, out=np.zeros(n_groups), where=sum_gg > 0)
+            scale = np.maximum(scale, 0.0)
+            sse = sum_yy - 2 * scale * sum_yg + scale * scale * sum_gg
+
+            better = sse < best_sse
+            best_sse = np.where(better, sse, best_sse)
+            best_scale = np.where(better, scale, best_scale)
+            best_half = np.where(better, multiple * median, best_half)
+            best_slope = np.where(better, slope, best_slope)
+
+    return best_scale, best_half, best_slope, best_sse
+
+
+def _fit(codes, n_groups, spend, conversions, model):
+    median = pd.Series(spend).groupby(codes).median().reindex(range(n_groups)).to_numpy()
+    median = np.where(median > 0, median, 1.0)
+
+    models = ("log", "hill") if model == "auto" else (model,)
+    fits = {m: _fit_model(m, codes, n_groups, spend, conversions, median) for m in models}
+    chosen = np.full(n_groups, models[0], dtype=object)
+    scale, half, slope, sse = fits[models[0]]
+    if model == "auto":
+        # The Hill curve has an extra parameter; only take it when clearly better
+        hill = fits["hill"]
+        use_hill = hill[3] < 0.95 * sse
+        chosen = np.where(use_hill, "hill", "log")
+        scale, half, slope, sse = (np.where(use_hill, h, l) for h, l in zip(hill, fits["log"]))
+
+    counts = np.bincount(codes, minlength=n_groups)
+    mean = np.bincount(codes, conversions, minlength=n_groups) / np.maximum(counts, 1)
+    sst = np.bincount(codes, (conversions - mean[codes]) ** 2, minlength=n_groups)
+    r2 = np.where(sst > 0, 1 - sse / np.where(sst > 0, sst, 1), np.nan)
+
+    return pd.DataFrame({
+        "model": chosen,
+        "scale": scale,
+        "half_saturation": half,
+        "slope": slope,
+        "points": counts,
+        "r2": r2,
+    })
+
+
+@dataclass
+class ResponseCurves:
+    """Fitted curves per group plus the pooled curve used as a fallback"""
+
+    by: Optional[str]
+    params: pd.DataFrame
+    pooled: pd.Series
+
+    def _group_params(self, groups):
+        if self.by is None:
+            return pd.DataFrame([self.pooled] * len(groups))
+        params = self.params.reindex(pd.Index(groups))
+        missing = params["scale"].isna().to_numpy()
+        for col in PARAM_COLUMNS:
+            params.loc[missing, col] = self.pooled[col]
+        return params.reset_index(drop=True)
+
+    def predict(self, spend, groups=None):
+        """
+        Expected conversions at ``spend`` on each group's curve
+
+        Args:
+            spend: Array-like of spend values
+            groups: Group of each value (ignored for pooled curves)
+
+        Returns:
+            np.ndarray: Predicted conversions
+        """
+        spend = np.asarray(spend, dtype=float)
+        params = self._group_params([None] * len(spend) if groups is None else groups)
+        ratio = spend / params["half_saturation"].to_numpy(dtype=float)
+        slope = params["slope"].to_numpy(dtype=float)
+        shape = np.where(
+            params["model"].to_numpy() == "hill",
+            _shape("hill", ratio, slope),
+            _shape("log", ratio, slope),
+        )
+        return params["scale"].to_numpy(dtype=float) * shape
+
+    def project(self, campaigns, spend_change=0.2, conversion_value=None):
+        """
+        Projected conversions and ROI per campaign after a spend change
+
+        Each campaign follows its group's curve, scaled by how far above or
+        below that curve it currently sits.
+
+        Args:
+            campaigns: DataFrame or list of campaign dicts with spend and
+                conversions (and the grouping column)
+            spend_change: Relative change, e.g. 0.2 for +20%; a scalar or
+                one value per campaign
+            conversion_value: Value of a conversion (default: revenue per
+                conversion when a revenue column exists, else CONVERSION_VALUE)
+
+        Returns:
+            pd.DataFrame: Current and projected spend, conversions and ROI,
+                and the marginal cost per extra conversion
+        """
+        df = pd.DataFrame(campaigns)
+        spend = pd.to_numeric(df["spend"], errors="coerce").fillna(0).to_numpy(dtype=float)
+        conversions = pd.to_numeric(df["conversions"], errors="coerce").fillna(0).to_numpy(dtype=float)
+        new_spend = spend * (1 + np.asarray(spend_change, dtype=float))
+        groups = df[self.by].to_numpy() if self.by in df.columns else None
+
+        current_fit = self.predict(spend, groups)
+        efficiency = np.where(
+            (current_fit > 0) & (conversions > 0),
+            conversions / np.where(current_fit > 0, current_fit, 1),
+            1.0,
+        )
+        efficiency = np.clip(efficiency, *EFFICIENCY_BOUNDS)
+        # Anchor the projection at the observed conversions
+        projected = conversions + efficiency * (self.predict(new_spend, groups) - current_fit)
+        projected = np.maximum(projected, 0.0)
+
+        value = conversion_value
+        if value is None and "revenue" in df.columns:
+            revenue = pd.to_numeric(df["revenue"], errors="coerce").to_numpy(dtype=float)
+            value = np.where(conversions > 0, revenue / np.where(conversions > 0, conversions, 1),
+                             CONVERSION_VALUE)
+        if value is None:
+            value = CONVERSION_VALUE
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi = np.where(spend > 0, (conversions * value - spend) / spend * 100, np.nan)
+            projected_roi = np.where(
+                new_spend > 0, (projected * value - new_spend) / new_spend * 100, np.nan
+            )
+            extra = projected - conversions
+            marginal_cpa = np.where(np.abs(extra) > 1e-9, (new_spend - spend) / extra, np.nan)
+
+        out = pd.DataFrame({
+            "campaign_id": df["campaign_id"] if "campaign_id" in df.columns else df.index,
+            "spend": spend,
+            "new_spend": new_spend,
+            "conversions": conversions,
+            "projected_conversions": projected,
+            "roi": roi,
+            "projected_roi": projected_roi,
+            "marginal_cpa": marginal_cpa,
+        })
+        if groups is not None and self.by != "campaign_id":
+            out.insert(1, self.by, groups)
+        return out
+
+
+def _choose_grouping(df):
+    if "campaign_id" in df.columns and df["campaign_id"].duplicated().any():
+        if df.groupby("campaign_id").size().median() >= MIN_POINTS:
+            return "campaign_id"
+    if "platform" in df.columns:
+        return "platform"
+    return None
+
+
+def fit_response_curves(data, by="auto", model="log"):
+    """
+    Fit spend-response curves in one vectorized batch
+
+    Args:
+        data: DataFrame or list of dicts with spend and conversions
+        by: Grouping column; "auto" uses campaign_id when campaigns have
+            several observations each, else platform; None fits one pooled curve
+        model: "log", "hill" or "auto" (Hill only where it fits clearly better)
+
+    Returns:
+        ResponseCurves: Parameters per group and the pooled curve
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model: {model}")
+    df = pd.DataFrame(data)
+    if by == "auto":
+        by = _choose_grouping(df)
+    elif by is not None and by not in df.columns:
+        raise ValueError(f"Unknown grouping column: {by}")
+
+    spend = pd.to_numeric(df["spend"], errors="coerce")
+    conversions = pd.to_numeric(df["conversions"], errors="coerce")
+    valid = (spend > 0) & conversions.notna() & (conversions >= 0)
+    spend = spend[valid].to_numpy(dtype=float)
+    conversions = conversions[valid].to_numpy(dtype=float)
+    if len(spend) == 0:
+        raise ValueError("No rows with positive spend to fit response curves on")
+
+    pooled = _fit(np.zeros(len(spend), dtype=np.int64), 1, spend, conversions, model).iloc[0]
+    params = pd.DataFrame(columns=PARAM_COLUMNS)
+    if by is not None:
+        codes, groups = pd.factorize(df.loc[valid, by], use_na_sentinel=False)
+        params = _fit(codes.astype(np.int64), len(groups), spend, conversions, model)
+        params.index = pd.Index(groups, name=by)
+        params = params[params["points"] >= MIN_POINTS]
+
+    return ResponseCurves(by=by, params=params, pooled=pooled)
+
+
+def projection_summary(campaign_data, spend_change=0.2, top=10):
+    """
+    Short text of projected impact for the largest campaigns, for prompts
+
+    Returns:
+        str: One line per campaign for +/- ``spend_change``, or a note when
+            the data cannot support a fit
+    """
+    df = pd.DataFrame(campaign_data)
+    if df.empty or not {"spend", "conversions"} <= set(df.columns):
+        return "Not available (spend and conversions are required)."
+    try:
+        curves = fit_response_curves(df)
+    except ValueError:
+        return "Not available (no campaigns with spend)."
+
+    up = curves.project(df, spend_change)
+    down = curves.project(df, -spend_change)
+    biggest = up["spend"].nlargest(top).index
+    pct = f"{spend_change:.0%}"
+    lines = []
+    for i in biggest:
+        lines.append(
+            f"- {up.at[i, 'campaign_id']}: spend ${up.at[i, 'spend']:,.0f}, "
+            f"ROI {up.at[i, 'roi']:.0f}%; +{pct} spend -> ROI {up.at[i, 'projected_roi']:.0f}% "
+            f"(marginal CPA ${up.at[i, 'marginal_cpa']:,.2f}); "
+            f"-{pct} spend -> ROI {down.at[i, 'projected_roi']:.0f}%"
+        )
+    basis = f"per {curves.by}" if curves.by else "pooled"
+    return f"Diminishing-returns curves ({basis}):\n" + "\n".join(lines)
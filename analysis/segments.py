@@ -0,0 +1,160 @@
+"""
+Campaign segmentation to keep prompts a fixed size
+
+Large accounts are mostly near-duplicate rows (the KAG file is dominated by
+ads with 0-2 clicks), so listing campaigns in a prompt either truncates the
+account or blows the context. Instead, campaigns are clustered with
+mini-batch k-means on standardized log-KPIs plus one-hot dimensions
+(platform, age, gender, ...) into at most SEGMENT_COUNT segments. Each
+segment is described by pooled statistics, its dominant dimension values and
+a few exemplar campaigns closest to its centre, so the agents see the whole
+account in a prompt whose size does not depend on the number of campaigns.
+"""
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+SEGMENT_COUNT = int(os.getenv("SEGMENT_COUNT", "8"))
+SEGMENT_EXEMPLARS = int(os.getenv("SEGMENT_EXEMPLARS", "2"))
+# Categorical columns used as clustering dimensions when present
+DIMENSIONS = ("platform", "age", "gender")
+# Categorical columns with more values than this are not one-hot encoded
+MAX_DIMENSION_VALUES = 20
+COUNT_COLUMNS = ("impressions", "clicks", "conversions", "spend")
+VALUE_PER_CONVERSION = 50
+
+
+@dataclass
+class Segmentation:
+    """Segment of every campaign plus one summary row per segment"""
+
+    labels: np.ndarray
+    segments: pd.DataFrame
+
+
+def _counts(df):
+    return pd.DataFrame({
+        col: pd.to_numeric(df[col], errors="coerce").fillna(0).clip(lower=0)
+        if col in df.columns else 0.0
+        for col in COUNT_COLUMNS
+    }, index=df.index)
+
+
+def campaign_features(df):
+    """
+    Standardized feature matrix: log counts, log KPIs and one-hot dimensions
+
+    Returns:
+        np.ndarray: One row per campaign
+    """
+    counts = _counts(df)
+    impressions, clicks = counts["impressions"], counts["clicks"]
+    conversions, spend = counts["conversions"], counts["spend"]
+    numeric = pd.DataFrame({
+        "impressions": np.log1p(impressions),
+        "clicks": np.log1p(clicks),
+        "conversions": np.log1p(conversions),
+        "spend": np.log1p(spend),
+        "ctr": np.log1p((clicks / impressions.where(impressions > 0)).fillna(0) * 100),
+        "conversion_rate": np.log1p((conversions / clicks.where(clicks > 0)).fillna(0) * 100),
+        "cpc": np.log1p((spend / clicks.where(clicks > 0)).fillna(0)),
+    })
+    std = numeric.std(ddof=0).replace(0, 1)
+    parts = [((numeric - numeric.mean()) / std).to_numpy()]
+
+    for col in DIMENSIONS:
+        if col in df.columns and df[col].nunique() <= MAX_DIMENSION_VALUES:
+            # A differing category weighs about as much as one standard deviation
+            parts.append(pd.get_dummies(df[col].astype(str)).to_numpy(dtype=float) / np.sqrt(2))
+    return np.hstack(parts)
+
+
+def _campaign_ids(df):
+    for col in ("campaign_id", "ad_id"):
+        if col in df.columns:
+            return df[col].astype(str)
+    return pd.Series(df.index.astype(str), index=df.index)
+
+
+def segment_campaigns(campaign_data, k=None, random_state=0):
+    """
+    Cluster campaigns into at most ``k`` segments
+
+    Args:
+        campaign_data: List of campaign dicts or a DataFrame
+        k: Segment count (default SEGMENT_COUNT); fewer for small accounts
+        random_state: Seed, so the same account gives the same segments
+
+    Returns:
+        Segmentation: Labels and per-segment summary, largest spend first
+    """
+    from sklearn.cluster import MiniBatchKMeans
+
+    df = pd.DataFrame(campaign_data).reset_index(drop=True)
+    features = campaign_features(df)
+    k = max(1, min(k or SEGMENT_COUNT, len(df)))
+    model = MiniBatchKMeans(
+        n_clusters=k, random_state=random_state, n_init=3, batch_size=1024
+    ).fit(features)
+    labels = model.labels_
+    distances = np.linalg.norm(features - model.cluster_centers_[labels], axis=1)
+
+    counts = _counts(df)
+    ids = _campaign_ids(df)
+    total_spend = counts["spend"].sum()
+    rows = []
+    for segment in np.unique(labels):
+        members = np.flatnonzero(labels == segment)
+        sums = counts.iloc[members].sum()
+        closest = members[np.argsort(distances[members])[:SEGMENT_EXEMPLARS]]
+        dimensions = {}
+        for col in DIMENSIONS:
+            if col in df.columns:
+                shares = df[col].iloc[members].astype(str).value_counts(normalize=True)
+                dimensions[col] = f"{shares.index[0]} {shares.iloc[0]:.0%}"
+        rows.append({
+            "segment": int(segment),
+            "campaigns": len(members),
+            "spend_share": sums["spend"] / total_spend if total_spend > 0 else 0.0,
+            **sums.to_dict(),
+            "ctr": sums["clicks"] / sums["impressions"] * 100 if sums["impressions"] else 0.0,
+            "conversion_rate": sums["conversions"] / sums["clicks"] * 100 if sums["clicks"] else 0.0,
+            "cpc": sums["spend"] / sums["clicks"] if sums["clicks"] else 0.0,
+            "cpa": sums["spend"] / sums["conversions"] if sums["conversions"] else 0.0,
+            "roi": (sums["conversions"] * VALUE_PER_CONVERSION - sums["spend"]) / sums["spend"] * 100
+            if sums["spend"] else 0.0,
+            "dimensions": dimensions,
+            "exemplars": ids.iloc[closest].tolist(),
+        })
+
+    segments = pd.DataFrame(rows).sort_values(["spend", "campaigns"], ascending=False)
+    # Number segments by spend rank so S1 is always the biggest
+    rank = {old: new for new, old in enumerate(segments["segment"], start=1)}
+    segments["segment"] = segments["segment"].map(rank)
+    return Segmentation(labels=np.vectorize(rank.get)(labels), segments=segments.reset_index(drop=True))
+
+
+def segment_summary(campaign_data, k=None):
+    """
+    Segments as prompt text: one line per segment, whatever the account size
+
+    Returns:
+        str: Segment lines, or a note when there is no data
+    """
+    if not campaign_data:
+        return "No campaigns."
+    segments = segment_campaigns(campaign_data, k).segments
+    lines = []
+    for row in segments.itertuples():
+        dims = ", ".join(f"{col} {value}" for col, value in row.dimensions.items())
+        lines.append(
+            f"- S{row.segment}: {row.campaigns} campaigns, {row.spend_share:.0%} of spend"
+            f"{f' ({dims})' if dims else ''}; spend ${row.spend:,.0f}, "
+            f"impressions {row.impressions:,.0f}, clicks {row.clicks:,.0f}, "
+            f"conversions {row.conversions:,.0f}; CTR {row.ctr:.2f}%, CVR {row.conversion_rate:.1f}%, "
+            f"CPC ${row.cpc:.2f}, CPA ${row.cpa:.2f}, ROI {row.roi:.0f}%; "
+            f"exemplars: {', '.join(row.exemplars)}"
+        )
+    return "\n".join(lines)
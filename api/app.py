@@ -5,25 +5,95 @@ Production-ready API with health checks and optimization endpoints
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import Request, Response
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import partial
+import asyncio
+import hmac
+import json
 import os
+import re
 import sys
+import threading
 import time
+import uuid
 
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from monitoring.metrics import request_count, request_duration
+from monitoring.metrics import (
+    active_optimizations,
+    request_count,
+    request_duration,
+    warmup_duration,
+)
+from monitoring.profiling import PROFILE_REQUESTS, call_profiled, list_profiles, profile_path
+from monitoring.runtime import install_runtime_metrics, monitor_event_loop, register_executor
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from crew import create_ad_optimizer_crew
+from analysis.anomalies import detector as anomaly_detector, recent_anomalies
+from analysis.response_curves import fit_response_curves
+from api.batch import run_batch, summarize
+from api.jobs import JobStore
+from api.workers import CREW_WORKERS, CrewWorkerPool, run_crew_in_worker
+from agents.deadlines import CREW_DEADLINE_SECONDS, RunControl
+from agents.models import validate_overrides
+from agents.rate_limiter import CircuitOpenError, is_rate_limit_error, llm_priority
+from runs.checkpoints import checkpointing, finish_run, load_run, new_run_id, start_run
+from runs.index import account_scope, get_run_index, precedent_summary
+from runs.snapshots import load_latest_snapshot, save_snapshot
+
+# crew (and crewai behind it) is imported lazily: at module level it would add
+# several seconds to every cold start, including ones that only serve /health.
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") != "0"
+
+warmup_state = {"status": "pending", "duration": None, "error": None}
+
+
+def _warm_up():
+    """Pre-import the crew machinery so the first optimization doesn't pay for it"""
+    warmup_state["status"] = "running"
+    try:
+        import crew
+
+        duration = crew.warm_up()
+        warmup_state["duration"] = duration
+        warmup_state["status"] = "done"
+        warmup_duration.set(duration)
+        print(f"🔥 Crew warm-up finished in {duration:.2f}s")
+    except Exception as e:
+        warmup_state["error"] = str(e)
+        warmup_state["status"] = "failed"
+        print(f"⚠️ Crew warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Run in a background thread so the server binds and answers probes
+    # while crewai is still importing.
+    if WARMUP_ON_STARTUP:
+        threading.Thread(target=_warm_up, name="crew-warmup", daemon=True).start()
+    install_runtime_metrics()
+    register_executor("jobs", jobs.stats)
+    if crew_workers is not None:
+        register_executor("crew_workers", crew_workers.stats)
+    loop_monitor = asyncio.create_task(monitor_event_loop())
+    yield
+    loop_monitor.cancel()
+    jobs.shutdown()
+    if crew_workers is not None:
+        crew_workers.shutdown()
+
 
 app = FastAPI(
     title="Multi-Agent Ad Optimizer API",
     description="Production AI system with 5 specialized agents for ad campaign optimization",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -39,6 +109,29 @@ app.add_middleware(
 # Models
 class CampaignData(BaseModel):
     campaigns: List[Dict[str, Any]] = Field(..., description="List of campaign dictionaries")
+    mode: Literal["auto", "single", "map_reduce"] = Field(
+        "auto", description="map_reduce partitions large accounts; auto switches above MAP_REDUCE_THRESHOLD"
+    )
+    partition_by: str = Field("platform", description="Campaign field (or 'size') to partition on")
+    account_id: Optional[str] = Field(
+        None, description="Account the campaigns belong to; each run is snapshotted per account"
+    )
+    incremental: bool = Field(
+        False, description="Only re-run tasks whose inputs changed since the account's last snapshot"
+    )
+    models: Optional[Dict[str, str]] = Field(
+        None, description="Per-agent model overrides, e.g. {\"orchestration\": \"gpt-4o\"}"
+    )
+    deadline_seconds: Optional[float] = Field(
+        None, gt=0, description="Whole-run deadline (default CREW_DEADLINE_SECONDS)"
+    )
+    agent_deadline_seconds: Optional[float] = Field(
+        None, gt=0, description="Per-task deadline (default AGENT_DEADLINE_SECONDS)"
+    )
+    reuse_similar: bool = Field(
+        False, description="Return a past run's report of the same account instead of running "
+        "the crew when its campaigns and metrics match (within RUN_INDEX_REUSE_TOLERANCE)"
+    )
 
 
 class OptimizationResponse(BaseModel):
@@ -47,6 +140,108 @@ class OptimizationResponse(BaseModel):
     campaigns_analyzed: int
     report: str
     timestamp: str
+    tasks_run: Optional[List[str]] = None
+    changes: Optional[Dict[str, Any]] = None
+    models: Optional[Dict[str, Optional[str]]] = None
+    timed_out: Optional[List[str]] = None
+    run_id: Optional[str] = None
+    reused_from: Optional[str] = None
+    # Validated result per task, see tasks.schemas; the report is rendered from it
+    structured: Optional[Dict[str, Any]] = None
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    submitted_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[OptimizationResponse] = None
+    error: Optional[str] = None
+
+
+class AccountCampaigns(BaseModel):
+    account_id: str
+    campaigns: List[Dict[str, Any]] = Field(..., description="List of campaign dictionaries")
+
+
+class BatchRequest(BaseModel):
+    accounts: List[AccountCampaigns] = Field(..., description="Independent campaign sets to optimize")
+    max_parallelism: Optional[int] = Field(
+        None, ge=1, description="Accounts optimized at once (capped by BATCH_MAX_PARALLELISM)"
+    )
+    incremental: bool = Field(
+        False, description="Only re-run tasks whose inputs changed since each account's last snapshot"
+    )
+    models: Optional[Dict[str, str]] = Field(
+        None, description="Per-agent model overrides, e.g. {\"orchestration\": \"gpt-4o\"}"
+    )
+    deadline_seconds: Optional[float] = Field(
+        None, gt=0, description="Whole-run deadline (default CREW_DEADLINE_SECONDS)"
+    )
+    agent_deadline_seconds: Optional[float] = Field(
+        None, gt=0, description="Per-task deadline (default AGENT_DEADLINE_SECONDS)"
+    )
+
+
+class ForecastRequest(BaseModel):
+    campaigns: List[Dict[str, Any]] = Field(..., description="Campaigns (or campaign-day rows) with spend and conversions")
+    spend_change: float = Field(
+        0.2, gt=-1, description="Relative spend change to project, e.g. 0.2 for +20%"
+    )
+    by: Optional[str] = Field(
+        "auto", description="Curve grouping column: auto, campaign_id, platform, ... or null for one pooled curve"
+    )
+    model: Literal["log", "hill", "auto"] = Field("log", description="Curve family")
+
+
+class ForecastResponse(BaseModel):
+    campaigns_analyzed: int
+    grouped_by: Optional[str]
+    curves: List[Dict[str, Any]]
+    projections: List[Dict[str, Any]]
+    total: Dict[str, float]
+    execution_time: float
+
+
+class MetricsIngest(BaseModel):
+    records: List[Dict[str, Any]] = Field(
+        ..., description="Campaign metric rows (campaign_id, platform, impressions, clicks, conversions, spend), oldest first"
+    )
+
+
+class AnomalyResponse(BaseModel):
+    records_observed: int
+    anomalies: List[Dict[str, Any]]
+
+
+class AccountResult(BaseModel):
+    account_id: str
+    status: str
+    execution_time: float
+    result: Optional[OptimizationResponse] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    status: str
+    execution_time: float
+    accounts_total: int
+    succeeded: int
+    # Accounts whose run hit its deadline and returned partial results
+    partial: int = 0
+    failed: int
+    results: List[AccountResult]
+    timestamp: str
+
+
+jobs = JobStore()
+# Crews run in worker processes when CREW_WORKERS > 0, else in API threads
+crew_workers = CrewWorkerPool() if CREW_WORKERS > 0 else None
+
+# Run ids executing in this process; a checkpoint that is "running" but not
+# listed here belongs to a run that died with its process
+active_runs = set()
 
 
 # Health endpoints
@@ -75,44 +270,452 @@ def health_check():
 def readiness_check():
     if not os.getenv("OPENAI_API_KEY"):
         raise HTTPException(status_code=503, detail="OPENAI_API_KEY not configured")
-    return {"status": "ready", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "ready",
+        "warmup": warmup_state["status"],
+        "timestamp": datetime.now().isoformat(),
+    }
 
 
-# Optimization endpoint
-@app.post("/v1/optimize", response_model=OptimizationResponse)
-async def optimize_campaigns(data: CampaignData):
-    try:
-        start = datetime.now()
+def run_optimization(campaign_data, account_id=None, mode="auto", partition_by="platform",
+                     incremental=False, priority="interactive", models=None,
+                     deadline=None, agent_deadline=None, control=None, run_id=None, resume=None,
+                     reuse_similar=False):
+    """
+    Run the crew on campaign data and save the report
 
-        campaign_data = data.campaigns
-        if not campaign_data:
-            raise HTTPException(status_code=400, detail="No campaign data provided")
+    Args:
+        campaign_data: List of campaign dictionaries
+        account_id: Optional account the campaigns belong to. Runs with an
+            account are snapshotted, and their report files kept apart
+        mode: Crew execution mode, see crew.run_ad_optimizer_crew()
+        partition_by: Partitioning used in map-reduce mode
+        incremental: Diff against the account's latest snapshot and only
+            re-run the tasks whose inputs changed
+        priority: LLM queueing priority, "interactive" or "batch"
+        models: Optional agent key -> model overrides, see agents.models
+        deadline: Seconds the run may take (default CREW_DEADLINE_SECONDS)
+        agent_deadline: Seconds each task may take (default AGENT_DEADLINE_SECONDS)
+        control: RunControl to use instead of ``deadline``/``agent_deadline``,
+            e.g. one the caller cancels when its client goes away
+        run_id: Id the run is checkpointed under (default: a new one). A run
+            that fails or times out can be continued with ``resume``.
+        resume: Task outputs checkpointed by an earlier attempt at ``run_id``
+        reuse_similar: Answer with the nearest past run of the same account
+            without running the crew, when it is close enough (see
+            runs.index); never applies to runs without ``account_id``
+
+    Returns:
+        OptimizationResponse: Report and timing for the run
+    """
+    start = datetime.now()
+    if reuse_similar and resume is None:
+        match = get_run_index().reusable(campaign_data, account_id=account_id)
+        if match is not None:
+            print(f"♻️  Reusing run {match['run_id']}, its campaign metrics match this request")
+            return OptimizationResponse(
+                status="reused",
+                execution_time=(datetime.now() - start).total_seconds(),
+                campaigns_analyzed=len(campaign_data),
+                report=match["report"],
+                timestamp=datetime.now().isoformat(),
+                tasks_run=[],
+                reused_from=match["run_id"],
+            )
 
-        crew = create_ad_optimizer_crew(campaign_data)
-        result = crew.kickoff()
+    # Built here rather than by the caller so time spent queued does not count
+    control = control or RunControl(deadline or CREW_DEADLINE_SECONDS, task_timeout=agent_deadline)
 
-        execution_time = (datetime.now() - start).total_seconds()
+    previous = None
+    if incremental and account_id and resume is None:
+        previous = load_latest_snapshot(account_id)
 
-        os.makedirs("results", exist_ok=True)
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"results/optimization_report_{ts}.txt"
-        with open(filename, "w") as f:
-            f.write(f"Optimization Report - {datetime.now().isoformat()}\n")
-            f.write("=" * 80 + "\n\n")
-            f.write(str(result))
+    run_id = run_id or new_run_id()
+    if resume is None:
+        start_run(run_id, campaign_data, account_id=account_id, mode=mode,
+                  partition_by=partition_by, models=models)
+    active_runs.add(run_id)
+    try:
+        with llm_priority(priority), active_optimizations.track_inprogress(), \
+                checkpointing(run_id), account_scope(account_id):
+            if crew_workers is not None:
+                # Out of process: the worker gets the time left and enforces it,
+                # and this process's anomalies and precedents for its prompts
+                control.check()
+                result = crew_workers.run(
+                    run_crew_in_worker, campaign_data, run_id, priority,
+                    control.remaining(), control.task_timeout, control=control,
+                    priority=priority, account_id=account_id,
+                    anomalies=recent_anomalies(campaign_data),
+                    precedents=precedent_summary(campaign_data, account_id=account_id),
+                    mode=mode, partition_by=partition_by, previous=previous,
+                    models=models, resume=resume,
+                )
+            else:
+                from crew import run_ad_optimizer_crew
+
+                result = run_ad_optimizer_crew(
+                    campaign_data, mode=mode, partition_by=partition_by, previous=previous,
+                    models=models, control=control, resume=resume,
+                )
+    except Exception as e:
+        finish_run(run_id, "failed", str(e))
+        print(f"💾 Run {run_id} failed; finished tasks are checkpointed for resume")
+        raise
+    finally:
+        active_runs.discard(run_id)
+    finish_run(run_id, "partial" if result.timed_out else "success")
 
+    execution_time = (datetime.now() - start).total_seconds()
+
+    if previous is not None and not result.tasks_run:
         return OptimizationResponse(
-            status="success",
+            status="unchanged",
             execution_time=execution_time,
             campaigns_analyzed=len(campaign_data),
-            report=str(result),
+            report=result.report,
             timestamp=datetime.now().isoformat(),
+            tasks_run=[],
+            changes=result.changes,
+            models=result.models,
+            run_id=run_id,
+            structured=result.structured,
+        )
+
+    # Partial runs are not snapshotted: the next incremental run would reuse
+    # a report built without the tasks that timed out
+    if account_id and not result.timed_out:
+        save_snapshot(account_id, campaign_data, result.task_outputs, result.report, result.mode)
+    if not result.timed_out:
+        get_run_index().add(run_id, campaign_data, result.report, account_id, result.mode)
+
+    os.makedirs("results", exist_ok=True)
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"results/optimization_report_{ts}.txt"
+    if account_id:
+        safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", account_id)
+        filename = f"results/optimization_report_{ts}_{safe_id}.txt"
+    with open(filename, "w") as f:
+        f.write(f"Optimization Report - {datetime.now().isoformat()}\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(str(result))
+
+    return OptimizationResponse(
+        status="partial" if result.timed_out else "success",
+        execution_time=execution_time,
+        campaigns_analyzed=len(campaign_data),
+        report=str(result),
+        timestamp=datetime.now().isoformat(),
+        tasks_run=result.tasks_run,
+        changes=result.changes,
+        models=result.models,
+        timed_out=result.timed_out,
+        run_id=run_id,
+        structured=result.structured,
+    )
+
+
+def _optimization_error(e):
+    """HTTPException for a run that raised ``e``"""
+    if isinstance(e, CircuitOpenError):
+        return HTTPException(
+            status_code=503,
+            detail=f"Optimization failed: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
         )
+    if is_rate_limit_error(e):
+        return HTTPException(
+            status_code=429,
+            detail=f"Optimization failed: LLM rate limit exceeded ({str(e)})",
+            headers={"Retry-After": "30"},
+        )
+    return HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+
+
+def _check_models(models):
+    try:
+        validate_overrides(models)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _cancel_on_disconnect(request, control, interval=1.0):
+    """Cancel the run once the client has gone away"""
+    while control.reason is None:
+        if await request.is_disconnected():
+            print("🔌 Client disconnected, cancelling its optimization")
+            control.cancel("client_disconnected")
+            return
+        await asyncio.sleep(interval)
+
+
+# Optimization endpoint
+@app.post("/v1/optimize", response_model=OptimizationResponse)
+async def optimize_campaigns(data: CampaignData, request: Request, response: Response):
+    run_id = new_run_id()
+    try:
+        campaign_data = data.campaigns
+        if not campaign_data:
+            raise HTTPException(status_code=400, detail="No campaign data provided")
+        _check_models(data.models)
+
+        control = RunControl(
+            data.deadline_seconds or CREW_DEADLINE_SECONDS, task_timeout=data.agent_deadline_seconds
+        )
+        response.headers["X-Run-ID"] = run_id
+        optimize = run_optimization
+        # Profiling is costly: clients may only ask for it with the admin token,
+        # and profile ids are always ours so they cannot overwrite each other
+        if PROFILE_REQUESTS or (request.headers.get("x-profile") == "1" and _is_admin(request)):
+            profile_id = uuid.uuid4().hex
+            response.headers["X-Profile-ID"] = profile_id
+            optimize = partial(call_profiled, profile_id, run_optimization)
+
+        watcher = asyncio.create_task(_cancel_on_disconnect(request, control))
+        try:
+            # The crew blocks for minutes; keep it off the event loop so health
+            # checks and job polling stay responsive.
+            return await run_in_threadpool(
+                optimize,
+                campaign_data,
+                account_id=data.account_id,
+                mode=data.mode,
+                partition_by=data.partition_by,
+                incremental=data.incremental,
+                models=data.models,
+                control=control,
+                run_id=run_id,
+                reuse_similar=data.reuse_similar,
+            )
+        finally:
+            watcher.cancel()
 
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+        error = _optimization_error(e)
+        # Finished tasks are checkpointed; POST /v1/runs/{run_id}/resume continues the run
+        error.headers = {**(error.headers or {}), "X-Run-ID": run_id}
+        raise error
+
+
+@app.get("/v1/runs/{run_id}")
+def get_run(run_id: str):
+    """Checkpoint of a failed or partial run: its settings and finished tasks"""
+    run = load_run(run_id, include_campaigns=False)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"No checkpoint for run {run_id}")
+    run["completed_tasks"] = sorted(run.pop("task_outputs"))
+    run["active"] = run_id in active_runs
+    return run
+
+
+@app.post("/v1/runs/{run_id}/resume", response_model=OptimizationResponse)
+def resume_optimization(run_id: str):
+    """Continue a failed or partial run: only unfinished tasks and those downstream run"""
+    run = load_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"No checkpoint for run {run_id}")
+    if run_id in active_runs:
+        raise HTTPException(status_code=409, detail=f"Run {run_id} is still running")
+
+    settings = run["settings"]
+    try:
+        return run_optimization(
+            run["campaigns"],
+            account_id=settings.get("account_id"),
+            mode=settings.get("mode", "auto"),
+            partition_by=settings.get("partition_by", "platform"),
+            models=settings.get("models"),
+            run_id=run_id,
+            resume=run["task_outputs"],
+        )
+    except Exception as e:
+        raise _optimization_error(e)
+
+
+@app.post("/v1/optimize/batch", response_model=BatchResponse)
+def optimize_batch(data: BatchRequest, stream: bool = False):
+    """
+    Optimize many accounts in one call.
+
+    With ``?stream=true`` the response is NDJSON: one line per account as it
+    finishes, followed by a summary line with ``"type": "summary"``.
+    """
+    if not data.accounts:
+        raise HTTPException(status_code=400, detail="No accounts provided")
+    ids = [a.account_id for a in data.accounts]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="account_id values must be unique")
+    empty = [a.account_id for a in data.accounts if not a.campaigns]
+    if empty:
+        raise HTTPException(status_code=400, detail=f"No campaign data for accounts: {empty}")
+    _check_models(data.models)
+
+    accounts = [(a.account_id, a.campaigns) for a in data.accounts]
+    optimize = partial(
+        run_optimization,
+        incremental=data.incremental,
+        priority="batch",
+        models=data.models,
+        deadline=data.deadline_seconds,
+        agent_deadline=data.agent_deadline_seconds,
+    )
+    start = time.perf_counter()
+
+    if stream:
+        def lines():
+            finished = []
+            for item in run_batch(accounts, optimize, data.max_parallelism):
+                finished.append({"status": item["status"]})
+                yield AccountResult(**item).model_dump_json() + "\n"
+            yield json.dumps({
+                "type": "summary",
+                "accounts_total": len(accounts),
+                **summarize(finished),
+                "execution_time": time.perf_counter() - start,
+            }) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    order = {account_id: i for i, (account_id, _) in enumerate(accounts)}
+    results = sorted(
+        run_batch(accounts, optimize, data.max_parallelism),
+        key=lambda r: order[r["account_id"]],
+    )
+    return BatchResponse(
+        **summarize(results),
+        execution_time=time.perf_counter() - start,
+        accounts_total=len(results),
+        results=results,
+        timestamp=datetime.now().isoformat(),
+    )
+
+
+@app.post("/v1/forecast", response_model=ForecastResponse)
+def forecast(data: ForecastRequest):
+    """
+    Projected conversions and ROI for a spend change, from fitted
+    spend-response curves. No LLM is involved, so this answers in well
+    under a second even for large accounts.
+    """
+    if not data.campaigns:
+        raise HTTPException(status_code=400, detail="No campaign data provided")
+    start = time.perf_counter()
+    try:
+        curves = fit_response_curves(data.campaigns, by=data.by, model=data.model)
+        projections = curves.project(data.campaigns, data.spend_change)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Cannot fit response curves: {e}")
+
+    spend, new_spend = projections["spend"].sum(), projections["new_spend"].sum()
+    conversions = projections["conversions"].sum()
+    projected = projections["projected_conversions"].sum()
+    params = curves.params.reset_index() if curves.by else curves.pooled.to_frame().T
+    return ForecastResponse(
+        campaigns_analyzed=len(data.campaigns),
+        grouped_by=curves.by,
+        curves=json.loads(params.to_json(orient="records")),
+        projections=json.loads(projections.to_json(orient="records")),
+        total={
+            "spend": float(spend),
+            "new_spend": float(new_spend),
+            "conversions": float(conversions),
+            "projected_conversions": float(projected),
+            "marginal_cpa": float((new_spend - spend) / (projected - conversions))
+            if projected != conversions else 0.0,
+        },
+        execution_time=time.perf_counter() - start,
+    )
+
+
+# Anomaly endpoints
+@app.post("/v1/metrics/ingest", response_model=AnomalyResponse)
+def ingest_metrics(data: MetricsIngest):
+    """Feed metric rows into the streaming detector; returns the anomalies they triggered"""
+    return AnomalyResponse(
+        records_observed=len(data.records),
+        anomalies=anomaly_detector.observe_many(data.records),
+    )
+
+
+@app.get("/v1/anomalies")
+def list_anomalies(limit: int = 100, campaign_id: Optional[str] = None,
+                   platform: Optional[str] = None):
+    return {
+        "anomalies": anomaly_detector.recent(
+            limit=limit,
+            campaign_ids=[campaign_id] if campaign_id is not None else None,
+            platform=platform,
+        ),
+        **anomaly_detector.stats(),
+    }
+
+
+# Job endpoints
+@app.post("/v1/jobs", response_model=JobResponse, status_code=202)
+def submit_job(data: CampaignData):
+    if not data.campaigns:
+        raise HTTPException(status_code=400, detail="No campaign data provided")
+    _check_models(data.models)
+    # The job id doubles as the run id, so a failed job can be resumed
+    run_id = new_run_id()
+    return jobs.submit(
+        run_optimization,
+        data.campaigns,
+        account_id=data.account_id,
+        mode=data.mode,
+        partition_by=data.partition_by,
+        incremental=data.incremental,
+        priority="batch",
+        models=data.models,
+        deadline=data.deadline_seconds,
+        agent_deadline=data.agent_deadline_seconds,
+        run_id=run_id,
+        job_id=run_id,
+    )
+
+
+@app.get("/v1/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+# Admin endpoints
+def _is_admin(request):
+    token = os.getenv("ADMIN_TOKEN")
+    return bool(token) and hmac.compare_digest(request.headers.get("x-admin-token", ""), token)
+
+
+def _check_admin(request):
+    """Admin endpoints are disabled (404) without ADMIN_TOKEN and need it (403)"""
+    if not os.getenv("ADMIN_TOKEN"):
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not _is_admin(request):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@app.get("/admin/profiles")
+def get_profiles(request: Request):
+    _check_admin(request)
+    return {"profiles": list_profiles()}
+
+
+@app.get("/admin/profiles/{profile_id}")
+def get_profile(profile_id: str, request: Request, format: Literal["text", "pstats"] = "text"):
+    """Summary of a saved profile, or the raw pstats file with ``?format=pstats``"""
+    _check_admin(request)
+    path = profile_path(profile_id, ".prof" if format == "pstats" else ".txt")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    if format == "pstats":
+        return FileResponse(path, media_type="application/octet-stream",
+                            filename=os.path.basename(path))
+    with open(path) as f:
+        return PlainTextResponse(f.read())
 
 
 @app.get("/metrics")
@@ -126,11 +729,14 @@ async def add_metrics(request: Request, call_next):
     response = await call_next(request)
     process_time = time.time() - start_time
 
+    # Label by route template (/v1/jobs/{job_id}), not the path, to bound cardinality
+    route = request.scope.get("route")
+    endpoint = route.path if route is not None else "unmatched"
     request_count.labels(
         method=request.method,
-        endpoint=request.url.path,
+        endpoint=endpoint,
         status=response.status_code,
     ).inc()
 
-    request_duration.labels(endpoint=request.url.path).observe(process_time)
+    request_duration.labels(endpoint=endpoint).observe(process_time)
     return response
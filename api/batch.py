@@ -0,0 +1,86 @@
+"""
+Batch optimization across many accounts
+
+Each account's campaign set is optimized independently on a bounded worker
+pool; results are yielded as they finish so callers can stream them.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+BATCH_MAX_PARALLELISM = int(os.getenv("BATCH_MAX_PARALLELISM", "4"))
+
+
+def resolve_parallelism(requested=None):
+    """Requested parallelism, capped by the server-wide BATCH_MAX_PARALLELISM"""
+    if not requested:
+        return BATCH_MAX_PARALLELISM
+    return max(1, min(requested, BATCH_MAX_PARALLELISM))
+
+
+def _run_account(fn, account_id, campaigns):
+    start = time.perf_counter()
+    try:
+        result = fn(campaigns, account_id=account_id)
+        # A run that hit its deadline returns what finished, as "partial"
+        partial = getattr(result, "status", None) == "partial"
+        return {
+            "account_id": account_id,
+            "status": "partial" if partial else "success",
+            "result": result,
+            "error": None,
+            "execution_time": time.perf_counter() - start,
+        }
+    except Exception as e:
+        return {
+            "account_id": account_id,
+            "status": "failed",
+            "result": None,
+            "error": str(e),
+            "execution_time": time.perf_counter() - start,
+        }
+
+
+def run_batch(accounts, fn, max_parallelism=None):
+    """
+    Optimize accounts concurrently, yielding each result as it completes
+
+    Args:
+        accounts: List of (account_id, campaigns) pairs
+        fn: Called as fn(campaigns, account_id=...) for each account
+        max_parallelism: Upper bound on accounts running at once
+
+    Yields:
+        dict: Per-account result with ``status`` "success", "partial" (some
+            tasks did not finish in time) or "failed"; a failure in one
+            account never affects the others
+    """
+    workers = min(resolve_parallelism(max_parallelism), max(len(accounts), 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="optimize-batch") as pool:
+        futures = [
+            pool.submit(_run_account, fn, account_id, campaigns)
+            for account_id, campaigns in accounts
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(results):
+    """
+    Counts of per-account statuses and the batch's overall status
+
+    Returns:
+        dict: ``succeeded``, ``partial`` and ``failed`` counts, and ``status``:
+            "success" if every account succeeded, "failed" if none did
+            (fully or partly), else "partial"
+    """
+    counts = {status: sum(r["status"] == status for r in results)
+              for status in ("success", "partial", "failed")}
+    if counts["success"] == len(results):
+        status = "success"
+    elif counts["failed"] == len(results):
+        status = "failed"
+    else:
+        status = "partial"
+    return {"status": status, "succeeded": counts["success"], "partial": counts["partial"],
+            "failed": counts["failed"]}
@@ -0,0 +1,88 @@
+"""
+In-memory job store for asynchronous optimizations
+
+Clients submit a job, get an id back immediately and poll for the result,
+instead of holding an HTTP request open for the whole crew run.
+"""
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class JobStore:
+    """
+    Runs submitted jobs on a thread pool and keeps their status.
+
+    Only the most recent ``max_jobs`` jobs are kept so a long-lived
+    server doesn't accumulate results forever.
+    """
+
+    def __init__(self, max_workers=None, max_jobs=None):
+        self.max_workers = max_workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.max_jobs = max_jobs or int(os.getenv("JOB_HISTORY", "1000"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="optimize-job"
+        )
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, job_id=None, **kwargs):
+        """
+        Queue ``fn(*args, **kwargs)`` as a job
+
+        Args:
+            job_id: Id to give the job (default: a new uuid)
+
+        Returns:
+            dict: Snapshot of the new job
+        """
+        job_id = job_id or uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "submitted_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return dict(job)
+
+    def get(self, job_id):
+        """Return a snapshot of a job, or None if it is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self):
+        """
+        Returns:
+            tuple: (queued jobs, running jobs)
+        """
+        with self._lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+        return statuses.count("queued"), statuses.count("running")
+
+    def _run(self, job, fn, args, kwargs):
+        job["status"] = "running"
+        job["started_at"] = datetime.now().isoformat()
+        try:
+            job["result"] = fn(*args, **kwargs)
+            job["status"] = "succeeded"
+        except Exception as e:
+            job["error"] = str(e)
+            job["status"] = "failed"
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,334 @@
+"""
+Crew runs in pooled worker processes
+
+With CREW_WORKERS > 0 the API runs each optimization in one of that many
+long-lived worker processes instead of its own threads, so a crew that leaks
+memory or hangs in crewai/LangChain code cannot degrade the server, and
+concurrent runs use separate cores. A worker is replaced after
+CREW_WORKER_MAX_RUNS runs, or as soon as its resident memory exceeds
+CREW_WORKER_MAX_MEMORY_MB. The parent checks that during runs (where /proc
+is available) as well as after them, and kills a worker that crosses it
+mid-run. A worker whose run is cancelled (e.g. the client disconnected), or
+that is still busy CREW_WORKER_KILL_GRACE seconds past the run's deadline,
+is killed too; finished tasks are already checkpointed, so the run can be
+resumed.
+
+Calls and results travel over a pipe as one pickle each (highest protocol).
+
+Workers share the LLM budget by division: each one's rate limiter (see
+agents.rate_limiter) gets 1/CREW_WORKERS of LLM_RPM_LIMIT and LLM_TPM_LIMIT,
+so together they stay within the configured limits. Priorities are applied
+when runs are admitted to a worker: a queued interactive run gets the next
+free worker ahead of batch runs. Each worker has its own circuit breaker.
+
+Prompt fields built from the API's in-memory state (stream anomalies, past
+run precedents) are computed by the API and passed with the call, since a
+worker's own copies would be empty or stale.
+
+    CREW_WORKERS                 worker processes, 0 runs crews in-process (default 0)
+    CREW_WORKER_MAX_RUNS         runs before a worker is replaced (default 50)
+    CREW_WORKER_MAX_MEMORY_MB    RSS above which a worker is replaced (default 1024)
+    CREW_WORKER_KILL_GRACE       seconds past the deadline before a busy worker is killed (default 30)
+"""
+import heapq
+import itertools
+import multiprocessing
+import os
+import pickle
+import resource
+import signal
+import sys
+import threading
+import time
+
+from agents.deadlines import POLL_INTERVAL, DeadlineExceeded, RunCancelled
+from monitoring.metrics import crew_worker_recycles, crew_worker_rss
+
+CREW_WORKERS = int(os.getenv("CREW_WORKERS", "0"))
+CREW_WORKER_MAX_RUNS = int(os.getenv("CREW_WORKER_MAX_RUNS", "50"))
+CREW_WORKER_MAX_MEMORY_MB = float(os.getenv("CREW_WORKER_MAX_MEMORY_MB", "1024"))
+CREW_WORKER_KILL_GRACE = float(os.getenv("CREW_WORKER_KILL_GRACE", "30"))
+
+
+class CrewWorkerError(RuntimeError):
+    """
+    Stand-in for an exception raised in a worker that cannot be pickled
+
+    Keeps the HTTP status of the original (e.g. 429 from the provider) so
+    the API maps it the same way.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+    def __reduce__(self):
+        return type(self), (str(self), self.status_code)
+
+
+def _rss_bytes(pid="self"):
+    """Resident memory of a process; None for another process without /proc"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        if pid != "self":
+            return None
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _portable_error(error):
+    try:
+        pickle.loads(pickle.dumps(error, protocol=pickle.HIGHEST_PROTOCOL))
+        return error
+    except Exception:
+        from agents.rate_limiter import _error_chain, _status_code, is_rate_limit_error
+
+        status = 429 if is_rate_limit_error(error) else next(
+            (s for s in map(_status_code, _error_chain(error)) if s is not None), None
+        )
+        return CrewWorkerError(f"{type(error).__name__}: {error}", status_code=status)
+
+
+def _worker_main(conn, limit_share):
+    from agents.rate_limiter import configure_rate_limiter
+
+    # Ctrl-C is for the parent, which shuts the workers down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure_rate_limiter(share=limit_share)
+    while True:
+        try:
+            message = conn.recv_bytes()
+        except EOFError:
+            return
+        if not message:
+            return
+        fn, args, kwargs = pickle.loads(message)
+        try:
+            ok, value = True, fn(*args, **kwargs)
+        except BaseException as e:
+            ok, value = False, _portable_error(e)
+        try:
+            payload = pickle.dumps((ok, value, _rss_bytes()), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            payload = pickle.dumps(
+                (False, CrewWorkerError(f"Unpicklable result: {e}"), _rss_bytes()),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        conn.send_bytes(payload)
+
+
+class _Worker:
+    def __init__(self, context, number, limit_share):
+        self.name = f"crew-worker-{number}"
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child, limit_share), name=self.name, daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.runs = 0
+
+    def stop(self, timeout=5):
+        try:
+            self.conn.send_bytes(b"")
+        except OSError:
+            pass
+        self.process.join(timeout)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class CrewWorkerPool:
+    """
+    Bounded pool of recycled worker processes
+
+    Args:
+        workers: Runs at once, one process each (default CREW_WORKERS)
+        max_runs: Runs before a worker is replaced (default CREW_WORKER_MAX_RUNS)
+        max_memory_mb: RSS above which the worker is replaced, killing it
+            mid-run if need be (default CREW_WORKER_MAX_MEMORY_MB)
+        kill_grace: Seconds past a run's deadline before its worker is
+            killed (default CREW_WORKER_KILL_GRACE)
+    """
+
+    def __init__(self, workers=None, max_runs=None, max_memory_mb=None, kill_grace=None):
+        self.workers = max(1, workers or CREW_WORKERS)
+        self.max_runs = max_runs or CREW_WORKER_MAX_RUNS
+        self.max_memory = (max_memory_mb or CREW_WORKER_MAX_MEMORY_MB) * 1024 * 1024
+        self.kill_grace = CREW_WORKER_KILL_GRACE if kill_grace is None else kill_grace
+        # spawn: forking a server with live threads can deadlock the child
+        self._context = multiprocessing.get_context("spawn")
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._idle = []
+        self._started = 0
+        self._busy = 0
+        self._closed = False
+
+    def _acquire(self, priority, control):
+        from agents.rate_limiter import PRIORITIES
+
+        entry = (PRIORITIES[priority], next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while not self._closed and (self._waiters[0] != entry or self._busy >= self.workers):
+                    if control is not None:
+                        control.check()
+                    self._cond.wait(POLL_INTERVAL)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+            if self._closed:
+                raise RuntimeError("Crew worker pool is shut down")
+            self._busy += 1
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+            number = self._started
+        try:
+            return _Worker(self._context, number, 1 / self.workers)
+        except BaseException:
+            self._release(None)
+            raise
+
+    def _release(self, worker):
+        with self._cond:
+            self._busy -= 1
+            if worker is not None and not self._closed:
+                self._idle.append(worker)
+                worker = None
+            self._cond.notify_all()
+        if worker is not None:
+            worker.stop()
+
+    def _retire(self, worker, reason):
+        print(f"♻️  Replacing {worker.name} ({reason}, {worker.runs} runs)")
+        crew_worker_recycles.labels(reason=reason).inc()
+        try:
+            crew_worker_rss.remove(worker.name)
+        except KeyError:
+            pass
+
+    def run(self, fn, *args, control=None, priority="interactive", **kwargs):
+        """
+        Call ``fn(*args, **kwargs)`` in a worker process and return its result
+
+        ``fn``, its arguments and its result must be picklable; ``fn`` must be
+        importable by name (a module-level function).
+
+        Args:
+            control: RunControl of the call. Cancelling it kills the worker;
+                so does running ``kill_grace`` seconds past its deadline.
+                Pass the remaining time to ``fn`` so the run itself can stop
+                in time and return partial results.
+            priority: "interactive" or "batch"; decides which queued call
+                gets the next free worker
+
+        Raises:
+            RunCancelled / DeadlineExceeded: If the worker was killed, or the
+                call was cancelled while queued
+            Exception: Whatever ``fn`` raised (CrewWorkerError if it
+                cannot be pickled)
+        """
+        worker = self._acquire(priority, control)
+        try:
+            worker.conn.send_bytes(pickle.dumps((fn, args, kwargs), protocol=pickle.HIGHEST_PROTOCOL))
+            while not worker.conn.poll(POLL_INTERVAL):
+                if not worker.process.is_alive():
+                    self._retire(worker, "crashed")
+                    raise RuntimeError(
+                        f"{worker.name} exited unexpectedly (exit code {worker.process.exitcode})"
+                    )
+                rss = _rss_bytes(worker.process.pid)
+                if rss is not None and rss > self.max_memory:
+                    self._retire(worker, "memory")
+                    raise CrewWorkerError(
+                        f"{worker.name} exceeded {self.max_memory / 1024 / 1024:.0f} MB "
+                        f"during the run and was killed"
+                    )
+                if control is None:
+                    continue
+                reason = control.reason
+                if reason not in (None, "deadline"):
+                    self._retire(worker, "cancelled")
+                    raise RunCancelled(reason)
+                if control.deadline is not None and \
+                        time.monotonic() > control.deadline + self.kill_grace:
+                    self._retire(worker, "deadline")
+                    raise DeadlineExceeded()
+            ok, value, rss = pickle.loads(worker.conn.recv_bytes())
+        except BaseException:
+            worker.kill()
+            self._release(None)
+            raise
+
+        worker.runs += 1
+        crew_worker_rss.labels(worker=worker.name).set(rss)
+        if worker.runs >= self.max_runs:
+            self._retire(worker, "max_runs")
+            worker.stop()
+            worker = None
+        elif rss > self.max_memory:
+            self._retire(worker, "memory")
+            worker.stop()
+            worker = None
+        self._release(worker)
+
+        if not ok:
+            raise value
+        return value
+
+    def stats(self):
+        """
+        Returns:
+            tuple: (runs waiting for a worker, workers running a call)
+        """
+        with self._cond:
+            return len(self._waiters), self._busy
+
+    def shutdown(self):
+        """Stop idle workers; busy ones are stopped when their run returns"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            worker.stop()
+
+
+def run_crew_in_worker(campaign_data, run_id, priority, deadline, task_timeout,
+                       account_id=None, anomalies=(), precedents=None, **crew_kwargs):
+    """
+    Worker side of an API optimization: crew.run_ad_optimizer_crew() with
+    the run's remaining deadline, LLM priority and checkpoints
+
+    Args:
+        account_id: Account of the run (see runs.index.account_scope)
+        anomalies: The API's recent anomalies for the request's campaigns
+        precedents: The API's precedent summary for the request
+
+    Returns:
+        CrewResult: As crew.run_ad_optimizer_crew()
+    """
+    from agents.deadlines import RunControl
+    from agents.rate_limiter import llm_priority
+    from analysis.anomalies import anomaly_scope
+    from crew import run_ad_optimizer_crew
+    from runs.checkpoints import checkpointing
+    from runs.index import account_scope
+
+    control = RunControl(deadline, task_timeout=task_timeout)
+    with llm_priority(priority), checkpointing(run_id), \
+            account_scope(account_id, precedents), anomaly_scope(anomalies):
+        return run_ad_optimizer_crew(campaign_data, control=control, **crew_kwargs)
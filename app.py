@@ -14,6 +14,8 @@ import requests
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from client import OptimizerClient, OptimizerAPIError
+
 # Configuration
 # When deployed to HuggingFace Spaces, set API_URL environment variable
 # When running locally, default to localhost
@@ -24,6 +26,9 @@ API_URL = os.getenv(
 
 print(f"🌐 API URL: {API_URL}")
 
+# One client per process: reuses keep-alive connections and retries 429/503
+client = OptimizerClient(API_URL, timeout=300)  # 5 minute timeout for long-running optimizations
+
 
 def run_optimization(campaign_json):
     """
@@ -50,17 +55,7 @@ def run_optimization(campaign_json):
         # Make HTTP request to FastAPI backend
         print(f"📡 Calling API: {API_URL}/v1/optimize")
 
-        response = requests.post(
-            f"{API_URL}/v1/optimize",
-            json={"campaigns": campaigns},
-            timeout=300  # 5 minute timeout for long-running optimizations
-        )
-
-        # Check if request was successful
-        if response.status_code != 200:
-            return f"❌ API Error ({response.status_code}): {response.text}"
-
-        result = response.json()
+        result = client.optimize(campaigns)
 
         # Format results nicely
         output = "✅ OPTIMIZATION COMPLETE\n\n"
@@ -77,6 +72,9 @@ def run_optimization(campaign_json):
     except json.JSONDecodeError as e:
         return f"❌ JSON Error: {str(e)}\n\nMake sure your input is valid JSON"
 
+    except OptimizerAPIError as e:
+        return f"❌ API Error ({e.status_code}): {e.text}"
+
     except requests.exceptions.ConnectionError:
         return f"❌ Connection Error: Cannot connect to API at {API_URL}\n\nMake sure the FastAPI backend is running:\n  uvicorn api.app:app --reload"
 
@@ -0,0 +1,302 @@
+"""
+Concurrency load test for the API
+
+Drives ``POST /v1/optimize`` at one or more concurrency levels and payload
+sizes while probing ``/health`` and ``/metrics`` in the background, and
+reports throughput, latency percentiles, error rates and probe latency under
+load. Unless ``--base-url`` is given, a local server is started with the
+stub LLM (LLM_MODEL=stub) so only our own code is measured.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --concurrency 1,4,16 --campaigns 10,200 --requests 50
+    python -m benchmarks.load_test --llm-latency 0.2 --compare results/loadtest/baseline.json
+    python -m benchmarks.load_test --base-url http://staging:8000
+
+Results are saved as JSON (default: results/loadtest/<timestamp>.json).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+PROBE_PATHS = ("/health", "/metrics")
+PLATFORMS = ("Google", "Meta", "LinkedIn", "TikTok")
+
+
+def make_campaigns(count, seed=0):
+    """Deterministic synthetic campaigns shaped like the API's input"""
+    rng = random.Random(seed)
+    campaigns = []
+    for i in range(count):
+        impressions = rng.randint(1_000, 500_000)
+        clicks = int(impressions * rng.uniform(0.005, 0.06))
+        conversions = int(clicks * rng.uniform(0.01, 0.2))
+        spend = round(clicks * rng.uniform(0.3, 4.0), 2)
+        campaigns.append({
+            "campaign_id": i + 1,
+            "campaign_name": f"Campaign {i + 1}",
+            "platform": PLATFORMS[i % len(PLATFORMS)],
+            "impressions": impressions,
+            "clicks": clicks,
+            "conversions": conversions,
+            "spend": spend,
+            "ctr": round(clicks / impressions, 4),
+            "conversion_rate": round(conversions / clicks, 4) if clicks else 0.0,
+            "cpc": round(spend / clicks, 2) if clicks else 0.0,
+            "cpa": round(spend / conversions, 2) if conversions else 0.0,
+        })
+    return campaigns
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (None for no values)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_latencies(latencies):
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else None,
+    }
+
+
+async def _probe(client, stop, interval, samples):
+    while not stop.is_set():
+        for path in PROBE_PATHS:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            samples[path].append((time.perf_counter() - start, ok))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(base_url, concurrency, campaign_count, total_requests, timeout, probe_interval):
+    """
+    Send ``total_requests`` optimizations, ``concurrency`` at a time
+
+    Returns:
+        dict: Throughput, latency, error and probe statistics for the level
+    """
+    payload = {"campaigns": make_campaigns(campaign_count), "mode": "single"}
+    latencies = []
+    statuses = {}
+    remaining = iter(range(total_requests))
+
+    limits = httpx.Limits(max_connections=concurrency + len(PROBE_PATHS))
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/v1/optimize", json=payload)
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        stop = asyncio.Event()
+        probes = {path: [] for path in PROBE_PATHS}
+        prober = asyncio.create_task(_probe(client, stop, probe_interval, probes))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await prober
+
+    errors = total_requests - statuses.get("200", 0)
+    return {
+        "concurrency": concurrency,
+        "campaigns": campaign_count,
+        "requests": total_requests,
+        "elapsed": elapsed,
+        "throughput": total_requests / elapsed if elapsed else None,
+        "error_rate": errors / total_requests if total_requests else 0.0,
+        "statuses": statuses,
+        "latency": summarize_latencies(latencies),
+        "probes": {
+            path: dict(
+                summarize_latencies([s for s, _ in samples]),
+                failures=sum(not ok for _, ok in samples),
+                samples=len(samples),
+            )
+            for path, samples in probes.items()
+        },
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_server(llm_latency, workers=1, startup_timeout=60):
+    """
+    Start the API on a free port with the stub LLM
+
+    Returns:
+        tuple: (subprocess.Popen, base URL)
+    """
+    port = _free_port()
+    env = {
+        **os.environ,
+        "LLM_MODEL": "stub",
+        "STUB_LLM_LATENCY": str(llm_latency),
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "load-test"),
+        # Measure warm instances; the harness waits for warm-up to finish
+        "WARMUP_ON_STARTUP": "1",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "CREWAI_TRACING_ENABLED": "false",
+        "OTEL_SDK_DISABLED": "true",
+        "PYTHONPATH": str(PROJECT_ROOT),
+    }
+    # Run from a scratch directory so the reports each request writes to
+    # results/ do not pile up in the project
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.app:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=tempfile.mkdtemp(prefix="loadtest-"),
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"API server exited with status {proc.returncode}")
+        try:
+            ready = httpx.get(f"{base_url}/ready", timeout=1).json()
+            if ready.get("warmup") in ("done", "failed"):
+                return proc, base_url
+        except (httpx.HTTPError, ValueError):
+            pass
+        time.sleep(0.5)
+
+    proc.terminate()
+    raise RuntimeError(f"API server not ready after {startup_timeout}s")
+
+
+def compare(results, baseline):
+    """Print throughput and p95 changes against a previous run's results"""
+    previous = {(r["concurrency"], r["campaigns"]): r for r in baseline["levels"]}
+    print(f"\n📊 Compared with {baseline.get('timestamp', 'baseline')}")
+    for r in results["levels"]:
+        before = previous.get((r["concurrency"], r["campaigns"]))
+        if before is None:
+            continue
+        throughput = (r["throughput"] / before["throughput"] - 1) * 100 if before["throughput"] else 0
+        p95 = (r["latency"]["p95"] / before["latency"]["p95"] - 1) * 100 if before["latency"]["p95"] else 0
+        print(f"  c={r['concurrency']:<4} n={r['campaigns']:<6} "
+              f"throughput {throughput:+6.1f}%   p95 latency {p95:+6.1f}%")
+
+
+def _print_level(r):
+    latency = r["latency"]
+    health = r["probes"]["/health"]
+    print(
+        f"{r['concurrency']:>5}{r['campaigns']:>8}{r['throughput']:>10.2f}"
+        f"{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}"
+        f"{r['error_rate'] * 100:>8.1f}%"
+        f"{(health['p95'] or 0) * 1000:>12.1f}"
+    )
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test /v1/optimize")
+    parser.add_argument("--base-url", help="Test a running server instead of starting one")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4, 8],
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--campaigns", type=_int_list, default=[10, 100],
+                        help="Comma-separated payload sizes (campaigns per request)")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per level")
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="Seconds the stub LLM takes per call (local server only)")
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn workers (local server only)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout")
+    parser.add_argument("--probe-interval", type=float, default=0.5)
+    parser.add_argument("--output", help="JSON results path")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        print("🚀 Starting local API server with the stub LLM...")
+        server, base_url = start_local_server(args.llm_latency, args.workers)
+
+    levels = []
+    try:
+        print("=" * 72)
+        print(f"{'Conc':>5}{'Camps':>8}{'Req/s':>10}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}"
+              f"{'Errors':>9}{'Health p95':>12}")
+        print("=" * 72)
+        for campaign_count in args.campaigns:
+            for concurrency in args.concurrency:
+                level = asyncio.run(run_level(
+                    base_url, concurrency, campaign_count, args.requests,
+                    args.timeout, args.probe_interval,
+                ))
+                levels.append(level)
+                _print_level(level)
+        print("=" * 72)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "base_url": args.base_url or "local",
+        "llm_latency": args.llm_latency if args.base_url is None else None,
+        "requests_per_level": args.requests,
+        "levels": levels,
+    }
+    output = args.output or f"results/loadtest/{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+    errors = sum(level["error_rate"] > 0 for level in levels)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
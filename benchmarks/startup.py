@@ -0,0 +1,125 @@
+"""
+Cold-start import benchmark
+
+Imports each module in a fresh interpreter with ``python -X importtime`` and
+reports how long it takes, so cold start stays measured and bounded.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget api.app=1.5 --output results/startup.json
+
+Exits with status 1 if any module exceeds its budget.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_MODULES = [
+    "monitoring.metrics",
+    "api.app",
+    "crew",
+    "crewai",
+    "tasks.ad_tasks",
+    "data.public_data_loader",
+]
+
+# Seconds. Only modules on the request path that must stay light are bounded
+# by default; crewai itself is reported for reference.
+DEFAULT_BUDGETS = {
+    "monitoring.metrics": 0.5,
+    "api.app": 2.0,
+    "crew": 0.1,
+}
+
+
+def measure_import(module):
+    """
+    Import a module in a fresh interpreter and measure it.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        dict: Cumulative import time of the module itself and the
+            number of modules it pulled in
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative_us = 0
+    modules_loaded = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.partition(":")[2].split("|")
+        modules_loaded += 1
+        # Nested imports are indented under their parent; summing the
+        # top-level entries also counts what the interpreter loaded first.
+        if not name.startswith("  "):
+            cumulative_us += int(cumulative)
+
+    return {"module": module, "seconds": cumulative_us / 1e6, "modules_loaded": modules_loaded}
+
+
+def run_benchmark(modules, budgets):
+    """Measure every module and flag the ones over budget"""
+    results = []
+    for module in modules:
+        result = measure_import(module)
+        budget = budgets.get(module)
+        result["budget"] = budget
+        result["over_budget"] = budget is not None and result["seconds"] > budget
+        results.append(result)
+    return results
+
+
+def _parse_budgets(items):
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in items or []:
+        module, _, seconds = item.partition("=")
+        budgets[module] = float(seconds)
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time per module")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--budget", action="append", metavar="MODULE=SECONDS",
+                        help="Fail if MODULE takes longer than SECONDS to import")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.modules, _parse_budgets(args.budget))
+
+    print("=" * 64)
+    print(f"{'Module':<28}{'Import (s)':>12}{'Budget (s)':>12}{'Modules':>10}")
+    print("=" * 64)
+    for r in results:
+        budget = f"{r['budget']:.2f}" if r["budget"] is not None else "—"
+        flag = "  ❌" if r["over_budget"] else ""
+        print(f"{r['module']:<28}{r['seconds']:>12.3f}{budget:>12}{r['modules_loaded']:>10}{flag}")
+    print("=" * 64)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved: {args.output}")
+
+    return 1 if any(r["over_budget"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""Python client for the Ad Optimizer API"""
+from .base import OptimizerAPIError
+from .sync_client import OptimizerClient
+from .async_client import AsyncOptimizerClient
+
+__all__ = ["OptimizerClient", "AsyncOptimizerClient", "OptimizerAPIError"]
@@ -0,0 +1,139 @@
+"""asyncio client built on a pooled httpx.AsyncClient"""
+import asyncio
+import json
+import time
+
+import httpx
+
+from .base import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TIMEOUT,
+    RETRY_STATUSES,
+    OptimizerAPIError,
+    backoff_delay,
+    batch_payload,
+    normalize_base_url,
+)
+
+
+class AsyncOptimizerClient:
+    """
+    asyncio counterpart of OptimizerClient with the same methods.
+
+    Example:
+        >>> async with AsyncOptimizerClient("http://127.0.0.1:8000") as client:
+        ...     result = await client.optimize(campaigns)
+    """
+
+    def __init__(
+        self,
+        base_url=DEFAULT_BASE_URL,
+        timeout=DEFAULT_TIMEOUT,
+        max_retries=4,
+        backoff_base=0.5,
+        backoff_max=30.0,
+        pool_size=10,
+    ):
+        self.base_url = normalize_base_url(base_url)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def _request(self, method, path, timeout=None, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.request(
+                    method, path, timeout=timeout or self.timeout, **kwargs
+                )
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # Only connect failures: a dropped request may have run
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(
+                    backoff_delay(
+                        attempt,
+                        self.backoff_base,
+                        self.backoff_max,
+                        response.headers.get("Retry-After"),
+                    )
+                )
+                continue
+
+            if response.status_code >= 400:
+                raise OptimizerAPIError(response.status_code, response.text)
+            return response.json()
+
+    async def health(self):
+        return await self._request("GET", "/health", timeout=10)
+
+    async def optimize(self, campaigns, timeout=None):
+        return await self._request(
+            "POST", "/v1/optimize", json={"campaigns": campaigns}, timeout=timeout
+        )
+
+    async def submit_job(self, campaigns):
+        job = await self._request("POST", "/v1/jobs", json={"campaigns": campaigns}, timeout=30)
+        return job["job_id"]
+
+    async def get_job(self, job_id):
+        return await self._request("GET", f"/v1/jobs/{job_id}", timeout=30)
+
+    async def wait_for_job(self, job_id, poll_interval=2.0, timeout=None):
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.get_job(job_id)
+            if job["status"] == "succeeded":
+                return job["result"]
+            if job["status"] == "failed":
+                raise OptimizerAPIError(500, job["error"])
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} still {job['status']} after {timeout}s")
+            await asyncio.sleep(poll_interval)
+
+    async def submit_many(self, campaign_sets):
+        """Submit several campaign sets as jobs concurrently, returning their ids in order"""
+        return await asyncio.gather(*(self.submit_job(c) for c in campaign_sets))
+
+    async def optimize_batch(self, accounts, max_parallelism=None, timeout=None):
+        """Optimize many accounts (account_id -> campaigns) in a single request"""
+        return await self._request(
+            "POST", "/v1/optimize/batch",
+            json=batch_payload(accounts, max_parallelism), timeout=timeout,
+        )
+
+    async def stream_batch(self, accounts, max_parallelism=None, timeout=None):
+        """Async generator yielding each account's result as soon as it finishes"""
+        async with self.client.stream(
+            "POST", "/v1/optimize/batch",
+            params={"stream": "true"},
+            json=batch_payload(accounts, max_parallelism),
+            timeout=timeout or self.timeout,
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                raise OptimizerAPIError(response.status_code, response.text)
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
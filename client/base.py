@@ -0,0 +1,57 @@
+"""Shared settings and retry policy for the sync and async clients"""
+import os
+import random
+
+DEFAULT_BASE_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
+DEFAULT_TIMEOUT = float(os.getenv("OPTIMIZE_TIMEOUT", "300"))
+
+# Status codes that mean "not processed, try again later". Besides these, only
+# failures to connect are retried: a request that was sent may have run.
+RETRY_STATUSES = (429, 503)
+
+
+class OptimizerAPIError(Exception):
+    """Raised when the API answers with a non-success status"""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"API error {status_code}: {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+def normalize_base_url(url):
+    """
+    Accept either the API root or a full /v1/optimize URL
+
+    Older configs point API_URL straight at the optimize endpoint.
+    """
+    url = url.rstrip("/")
+    if url.endswith("/v1/optimize"):
+        url = url[: -len("/v1/optimize")]
+    return url
+
+
+def backoff_delay(attempt, backoff_base, backoff_max, retry_after=None):
+    """
+    Seconds to wait before retry number ``attempt`` (0-based)
+
+    Honors a numeric Retry-After header, otherwise uses exponential
+    backoff with full jitter so concurrent clients don't retry in lockstep.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), backoff_max)
+        except ValueError:
+            pass
+    return random.uniform(0, min(backoff_max, backoff_base * 2 ** attempt))
+
+
+def batch_payload(accounts, max_parallelism=None):
+    """Request body for /v1/optimize/batch from an account_id -> campaigns mapping"""
+    return {
+        "accounts": [
+            {"account_id": str(account_id), "campaigns": campaigns}
+            for account_id, campaigns in accounts.items()
+        ],
+        "max_parallelism": max_parallelism,
+    }
@@ -0,0 +1,183 @@
+"""Blocking client built on a pooled requests.Session"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from .base import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TIMEOUT,
+    RETRY_STATUSES,
+    OptimizerAPIError,
+    backoff_delay,
+    batch_payload,
+    normalize_base_url,
+)
+
+
+def _connect_failed(error):
+    """True if a request failed before reaching the server (refused or timed out connecting)"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, ConnectTimeoutError)
+
+
+class OptimizerClient:
+    """
+    Client for the Ad Optimizer API.
+
+    One instance keeps a pool of keep-alive connections and is safe to share
+    between threads; create it once and reuse it.
+
+    Example:
+        >>> with OptimizerClient("http://127.0.0.1:8000") as client:
+        ...     result = client.optimize(campaigns)
+    """
+
+    def __init__(
+        self,
+        base_url=DEFAULT_BASE_URL,
+        timeout=DEFAULT_TIMEOUT,
+        max_retries=4,
+        backoff_base=0.5,
+        backoff_max=30.0,
+        pool_size=10,
+    ):
+        self.base_url = normalize_base_url(base_url)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _send(self, method, path, timeout=None, **kwargs):
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.request(
+                    method, url, timeout=timeout or self.timeout, **kwargs
+                )
+            except requests.exceptions.ConnectionError as e:
+                # A connection dropped after sending may have run the request
+                if attempt == self.max_retries or not _connect_failed(e):
+                    raise
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(
+                    backoff_delay(
+                        attempt,
+                        self.backoff_base,
+                        self.backoff_max,
+                        response.headers.get("Retry-After"),
+                    )
+                )
+                continue
+
+            if response.status_code >= 400:
+                raise OptimizerAPIError(response.status_code, response.text)
+            return response
+
+    def _request(self, method, path, timeout=None, **kwargs):
+        return self._send(method, path, timeout=timeout, **kwargs).json()
+
+    def health(self):
+        return self._request("GET", "/health", timeout=10)
+
+    def optimize(self, campaigns, timeout=None):
+        """
+        Run an optimization and wait for the report
+
+        Args:
+            campaigns: List of campaign dictionaries
+            timeout: Seconds to wait for the response (defaults to client timeout)
+
+        Returns:
+            dict: OptimizationResponse payload
+        """
+        return self._request("POST", "/v1/optimize", json={"campaigns": campaigns}, timeout=timeout)
+
+    def submit_job(self, campaigns):
+        """Queue an optimization and return its job id without waiting"""
+        return self._request("POST", "/v1/jobs", json={"campaigns": campaigns}, timeout=30)["job_id"]
+
+    def get_job(self, job_id):
+        return self._request("GET", f"/v1/jobs/{job_id}", timeout=30)
+
+    def wait_for_job(self, job_id, poll_interval=2.0, timeout=None):
+        """
+        Poll a job until it finishes
+
+        Returns:
+            dict: OptimizationResponse payload of the finished job
+
+        Raises:
+            OptimizerAPIError: If the job failed
+            TimeoutError: If it didn't finish within ``timeout`` seconds
+        """
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_job(job_id)
+            if job["status"] == "succeeded":
+                return job["result"]
+            if job["status"] == "failed":
+                raise OptimizerAPIError(500, job["error"])
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} still {job['status']} after {timeout}s")
+            time.sleep(poll_interval)
+
+    def submit_many(self, campaign_sets):
+        """Submit several campaign sets as jobs concurrently, returning their ids in order"""
+        with ThreadPoolExecutor(max_workers=self.pool_size) as pool:
+            return list(pool.map(self.submit_job, campaign_sets))
+
+    def optimize_batch(self, accounts, max_parallelism=None, timeout=None):
+        """
+        Optimize many accounts in a single request
+
+        Args:
+            accounts: Mapping of account_id -> list of campaign dictionaries
+            max_parallelism: Accounts the server should run at once
+            timeout: Seconds to wait for the whole batch
+
+        Returns:
+            dict: BatchResponse payload with per-account results
+        """
+        return self._request(
+            "POST", "/v1/optimize/batch",
+            json=batch_payload(accounts, max_parallelism), timeout=timeout,
+        )
+
+    def stream_batch(self, accounts, max_parallelism=None, timeout=None):
+        """Like optimize_batch, but yields each account's result as soon as it finishes"""
+        response = self._send(
+            "POST", "/v1/optimize/batch",
+            params={"stream": "true"},
+            json=batch_payload(accounts, max_parallelism),
+            timeout=timeout,
+            stream=True,
+        )
+        with response:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
@@ -1,67 +1,808 @@
-from crewai import Crew, Process
-from agents.bid_optimizer import create_bid_optimizer
-from agents.analytics import create_analytics_agent
-from agents.budget_manager import create_budget_manager
-from agents.creative_analyzer import create_creative_analyzer
-from agents.orchestrator import create_orchestrator
-from tasks.ad_tasks import (
-    create_analytics_task,
-    create_bid_optimization_task,
-    create_budget_task,
-    create_creative_task,
-    create_orchestration_task,
-)
-
-
-def create_ad_optimizer_crew(campaign_data):
-    """Create and configure the 5-agent ad optimization crew"""
-
-    print("🤖 Initializing 5-Agent System...")
-
-    # Initialize agents
-    bid_optimizer = create_bid_optimizer()
-    analytics_agent = create_analytics_agent()
-    budget_manager = create_budget_manager()
-    creative_analyzer = create_creative_analyzer()
-    orchestrator = create_orchestrator()
-
-    print("✅ All 5 agents initialized")
-    print("   1. Analytics Agent")
-    print("   2. Bid Optimizer Agent")
-    print("   3. Budget Manager Agent")
-    print("   4. Creative Analyzer Agent")
-    print("   5. Orchestrator Agent")
-
-    # Create tasks (in order of execution)
-    print("\n📋 Creating tasks...")
-    analytics_task = create_analytics_task(analytics_agent, campaign_data)
-    bid_task = create_bid_optimization_task(bid_optimizer, campaign_data)
-    budget_task = create_budget_task(budget_manager, campaign_data)
-    creative_task = create_creative_task(creative_analyzer, campaign_data)
-    orchestration_task = create_orchestration_task(orchestrator)
-
-    print("✅ All tasks created")
+"""
+Agent orchestration for the 5-agent ad optimization crew.
+
+crewai (and LangChain underneath it) takes several seconds to import, so it is
+loaded lazily here rather than at module import time. This keeps processes
+that only need lightweight endpoints (e.g. the API's /health) fast to start;
+call warm_up() to pay the import cost ahead of the first optimization.
+"""
+import contextvars
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Execution order of the crew's tasks; the first four are the specialists
+TASK_ORDER = ("analytics", "bid", "budget", "creative", "orchestration")
+SPECIALIST_KEYS = TASK_ORDER[:-1]
+
+# Whose output each task receives as context. The specialists all work from
+# the analytics baseline; the orchestrator reconciles everything.
+TASK_DEPENDENCIES = {
+    "analytics": (),
+    "bid": ("analytics",),
+    "budget": ("analytics",),
+    "creative": ("analytics",),
+    "orchestration": SPECIALIST_KEYS,
+}
+
+# Same separator crewai puts between task outputs in a sequential crew
+TASK_OUTPUT_DIVIDER = "\n\n----------\n\n"
+
+# Accounts above this many campaigns are analyzed with map-reduce in "auto" mode
+MAP_REDUCE_THRESHOLD = int(os.getenv("MAP_REDUCE_THRESHOLD", "500"))
+MAP_REDUCE_PARTITION_SIZE = int(os.getenv("MAP_REDUCE_PARTITION_SIZE", "250"))
+
+
+@dataclass
+class CrewResult:
+    """Outcome of a crew run; str() gives the final report"""
+
+    report: str
+    task_outputs: dict
+    tasks_run: list
+    mode: str = "single"
+    changes: Optional[dict] = None
+    models: Optional[dict] = None
+    # Tasks that did not finish before their deadline or the run's cancellation
+    timed_out: list = field(default_factory=list)
+    # Validated result per task whose output matched its schema (tasks.schemas)
+    structured: dict = field(default_factory=dict)
+
+    def __str__(self):
+        return self.report
+
+
+def _report(outputs, timed_out):
+    """The orchestrator's report, or whatever finished if it did not run"""
+    from tasks.schemas import compact_output, parse_output, render_report
+
+    if "orchestration" in outputs:
+        plan = parse_output("orchestration", outputs["orchestration"])
+        return outputs["orchestration"] if plan is None else render_report(plan)
+    sections = [
+        f"Partial results: {', '.join(timed_out)} did not finish before the deadline."
+    ]
+    sections += [
+        f"[{key}]\n{compact_output(key, outputs[key])}" for key in TASK_ORDER if key in outputs
+    ]
+    return TASK_OUTPUT_DIVIDER.join(sections)
+
+
+def warm_up():
+    """Import crewai, the agents and the tasks so the first crew builds fast.
+
+    Returns:
+        float: Seconds spent warming up
+    """
+    start = time.perf_counter()
+
+    import crewai  # noqa: F401
+    import agents.analytics  # noqa: F401
+    import agents.bid_optimizer  # noqa: F401
+    import agents.budget_manager  # noqa: F401
+    import agents.creative_analyzer  # noqa: F401
+    import agents.orchestrator  # noqa: F401
+    import tasks.ad_tasks  # noqa: F401
+    from agents.rate_limiter import install_llm_hooks
+
+    install_llm_hooks()
+    get_agent_pool().prefill(1)
+
+    return time.perf_counter() - start
+
+
+def create_agents(models=None):
+    """
+    Create one full set of the 5 agents, keyed by role
+
+    Args:
+        models: Optional agent key -> model overrides (see agents.models)
+    """
+    from agents.bid_optimizer import create_bid_optimizer
+    from agents.analytics import create_analytics_agent
+    from agents.budget_manager import create_budget_manager
+    from agents.creative_analyzer import create_creative_analyzer
+    from agents.orchestrator import create_orchestrator
+    from agents.models import get_llm, resolve_models
+
+    from agents.rate_limiter import retry_llm_calls
+
+    llms = {key: get_llm(model) for key, model in resolve_models(models).items()}
+    agents = {
+        "analytics": create_analytics_agent(llm=llms["analytics"]),
+        "bid": create_bid_optimizer(llm=llms["bid"]),
+        "budget": create_budget_manager(llm=llms["budget"]),
+        "creative": create_creative_analyzer(llm=llms["creative"]),
+        "orchestration": create_orchestrator(llm=llms["orchestration"]),
+    }
+    # crewai's default model is built by the agent itself
+    for agent in agents.values():
+        retry_llm_calls(agent.llm)
+    return agents
+
+
+def _reset_agent(agent):
+    """Clear per-run state crewai leaves on an agent so it can be reused"""
+    agent.tools_results = []
+    agent.agent_executor = None
+    if hasattr(agent, "_times_executed"):
+        agent._times_executed = 0
+
+
+class AgentPool:
+    """
+    Per-process pool of ready-built agent sets.
+
+    Agents (and the LLM clients they hold) are built once and reused across
+    requests. crewai binds an agent to the crew running it, so each set is
+    checked out by a single run at a time; the pool grows on demand up to
+    ``size`` sets and further callers wait for one to be released.
+
+    Sets are built on the configured models. A checkout can route agents to
+    other models for one run; their configured LLMs are restored on release.
+    """
+
+    def __init__(self, size=None):
+        self.size = size or int(os.getenv("AGENT_POOL_SIZE", "4"))
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._abandoned = set()
+        self._lock = threading.Lock()
+
+    @property
+    def created(self):
+        return self._created
+
+    def prefill(self, count):
+        """Build up to ``count`` agent sets ahead of the first request"""
+        for _ in range(count):
+            with self._lock:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            self._idle.put(create_agents())
+
+    def acquire(self, timeout=None):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_build = self._created < self.size
+            if can_build:
+                self._created += 1
+        if can_build:
+            try:
+                return create_agents()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        return self._idle.get(timeout=timeout)
+
+    def release(self, agent_set):
+        ids = {id(agent) for agent in agent_set.values()}
+        with self._lock:
+            abandoned = bool(ids & self._abandoned)
+            self._abandoned -= ids
+        if abandoned:
+            # A timed-out task may still be running on this set; replace it
+            try:
+                agent_set = create_agents()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        for agent in agent_set.values():
+            _reset_agent(agent)
+        self._idle.put(agent_set)
+
+    def abandon(self, agent):
+        """Retire the set holding ``agent`` on release instead of reusing it"""
+        with self._lock:
+            self._abandoned.add(id(agent))
+
+    @contextmanager
+    def checkout(self, timeout=None, models=None):
+        """
+        Borrow an agent set for one run
+
+        Args:
+            timeout: Seconds to wait for a free set (forever if None)
+            models: Optional agent key -> model overrides for this run
+        """
+        from agents.models import get_llm
+
+        agent_set = self.acquire(timeout=timeout)
+        configured = {}
+        try:
+            for key, model in (models or {}).items():
+                llm = get_llm(model)
+                if llm is not None and agent_set[key].llm is not llm:
+                    configured[key] = agent_set[key].llm
+                    agent_set[key].llm = llm
+            yield agent_set
+        finally:
+            for key, llm in configured.items():
+                agent_set[key].llm = llm
+            self.release(agent_set)
+
+
+_agent_pool = None
+_agent_pool_lock = threading.Lock()
+
+
+def get_agent_pool():
+    """Return this process's shared agent pool, creating it on first use"""
+    global _agent_pool
+    if _agent_pool is None:
+        with _agent_pool_lock:
+            if _agent_pool is None:
+                _agent_pool = AgentPool()
+    return _agent_pool
+
+
+def create_ad_optimizer_crew(campaign_data, agents=None):
+    """
+    Create and configure the 5-agent ad optimization crew
+
+    Args:
+        campaign_data: List of campaign dictionaries
+        agents: Optional agent set from create_agents() / the agent pool.
+            A fresh set is built when omitted.
+
+    Returns:
+        Crew: Sequential crew ready for kickoff()
+    """
+    from crewai import Crew, Process
+    from tasks.ad_tasks import build_tasks
+
+    if agents is None:
+        print("🤖 Initializing 5-Agent System...")
+        agents = create_agents()
+        print("✅ All 5 agents initialized")
+        print("   1. Analytics Agent")
+        print("   2. Bid Optimizer Agent")
+        print("   3. Budget Manager Agent")
+        print("   4. Creative Analyzer Agent")
+        print("   5. Orchestrator Agent")
+
+    # Tasks are per-request: they carry the campaign data and their outputs
+    tasks = build_tasks(agents, campaign_data)
+    for key, task in tasks.items():
+        if TASK_DEPENDENCIES[key]:
+            task.context = [tasks[dep] for dep in TASK_DEPENDENCIES[key]]
 
     # Create crew with sequential process
     crew = Crew(
         agents=[
-            analytics_agent,
-            bid_optimizer,
-            budget_manager,
-            creative_analyzer,
-            orchestrator,
+            agents["analytics"],
+            agents["bid"],
+            agents["budget"],
+            agents["creative"],
+            agents["orchestration"],
         ],
         tasks=[
-            analytics_task,      # 1️⃣ Understand the data
-            bid_task,            # 2️⃣ Optimize bids
-            budget_task,         # 3️⃣ Reallocate budget
-            creative_task,       # 4️⃣ Improve creatives
-            orchestration_task,  # 5️⃣ Synthesize everything
+            tasks["analytics"],      # 1️⃣ Understand the data
+            tasks["bid"],            # 2️⃣ Optimize bids
+            tasks["budget"],         # 3️⃣ Reallocate budget
+            tasks["creative"],       # 4️⃣ Improve creatives
+            tasks["orchestration"],  # 5️⃣ Synthesize everything
         ],
         process=Process.sequential,
         verbose=True,
     )
 
-    print("✅ Crew assembled and ready!\n")
-
     return crew
+
+
+def _run_pipeline(agents, tasks, reuse=None, checkpoint=False):
+    """
+    Execute tasks in TASK_ORDER, feeding each its dependencies' outputs
+
+    Args:
+        agents: Agent set keyed like TASK_ORDER
+        tasks: Tasks to execute, keyed like TASK_ORDER (may be a subset)
+        reuse: Raw outputs of tasks that are not re-run, e.g. from a
+            previous snapshot or a reduce step
+        checkpoint: Record reused and completed outputs in the run's
+            checkpoint (account-level pipelines only, not map partitions)
+
+    Returns:
+        dict: Raw output per task key, reused ones included. Tasks that
+            timed out, or were not started because the run had to stop,
+            are missing.
+    """
+    from agents.deadlines import RunCancelled
+    from runs.checkpoints import record_output
+    from tasks.schemas import compact_output
+
+    outputs = dict(reuse or {})
+    if checkpoint:
+        for key, output in outputs.items():
+            record_output(key, output)
+    for key in TASK_ORDER:
+        task = tasks.get(key)
+        if task is None:
+            continue
+        if _run_stopped():
+            break
+
+        # Dependencies' results in their compact structured form where valid
+        context = TASK_OUTPUT_DIVIDER.join(
+            compact_output(dep, outputs[dep]) for dep in TASK_DEPENDENCIES[key] if dep in outputs
+        )
+        agent = agents[key]
+        tools = None
+        if agent.allow_delegation:
+            # What a Crew would inject: tools to delegate to the other agents
+            tools = agent.get_delegation_tools([agents[k] for k in TASK_ORDER if k != key])
+
+        try:
+            outputs[key] = _execute_task(key, agent, task, context, tools)
+            if checkpoint:
+                record_output(key, outputs[key])
+        except RunCancelled as e:
+            # Carry on without this task unless the whole run has to stop
+            print(f"⏱️  {key} task stopped: {e.reason}")
+    return outputs
+
+
+def _run_stopped():
+    from agents.deadlines import current_run
+
+    run = current_run()
+    return run is not None and run.reason is not None
+
+
+def _execute_task(key, agent, task, context="", tools=None):
+    """
+    Execute one task with rate limiting, a deadline and per-agent/model
+    metrics
+
+    Returns:
+        str: Raw task output
+
+    Raises:
+        RunCancelled: If the task overran its deadline or the run stopped
+    """
+    from agents.deadlines import AGENT_DEADLINE_SECONDS, RunCancelled, call_with_deadline, current_run
+    from agents.models import model_name
+    from agents.rate_limiter import estimate_tokens, get_rate_limiter, install_llm_hooks
+    from monitoring.metrics import (
+        agent_execution_time,
+        agent_failures,
+        agent_success,
+        crew_task_timeouts,
+        llm_model_latency,
+        llm_model_routing,
+    )
+
+    model = model_name(agent)
+    llm_model_routing.labels(agent_name=key, model=model).inc()
+
+    # Each LLM call is metered by the shared limiter through crewai's hooks;
+    # without them, fall back to metering once per task.
+    if not install_llm_hooks():
+        get_rate_limiter().acquire(estimate_tokens(task.description + context))
+
+    run = current_run()
+    timeout = run.task_timeout if run is not None else AGENT_DEADLINE_SECONDS
+
+    start = time.perf_counter()
+    try:
+        # Rate-limit and transient errors are retried per LLM call (see
+        # agents.models.get_llm), not by re-running the whole task
+        output = call_with_deadline(
+            task.execute_sync, agent=agent, context=context, tools=tools, timeout=timeout,
+        )
+    except RunCancelled:
+        crew_task_timeouts.labels(agent_name=key).inc()
+        get_agent_pool().abandon(agent)
+        raise
+    except Exception:
+        agent_failures.labels(agent_name=key).inc()
+        raise
+    elapsed = time.perf_counter() - start
+
+    agent_success.labels(agent_name=key).inc()
+    agent_execution_time.labels(agent_name=key).observe(elapsed)
+    llm_model_latency.labels(agent_name=key, model=model).observe(elapsed)
+    return output.raw
+
+
+def _models_in_use(agents):
+    from agents.models import model_name
+
+    return {key: model_name(agents[key]) for key in TASK_ORDER}
+
+
+def _submit(executor, fn, *args, **kwargs):
+    """executor.submit() that carries contextvars (e.g. the LLM priority) into the worker"""
+    from monitoring.profiling import in_profiled_thread
+
+    return executor.submit(contextvars.copy_context().run, in_profiled_thread(fn), *args, **kwargs)
+
+
+def run_ad_optimizer_crew(campaign_data, mode="auto", partition_by="platform", previous=None,
+                          models=None, control=None, resume=None):
+    """
+    Run the crew on campaign data using a pooled agent set
+
+    Args:
+        campaign_data: List of campaign dictionaries
+        mode: "single" runs one crew over the whole account, "map_reduce"
+            partitions it (see run_map_reduce), "auto" picks map-reduce
+            above MAP_REDUCE_THRESHOLD campaigns
+        partition_by: Partitioning used in map-reduce mode
+        previous: Snapshot of the account's last run (see runs.snapshots).
+            When given, only tasks whose inputs changed are re-run.
+        models: Optional agent key -> model overrides for this run
+            (see agents.models)
+        control: RunControl with the run's deadlines; cancel it to stop the
+            run early (default: CREW_DEADLINE_SECONDS, see agents.deadlines)
+        resume: Task outputs of an earlier, unfinished attempt at this run
+            (see runs.checkpoints); only the missing tasks and those
+            downstream of them are run
+
+    Completed task outputs are checkpointed when called inside
+    runs.checkpoints.checkpointing().
+
+    Returns:
+        CrewResult: Report and per-task outputs, with ``structured`` results
+            for the outputs that match their schema. Tasks that did not
+            finish in time are listed in ``timed_out``.
+    """
+    from agents.deadlines import CREW_DEADLINE_SECONDS, RunControl, run_control
+    from agents.models import validate_overrides
+    from monitoring.metrics import crew_runs_stopped
+
+    validate_overrides(models)
+    if mode == "auto":
+        mode = "map_reduce" if len(campaign_data) > MAP_REDUCE_THRESHOLD else "single"
+    if mode not in ("single", "map_reduce"):
+        raise ValueError(f"Unknown mode: {mode}")
+
+    from tasks.schemas import structured_outputs
+
+    control = control or RunControl(CREW_DEADLINE_SECONDS)
+    with run_control(control):
+        result = _run_crew(campaign_data, mode, partition_by, previous, models, resume)
+    result.structured = structured_outputs(result.task_outputs)
+    if result.timed_out:
+        crew_runs_stopped.labels(reason=control.reason or "task_deadline").inc()
+        print(f"⏱️  Partial results, unfinished: {', '.join(result.timed_out)}")
+    return result
+
+
+def _run_crew(campaign_data, mode, partition_by, previous, models, resume=None):
+    if resume:
+        return resume_run(campaign_data, resume, mode=mode, partition_by=partition_by,
+                          models=models)
+    if previous is not None:
+        return run_incremental(
+            campaign_data, previous, mode=mode, partition_by=partition_by, models=models
+        )
+    if mode == "map_reduce":
+        return run_map_reduce(campaign_data, partition_by=partition_by, models=models)
+
+    from tasks.ad_tasks import build_tasks
+
+    with get_agent_pool().checkout(models=models) as agents:
+        outputs = _run_pipeline(agents, build_tasks(agents, campaign_data), checkpoint=True)
+        used = _models_in_use(agents)
+    timed_out = [key for key in TASK_ORDER if key not in outputs]
+    return CrewResult(
+        report=_report(outputs, timed_out),
+        task_outputs=outputs,
+        tasks_run=list(TASK_ORDER),
+        models=used,
+        timed_out=timed_out,
+    )
+
+
+def tasks_to_rerun(changes):
+    """
+    Tasks whose inputs changed materially, plus everything downstream of them
+
+    Analytics ranks and segments every campaign on all of its fields, so any
+    added, removed or changed campaign makes its output stale, and with it
+    every task that takes that output as context.
+
+    Args:
+        changes: Output of runs.snapshots.diff_campaigns()
+
+    Returns:
+        list: Task keys in execution order; empty if nothing changed
+    """
+    dirty = set()
+    if changes["added"] or changes["removed"] or changes["changed"] or changes["totals_changed"]:
+        dirty.add("analytics")
+    for key in TASK_ORDER:
+        if any(dep in dirty for dep in TASK_DEPENDENCIES[key]):
+            dirty.add(key)
+
+    return [key for key in TASK_ORDER if key in dirty]
+
+
+def tasks_to_resume(completed):
+    """
+    Tasks an interrupted run still needs: those without an output, plus
+    everything downstream of them (their context would change)
+
+    Args:
+        completed: Raw output per task key that did finish
+
+    Returns:
+        list: Task keys in execution order; empty if the run was complete
+    """
+    dirty = set()
+    for key in TASK_ORDER:
+        if key not in completed or any(dep in dirty for dep in TASK_DEPENDENCIES[key]):
+            dirty.add(key)
+    return [key for key in TASK_ORDER if key in dirty]
+
+
+def resume_run(campaign_data, completed, mode="single", partition_by="platform", models=None):
+    """
+    Finish a run from the task outputs it checkpointed before failing
+
+    Args:
+        campaign_data: The run's campaign dictionaries
+        completed: Raw output per task key that finished (runs.checkpoints)
+        mode: "single" or "map_reduce"
+        partition_by: Partitioning used in map-reduce mode
+        models: Optional agent key -> model overrides for this run
+
+    Returns:
+        CrewResult: With ``tasks_run`` listing only the tasks that ran now
+    """
+    from tasks.ad_tasks import build_tasks
+
+    rerun = tasks_to_resume(completed)
+    if not rerun:
+        return CrewResult(
+            report=_report(completed, []), task_outputs=dict(completed), tasks_run=[], mode=mode
+        )
+
+    print(f"▶️  Resuming run: re-running {', '.join(rerun)}")
+    reuse = {k: v for k, v in completed.items() if k not in rerun}
+    if mode == "map_reduce":
+        return run_map_reduce(campaign_data, partition_by=partition_by, models=models, reuse=reuse)
+
+    with get_agent_pool().checkout(models=models) as agents:
+        outputs = _run_pipeline(
+            agents, build_tasks(agents, campaign_data, keys=rerun), reuse, checkpoint=True
+        )
+        used = _models_in_use(agents)
+    timed_out = [key for key in rerun if key not in outputs]
+    return CrewResult(
+        report=_report(outputs, timed_out),
+        task_outputs=outputs,
+        tasks_run=rerun,
+        models=used,
+        timed_out=timed_out,
+    )
+
+
+def run_incremental(campaign_data, previous, mode="single", partition_by="platform",
+                    tolerance=None, models=None):
+    """
+    Re-run only what changed since the account's previous run
+
+    Tasks not made stale by the changes (see tasks_to_rerun) keep their
+    previous output, which also feeds the re-run tasks as context. When
+    nothing changed materially, no agent runs and the previous report is
+    returned.
+    Map-reduce runs are all-or-nothing: any change re-runs the whole map.
+
+    Args:
+        campaign_data: List of campaign dictionaries
+        previous: Snapshot dict from runs.snapshots.load_latest_snapshot()
+        mode: "single" or "map_reduce"
+        partition_by: Partitioning used in map-reduce mode
+        tolerance: Relative change treated as material (see diff_campaigns)
+        models: Optional agent key -> model overrides for this run
+
+    Returns:
+        CrewResult: With ``changes`` set to the diff against ``previous``
+    """
+    from runs.snapshots import diff_campaigns
+    from tasks.ad_tasks import build_tasks
+
+    changes = diff_campaigns(previous["campaigns"], campaign_data, tolerance)
+    rerun = tasks_to_rerun(changes)
+
+    if not rerun:
+        print("⏭️  No material changes since the last run, reusing its report")
+        return CrewResult(
+            report=previous["report"],
+            task_outputs=previous["task_outputs"],
+            tasks_run=[],
+            mode=previous.get("mode", mode),
+            changes=changes,
+        )
+
+    if mode == "map_reduce" or previous.get("mode") == "map_reduce":
+        result = run_map_reduce(campaign_data, partition_by=partition_by, models=models)
+        result.changes = changes
+        return result
+
+    print(f"🔁 Incremental run: re-running {', '.join(rerun)}")
+    reuse = {k: v for k, v in previous["task_outputs"].items() if k not in rerun}
+    with get_agent_pool().checkout(models=models) as agents:
+        outputs = _run_pipeline(
+            agents, build_tasks(agents, campaign_data, keys=rerun), reuse, checkpoint=True
+        )
+        used = _models_in_use(agents)
+    timed_out = [key for key in rerun if key not in outputs]
+    return CrewResult(
+        report=_report(outputs, timed_out),
+        task_outputs=outputs,
+        tasks_run=rerun,
+        changes=changes,
+        models=used,
+        timed_out=timed_out,
+    )
+
+
+def partition_campaigns(campaign_data, by="platform", max_partition_size=None):
+    """
+    Split an account's campaigns into partitions for map-reduce analysis
+
+    Args:
+        campaign_data: List of campaign dictionaries
+        by: Campaign field to group on (e.g. "platform", "xyz_campaign_id"),
+            or "size" to only split into equal chunks
+        max_partition_size: Groups larger than this are chunked further
+
+    Returns:
+        dict: Partition label -> list of campaigns, in first-seen order
+    """
+    max_size = max_partition_size or MAP_REDUCE_PARTITION_SIZE
+
+    if by == "size":
+        groups = {"all": list(campaign_data)}
+    else:
+        groups = {}
+        for campaign in campaign_data:
+            groups.setdefault(str(campaign.get(by, "unknown")), []).append(campaign)
+
+    partitions = {}
+    for label, rows in groups.items():
+        if len(rows) <= max_size:
+            partitions[label] = rows
+            continue
+        for i in range(0, len(rows), max_size):
+            partitions[f"{label} #{i // max_size + 1}"] = rows[i:i + max_size]
+    return partitions
+
+
+def _map_partition(label, rows, total_campaigns, models=None, keys=SPECIALIST_KEYS):
+    """Run the specialist tasks (default: all four) on one partition"""
+    from tasks.ad_tasks import build_tasks
+
+    scope = (
+        f"Scope: partition '{label}' only ({len(rows)} of {total_campaigns} campaigns). "
+        "Your findings will be merged with those of the other partitions."
+    )
+    with get_agent_pool().checkout(models=models) as agents:
+        tasks = build_tasks(agents, rows, keys=keys, scope=scope)
+        return _run_pipeline(agents, tasks)
+
+
+def run_map_reduce(campaign_data, partition_by="platform", max_partition_size=None,
+                   max_parallelism=None, models=None, reuse=None):
+    """
+    Analyze a large account partition by partition, then merge
+
+    Map: the specialist tasks run on every partition, partitions in
+    parallel. Reduce: each specialist merges its partial findings into one
+    account-wide result. The orchestrator then runs once on the merged
+    findings, exactly as it would after a single-crew run.
+
+    Args:
+        campaign_data: List of campaign dictionaries
+        partition_by: See partition_campaigns()
+        max_partition_size: See partition_campaigns()
+        max_parallelism: Partitions analyzed at once (default: agent pool size)
+        models: Optional agent key -> model overrides for this run
+        reuse: Account-level specialist outputs to keep (e.g. from a
+            checkpoint); only the other specialists are mapped and reduced
+
+    Returns:
+        CrewResult: Merged specialist outputs and the orchestrator's report;
+            ``tasks_run`` leaves out the reused specialists
+    """
+    from tasks.ad_tasks import create_orchestration_task
+
+    pool = get_agent_pool()
+    reused = {k: v for k, v in (reuse or {}).items() if k in SPECIALIST_KEYS}
+    keys = tuple(key for key in SPECIALIST_KEYS if key not in reused)
+    partitions = partition_campaigns(campaign_data, partition_by, max_partition_size) if keys else {}
+    if partitions:
+        print(f"🗂️  Map-reduce over {len(partitions)} partitions (by {partition_by})")
+
+        workers = min(max_parallelism or pool.size, len(partitions))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crew-map") as executor:
+            futures = {
+                label: _submit(
+                    executor, _map_partition, label, rows, len(campaign_data), models, keys
+                )
+                for label, rows in partitions.items()
+            }
+            partials = {label: future.result() for label, future in futures.items()}
+        print("✅ Map step complete")
+    else:
+        partials = {}
+
+    timed_out = [
+        f"{label}/{key}" for label, partial in partials.items()
+        for key in keys if key not in partial
+    ]
+    findings = {
+        key: {label: partial[key] for label, partial in partials.items() if key in partial}
+        for key in keys
+    }
+
+    with pool.checkout(models=models) as agents:
+        if len(partials) <= 1:
+            reduced = next(iter(partials.values()), {})
+        else:
+            reduced = _reduce(agents, findings, len(campaign_data), partition_by)
+            timed_out += [key for key in keys if key not in reduced]
+            print("✅ Reduce step complete")
+
+        orchestration_task = create_orchestration_task(agents["orchestration"], campaign_data)
+        outputs = _run_pipeline(
+            agents, {"orchestration": orchestration_task}, reuse={**reused, **reduced},
+            checkpoint=True,
+        )
+        used = _models_in_use(agents)
+
+    if "orchestration" not in outputs:
+        timed_out.append("orchestration")
+    return CrewResult(
+        report=_report(outputs, timed_out),
+        task_outputs=outputs,
+        tasks_run=[*keys, "orchestration"],
+        mode="map_reduce",
+        models=used,
+        timed_out=timed_out,
+    )
+
+
+def _reduce(agents, findings, total_campaigns, partition_by):
+    """Merge each specialist's partial findings, specialists side by side"""
+    from agents.deadlines import RunCancelled
+    from tasks.ad_tasks import create_reduce_task
+
+    reduce_tasks = {
+        key: create_reduce_task(agents[key], key, partial, total_campaigns, partition_by)
+        for key, partial in findings.items()
+        if partial and not _run_stopped()
+    }
+    if not reduce_tasks:
+        return {}
+
+    reduced = {}
+    # Each specialist is a distinct agent, so the reduces can run side by side
+    with ThreadPoolExecutor(max_workers=len(reduce_tasks),
+                            thread_name_prefix="crew-reduce") as executor:
+        futures = {
+            key: _submit(executor, _execute_task, key, agents[key], task)
+            for key, task in reduce_tasks.items()
+        }
+        for key, future in futures.items():
+            try:
+                reduced[key] = future.result()
+            except RunCancelled as e:
+                print(f"⏱️  {key} reduce stopped: {e.reason}")
+    return reduced
@@ -0,0 +1,150 @@
+"""
+Local HTTP cache for remote datasets
+
+Downloads are kept in DATA_CACHE_DIR with their ETag, Last-Modified and a
+SHA-256 of the body. Within DATA_CACHE_TTL a cached file is used without any
+network access; after that it is revalidated with a conditional request, so
+an unchanged dataset costs one 304. When the network is unavailable, or
+DATA_OFFLINE=1, the cached copy is used however old it is. A cached file
+whose checksum no longer matches, or whose metadata is unreadable, is
+treated as missing.
+
+    DATA_CACHE_DIR     cache directory (default data/cache)
+    DATA_CACHE_TTL     seconds a download is trusted without revalidation (default 86400)
+    DATA_OFFLINE       1 to never touch the network
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+import requests
+
+DATA_CACHE_DIR = os.getenv("DATA_CACHE_DIR", "data/cache")
+DATA_CACHE_TTL = float(os.getenv("DATA_CACHE_TTL", "86400"))
+DATA_OFFLINE = os.getenv("DATA_OFFLINE", "0") == "1"
+REQUEST_TIMEOUT = 30
+
+
+class DatasetUnavailable(RuntimeError):
+    """A remote dataset could not be downloaded and is not cached"""
+
+
+def _paths(url):
+    key = hashlib.sha256(url.encode()).hexdigest()[:32]
+    return os.path.join(DATA_CACHE_DIR, key + ".body"), os.path.join(DATA_CACHE_DIR, key + ".json")
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, data, mode="wb"):
+    with open(path + ".tmp", mode) as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+
+
+def cached_entry(url, sha256=None):
+    """
+    Metadata of a valid cached copy of ``url``, or None
+
+    A copy is not valid if its metadata cannot be read, its body no longer
+    matches its recorded checksum, or that checksum differs from ``sha256``.
+    """
+    body, meta = _paths(url)
+    if not (os.path.exists(body) and os.path.exists(meta)):
+        return None
+    try:
+        with open(meta) as f:
+            entry = json.load(f)
+        float(entry["fetched_at"])
+    except (OSError, ValueError, TypeError, KeyError) as e:
+        print(f"⚠️ Cached metadata of {url} is unreadable ({e}), ignoring it")
+        return None
+    if sha256 is not None and entry.get("sha256") != sha256:
+        print(f"⚠️ Cached copy of {url} is not the expected version, ignoring it")
+        return None
+    if _sha256(body) != entry.get("sha256"):
+        print(f"⚠️ Cached copy of {url} is corrupt, ignoring it")
+        return None
+    return entry
+
+
+def fetch(url, ttl=None, offline=None, sha256=None):
+    """
+    Path to a local copy of ``url``, downloading or revalidating as needed
+
+    Args:
+        url: Dataset URL
+        ttl: Seconds a cached copy is used without revalidation (DATA_CACHE_TTL)
+        offline: Only use the cache (default DATA_OFFLINE)
+        sha256: Expected checksum of the body; a cached copy that does not
+            match is ignored and a download that does not match is rejected
+
+    Returns:
+        str: Path of the cached body
+
+    Raises:
+        DatasetUnavailable: If there is no valid copy and it cannot be downloaded
+        ValueError: If the download does not match ``sha256``
+    """
+    ttl = DATA_CACHE_TTL if ttl is None else ttl
+    offline = DATA_OFFLINE if offline is None else offline
+    body, meta = _paths(url)
+    entry = cached_entry(url, sha256)
+
+    if entry is not None and (offline or time.time() - entry["fetched_at"] < ttl):
+        return body
+    if offline:
+        raise DatasetUnavailable(f"{url} is not cached and DATA_OFFLINE is set")
+
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 304:
+            response.raise_for_status()
+    except requests.RequestException as e:
+        if entry is not None:
+            print(f"⚠️ Could not revalidate {url} ({e}), using cached copy from "
+                  f"{datetime.fromtimestamp(entry['fetched_at']).isoformat()}")
+            return body
+        raise DatasetUnavailable(f"Could not download {url}: {e}") from e
+
+    os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+    if response.status_code == 304:
+        entry["fetched_at"] = time.time()
+        _write_atomic(meta, json.dumps(entry), mode="w")
+        return body
+
+    checksum = hashlib.sha256(response.content).hexdigest()
+    if sha256 is not None and checksum != sha256:
+        raise ValueError(f"Checksum mismatch for {url}: expected {sha256}, got {checksum}")
+    _write_atomic(body, response.content)
+    _write_atomic(meta, json.dumps({
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+        "sha256": checksum,
+        "size": len(response.content),
+    }), mode="w")
+    print(f"📥 Downloaded {url} ({len(response.content):,} bytes)")
+    return body
+
+
+def read_csv(url, ttl=None, offline=None, sha256=None, **kwargs):
+    """pd.read_csv() of a remote CSV through the cache"""
+    return pd.read_csv(fetch(url, ttl=ttl, offline=offline, sha256=sha256), **kwargs)
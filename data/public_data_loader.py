@@ -6,6 +6,19 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# KAG-format column -> standardized campaign column
+COLUMN_MAPPING = {
+    "Clicks": "clicks",
+    "Impressions": "impressions",
+    "Spent": "spend",
+    "Total_Conversion": "conversions",
+}
+
+
+def standardize_campaigns(df):
+    """Rename a dataset's columns to the standardized campaign columns"""
+    return df.rename(columns=COLUMN_MAPPING)
+
 
 class PublicDataLoader:
     """Load ad campaign data from free public datasets"""
@@ -80,44 +93,28 @@ class PublicDataLoader:
             print(f"⚠️ UCI data error: {e}")
             return pd.DataFrame()
 
-    def load_all_public_datasets(self):
-        """Load and combine all free public datasets"""
+    def load_all_public_datasets(self, sources=None):
+        """
+        Load and combine the registered data sources (see data.sources)
+
+        Args:
+            sources: Source names to load (default DATA_SOURCES, else the
+                default sources: Kaggle and UCI)
+        """
+        from data.sources import load_sources
+
         print("\n" + "=" * 80)
         print("🔄 Loading FREE PUBLIC DATASETS...")
         print("=" * 80)
 
-        dfs = []
-
-        kaggle_df = self.load_kaggle_online_advertising()
-        if not kaggle_df.empty:
-            dfs.append(kaggle_df)
-
-        uci_df = self.load_uci_advertising()
-        if not uci_df.empty:
-            dfs.append(uci_df)
-
-        if not dfs:
+        combined_df = load_sources(sources)
+        if combined_df.empty:
             print("⚠️ No datasets loaded, using sample data")
             return self._generate_sample_data()
-
-        combined_df = pd.concat(dfs, ignore_index=True)
-        combined_df["roi"] = (
-            (combined_df["conversions"] * 50 - combined_df["spend"])
-            / combined_df["spend"]
-            * 100
-        ).fillna(0)
-
         return combined_df
 
     def _standardize_data(self, df):
-        """Standardize column names across datasets"""
-        column_mapping = {
-            "Clicks": "clicks",
-            "Impressions": "impressions",
-            "Spent": "spend",
-            "Total_Conversion": "conversions",
-        }
-        return df.rename(columns=column_mapping)
+        return standardize_campaigns(df)
 
     def _generate_sample_data(self):
         """Fallback sample data"""
@@ -143,7 +140,7 @@ class PublicDataLoader:
         return df
 
 
-def load_campaign_data():
+def load_campaign_data(sources=None):
     """Convenience function"""
     loader = PublicDataLoader()
-    return loader.load_all_public_datasets()
+    return loader.load_all_public_datasets(sources)
@@ -2,6 +2,10 @@ import pandas as pd
 import requests
 from io import StringIO
 
+from data import http_cache
+
+ADVERTISING_URL = "https://www.statlearning.com/s/Advertising.csv"
+
 
 class RealAdDataLoader:
     """
@@ -13,11 +17,12 @@ class RealAdDataLoader:
         Load famous Advertising dataset
         Source: Statistical Learning textbook
         Real data from 200 markets
-        """
-        url = "https://www.statlearning.com/s/Advertising.csv"
 
+        Served from the local HTTP cache (see data.http_cache), so repeated
+        loads and offline runs don't need the network.
+        """
         try:
-            df = pd.read_csv(url)
+            df = http_cache.read_csv(ADVERTISING_URL)
             print("✅ Loaded real Advertising dataset (200 markets)")
             return df
         except Exception as e:
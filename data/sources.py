@@ -0,0 +1,217 @@
+"""
+Registry of campaign data sources
+
+Every source is a function returning a DataFrame in the standardized
+campaign columns (campaign_id, impressions, clicks, conversions, spend,
+platform, source, ...). Sources register themselves by name; a run picks
+the ones it wants (default: DATA_SOURCES, else every source registered with
+default=True) and they are loaded concurrently, so
+adding a source costs no more than the slowest one. Each source's result is
+cached in memory for DATA_SOURCE_CACHE_TTL seconds.
+
+    from data.sources import register_source
+
+    @register_source("crm_export", default=False)
+    def load_crm_export():
+        return pd.read_csv("exports/crm.csv")
+
+Remote CSVs can be registered with register_csv_source(), which reads
+through the HTTP cache (data.http_cache).
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+import pandas as pd
+
+from data import http_cache
+from data.public_data_loader import PublicDataLoader, standardize_campaigns
+from data.real_data_loader import RealAdDataLoader
+
+# Comma-separated source names loaded when a run does not choose
+DATA_SOURCES = [s.strip() for s in os.getenv("DATA_SOURCES", "").split(",") if s.strip()]
+DATA_SOURCE_CACHE_TTL = float(os.getenv("DATA_SOURCE_CACHE_TTL", "3600"))
+DATA_SOURCE_WORKERS = int(os.getenv("DATA_SOURCE_WORKERS", "8"))
+
+
+@dataclass
+class DataSource:
+    name: str
+    load: Callable[[], pd.DataFrame]
+    default: bool = True
+    cacheable: bool = True
+
+
+_sources = {}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def register_source(name, loader=None, default=True, cacheable=True):
+    """
+    Register a data source; usable as a decorator
+
+    Args:
+        name: Name runs select the source by
+        loader: Function returning a DataFrame in the standardized columns
+        default: Load it when neither the run nor DATA_SOURCES chooses
+        cacheable: Keep the result in memory for DATA_SOURCE_CACHE_TTL
+    """
+    def register(fn):
+        _sources[name] = DataSource(name, fn, default, cacheable)
+        return fn
+
+    return register(loader) if loader is not None else register
+
+
+def register_csv_source(name, location, platform=None, default=False, **read_csv_kwargs):
+    """Register a CSV file or URL (read through the HTTP cache) as a source"""
+    def load():
+        if location.startswith(("http://", "https://")):
+            df = http_cache.read_csv(location, **read_csv_kwargs)
+        else:
+            df = pd.read_csv(location, **read_csv_kwargs)
+        df = standardize_campaigns(df)
+        if platform is not None:
+            df["platform"] = platform
+        df["source"] = name
+        return df
+
+    return register_source(name, load, default=default)
+
+
+def available_sources():
+    return list(_sources)
+
+
+def default_sources():
+    return [name for name, source in _sources.items() if source.default]
+
+
+def clear_source_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def load_source(name, use_cache=True):
+    """
+    One source's DataFrame, from the in-memory cache when fresh
+
+    Raises:
+        KeyError: If no source is registered under ``name``
+    """
+    source = _sources[name]
+    cacheable = use_cache and source.cacheable
+    if cacheable:
+        with _cache_lock:
+            cached = _cache.get(name)
+        if cached is not None and time.monotonic() - cached[0] < DATA_SOURCE_CACHE_TTL:
+            return cached[1].copy()
+
+    df = source.load()
+    if df is None:
+        df = pd.DataFrame()
+    if cacheable:
+        with _cache_lock:
+            _cache[name] = (time.monotonic(), df)
+    return df.copy()
+
+
+def _timed_load(name, use_cache):
+    start = time.perf_counter()
+    try:
+        df = load_source(name, use_cache)
+        return name, df, None, time.perf_counter() - start
+    except Exception as e:
+        return name, None, e, time.perf_counter() - start
+
+
+def load_sources(names=None, use_cache=True, max_workers=None):
+    """
+    Load several sources concurrently and combine them
+
+    Args:
+        names: Sources to load, in output order (default DATA_SOURCES,
+            else default_sources())
+        use_cache: Use results cached within DATA_SOURCE_CACHE_TTL
+        max_workers: Sources loaded at once (default DATA_SOURCE_WORKERS)
+
+    Returns:
+        pd.DataFrame: Rows of every source that loaded, with ROI computed;
+            empty if none did. A failing source is reported and skipped.
+
+    Raises:
+        KeyError: If a requested source is not registered
+    """
+    names = list(names or DATA_SOURCES or default_sources())
+    unknown = [name for name in names if name not in _sources]
+    if unknown:
+        raise KeyError(f"Unknown data sources: {unknown}. Available: {available_sources()}")
+
+    workers = max(1, min(max_workers or DATA_SOURCE_WORKERS, len(names)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="data-source") as pool:
+        results = list(pool.map(lambda name: _timed_load(name, use_cache), names))
+
+    dfs = []
+    for name, df, error, elapsed in results:
+        if error is not None:
+            print(f"⚠️ Source {name} failed after {elapsed:.2f}s: {error}")
+        elif df.empty:
+            print(f"⚠️ Source {name} returned no rows")
+        else:
+            print(f"✅ Source {name}: {len(df)} rows in {elapsed:.2f}s")
+            dfs.append(df)
+
+    if not dfs:
+        return pd.DataFrame()
+    combined = pd.concat(dfs, ignore_index=True)
+    combined["roi"] = (
+        (combined["conversions"] * 50 - combined["spend"]) / combined["spend"] * 100
+    ).fillna(0)
+    return combined
+
+
+# Built-in sources
+
+@register_source("kaggle")
+def _load_kaggle():
+    return PublicDataLoader().load_kaggle_online_advertising()
+
+
+@register_source("uci")
+def _load_uci():
+    return PublicDataLoader().load_uci_advertising()
+
+
+@register_source("facebook_sample", default=False)
+def _load_facebook_sample():
+    df = RealAdDataLoader().load_facebook_ads_sample()
+    df["campaign_id"] = "FB_" + df["campaign_id"].astype(str)
+    df["conversion_rate"] = df["cvr"]
+    df["platform"] = "Facebook"
+    df["source"] = "facebook_sample"
+    return df
+
+
+@register_source("google_keywords", default=False)
+def _load_google_keywords():
+    df = RealAdDataLoader().load_google_ads_keywords()
+    df = df.rename(columns={"cost": "spend", "cvr": "conversion_rate"})
+    df["campaign_id"] = "KW_" + df["keyword"].str.replace(" ", "_")
+    df["campaign_name"] = df["keyword"]
+    df["platform"] = "Google"
+    df["source"] = "google_keywords"
+    return df
+
+
+@register_source("synthetic", default=False)
+def _load_synthetic():
+    from data.synthetic import SYNTHETIC_ROWS, generate
+
+    df = standardize_campaigns(pd.concat(generate(SYNTHETIC_ROWS), ignore_index=True))
+    df["platform"] = "Google"
+    df["source"] = "synthetic"
+    return df
@@ -0,0 +1,267 @@
+"""
+Synthetic campaign datasets for scale testing
+
+Fits a small generative model to KAG_conversion_data.csv and samples
+datasets of any size with the same columns and similar distributions:
+
+- campaign, age, gender and interest combinations keep their joint
+  frequencies
+- log-impressions are normal per (campaign, age, gender) group
+- CTR is gamma-distributed per group, and clicks are Poisson given
+  impressions, which gives a negative binomial
+- CPC is log-normal per group; spend is clicks times CPC
+- conversions follow a log-log fit on impressions with log-normal noise,
+  at least one except for the observed share of zero-conversion ads;
+  approved conversions are binomial at the group's approval rate
+
+Rows are generated in vectorized chunks of CHUNK_SIZE. Each chunk has its
+own seed derived from the dataset seed, so output is reproducible and memory
+use does not depend on the row count. Datasets are written to CSV or
+Parquet; Parquet needs pyarrow.
+
+    python -m data.synthetic --rows 10000000 --output results/synthetic/kag_10m.parquet
+"""
+import argparse
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+KAG_PATH = "KAG_conversion_data.csv"
+CHUNK_SIZE = int(os.getenv("SYNTHETIC_CHUNK_SIZE", "1000000"))
+# Rows of the "synthetic" data source (see data.sources)
+SYNTHETIC_ROWS = int(os.getenv("SYNTHETIC_ROWS", "10000"))
+GROUP_COLUMNS = ("xyz_campaign_id", "age", "gender")
+CELL_COLUMNS = GROUP_COLUMNS + ("interest",)
+COLUMNS = (
+    "ad_id", "xyz_campaign_id", "fb_campaign_id", "age", "gender", "interest",
+    "Impressions", "Clicks", "Spent", "Total_Conversion", "Approved_Conversion",
+)
+# Groups with fewer rows use the dataset-wide parameters
+MIN_GROUP_ROWS = 5
+FIRST_AD_ID = 2_000_000
+FIRST_FB_CAMPAIGN_ID = 200_000
+
+
+@dataclass
+class SyntheticProfile:
+    """Fitted parameters: one row per cell in ``cells``, one per group elsewhere"""
+
+    cells: pd.DataFrame
+    cell_probs: np.ndarray
+    cell_group: np.ndarray
+    log_impressions: np.ndarray
+    ctr_gamma: np.ndarray
+    log_cpc: np.ndarray
+    approval_rate: np.ndarray
+    conversion_fit: np.ndarray
+    ads_per_fb_campaign: float
+
+
+def _group_params(df, groups, fn, fallback):
+    params = []
+    for key in groups.itertuples(index=False):
+        rows = df
+        for col, value in zip(GROUP_COLUMNS, key):
+            rows = rows[rows[col] == value]
+        params.append(fn(rows) if len(rows) >= MIN_GROUP_ROWS else fallback)
+    return np.array(params, dtype=float)
+
+
+def _normal(values):
+    return [values.mean(), max(values.std(ddof=0), 0.05)]
+
+
+def _gamma(ctr):
+    mean, var = ctr.mean(), ctr.var(ddof=0)
+    if var <= 0:
+        return [100.0, mean / 100]
+    return [mean ** 2 / var, var / mean]
+
+
+def fit_profile(source=KAG_PATH):
+    """
+    Fit the generator to a KAG-format dataset
+
+    Args:
+        source: Path of the CSV, or a DataFrame with the KAG columns
+
+    Returns:
+        SyntheticProfile: Parameters for generate()
+    """
+    df = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+    df = df[df["Impressions"] > 0]
+
+    counts = df.groupby(list(CELL_COLUMNS)).size()
+    cells = counts.index.to_frame(index=False)
+    groups = cells[list(GROUP_COLUMNS)].drop_duplicates().reset_index(drop=True)
+    group_index = {tuple(key): i for i, key in enumerate(groups.itertuples(index=False))}
+    cell_group = np.array([
+        group_index[tuple(key)] for key in cells[list(GROUP_COLUMNS)].itertuples(index=False)
+    ])
+
+    log_impressions = np.log(df["Impressions"])
+    ctr = df["Clicks"] / df["Impressions"]
+    clicked = df[df["Clicks"] > 0]
+    log_cpc = np.log((clicked["Spent"] / clicked["Clicks"]).clip(lower=0.01))
+    converted = df[df["Total_Conversion"] > 0]
+
+    x = np.log(converted["Impressions"])
+    y = np.log(converted["Total_Conversion"])
+    slope, intercept = np.polyfit(x, y, 1)
+    noise = (y - (intercept + slope * x)).std(ddof=0)
+    total_approval = df["Approved_Conversion"].sum() / max(df["Total_Conversion"].sum(), 1)
+
+    return SyntheticProfile(
+        cells=cells,
+        cell_probs=(counts / counts.sum()).to_numpy(),
+        cell_group=cell_group,
+        log_impressions=_group_params(
+            df.assign(v=log_impressions), groups, lambda r: _normal(r["v"]), _normal(log_impressions)
+        ),
+        ctr_gamma=_group_params(df.assign(v=ctr), groups, lambda r: _gamma(r["v"]), _gamma(ctr)),
+        log_cpc=_group_params(
+            clicked.assign(v=log_cpc), groups, lambda r: _normal(r["v"]), _normal(log_cpc)
+        ),
+        approval_rate=_group_params(
+            df, groups,
+            lambda r: r["Approved_Conversion"].sum() / max(r["Total_Conversion"].sum(), 1),
+            total_approval,
+        ),
+        conversion_fit=np.array([intercept, slope, noise, (df["Total_Conversion"] == 0).mean()]),
+        ads_per_fb_campaign=len(df) / df["fb_campaign_id"].nunique(),
+    )
+
+
+def generate_chunk(profile, rows, seed=0, chunk=0, offset=0):
+    """
+    One chunk of synthetic rows
+
+    Args:
+        profile: SyntheticProfile from fit_profile()
+        rows: Rows to generate
+        seed: Dataset seed
+        chunk: Chunk number; with ``seed`` it determines the rows
+        offset: Index of the chunk's first row in the dataset (for ids)
+
+    Returns:
+        pd.DataFrame: Rows with the KAG columns
+    """
+    rng = np.random.default_rng([seed, chunk])
+    cell = rng.choice(len(profile.cell_probs), size=rows, p=profile.cell_probs)
+    group = profile.cell_group[cell]
+
+    mean, std = profile.log_impressions[group].T
+    impressions = np.maximum(np.rint(np.exp(rng.normal(mean, std))), 1).astype(np.int64)
+
+    shape, scale = profile.ctr_gamma[group].T
+    clicks = rng.poisson(impressions * np.minimum(rng.gamma(shape, scale), 1.0))
+    clicks = np.minimum(clicks, impressions)
+
+    mean, std = profile.log_cpc[group].T
+    spent = np.round(clicks * np.exp(rng.normal(mean, std)), 2)
+
+    intercept, slope, noise, zero_share = profile.conversion_fit
+    log_conversions = intercept + slope * np.log(impressions) + rng.normal(0, noise, rows)
+    conversions = np.maximum(np.rint(np.exp(log_conversions)), 1).astype(np.int64)
+    conversions[rng.random(rows) < zero_share] = 0
+    approved = rng.binomial(conversions, profile.approval_rate[group])
+
+    cells = profile.cells.iloc[cell]
+    ids = np.arange(offset, offset + rows)
+    return pd.DataFrame({
+        "ad_id": FIRST_AD_ID + ids,
+        "xyz_campaign_id": cells["xyz_campaign_id"].to_numpy(),
+        "fb_campaign_id": FIRST_FB_CAMPAIGN_ID + (ids / profile.ads_per_fb_campaign).astype(np.int64),
+        "age": cells["age"].to_numpy(),
+        "gender": cells["gender"].to_numpy(),
+        "interest": cells["interest"].to_numpy(),
+        "Impressions": impressions,
+        "Clicks": clicks,
+        "Spent": spent,
+        "Total_Conversion": conversions,
+        "Approved_Conversion": approved,
+    }, columns=list(COLUMNS))
+
+
+def generate(rows, seed=0, chunk_size=None, profile=None):
+    """
+    Yield a synthetic dataset chunk by chunk
+
+    Args:
+        rows: Total rows
+        seed: Dataset seed; the same seed and chunk size give the same rows
+        chunk_size: Rows per chunk (default CHUNK_SIZE)
+        profile: SyntheticProfile (default: fitted to KAG_PATH)
+
+    Yields:
+        pd.DataFrame: Up to ``chunk_size`` rows each
+    """
+    profile = profile or fit_profile()
+    chunk_size = chunk_size or CHUNK_SIZE
+    for chunk, offset in enumerate(range(0, rows, chunk_size)):
+        yield generate_chunk(profile, min(chunk_size, rows - offset), seed, chunk, offset)
+
+
+def write_dataset(path, rows, seed=0, chunk_size=None, profile=None, format=None):
+    """
+    Generate a dataset straight to disk without holding it in memory
+
+    Args:
+        path: Output file
+        rows: Total rows
+        seed: Dataset seed
+        chunk_size: Rows per chunk (default CHUNK_SIZE)
+        profile: SyntheticProfile (default: fitted to KAG_PATH)
+        format: "csv" or "parquet" (default: from the file extension)
+
+    Returns:
+        str: ``path``
+    """
+    format = format or ("parquet" if path.endswith((".parquet", ".pq")) else "csv")
+    if format not in ("csv", "parquet"):
+        raise ValueError(f"Unknown format: {format}")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    start = time.perf_counter()
+    written = 0
+    writer = None
+    try:
+        for df in generate(rows, seed, chunk_size, profile):
+            if format == "csv":
+                df.to_csv(path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            written += len(df)
+            print(f"📝 {written:,}/{rows:,} rows ({time.perf_counter() - start:.1f}s)")
+    finally:
+        if writer is not None:
+            writer.close()
+    print(f"💾 Synthetic dataset saved: {path}")
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic KAG-like dataset")
+    parser.add_argument("--rows", type=int, required=True, help="Rows to generate")
+    parser.add_argument("--output", required=True, help="Output .csv or .parquet file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help=f"Rows generated at once (default {CHUNK_SIZE:,})")
+    parser.add_argument("--source", default=KAG_PATH, help="Dataset the generator is fitted to")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_dataset(args.output, args.rows, args.seed, args.chunk_size, fit_profile(args.source))
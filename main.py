@@ -1,15 +1,36 @@
+import argparse
+import glob
+import json
+import multiprocessing
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
 from datetime import datetime
+
+import pandas as pd
 from dotenv import load_dotenv
-from crew import create_ad_optimizer_crew
-from data.public_data_loader import load_campaign_data
+from crew import run_ad_optimizer_crew
+from data.public_data_loader import load_campaign_data, standardize_campaigns
+from monitoring.profiling import PROFILE_REQUESTS, profiled
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "2"))
+BATCH_OUTPUT_DIR = os.getenv("BATCH_OUTPUT_DIR", "results/batch")
+CHECKPOINT_FILE = "checkpoint.json"
+SUMMARY_FILE = "summary.csv"
 
 # Load environment variables
 load_dotenv()
 
 
-def main():
-    """Main entry point for the Multi-Agent Ad Optimizer"""
+def main(sources=None):
+    """Main entry point for the Multi-Agent Ad Optimizer
+
+    Args:
+        sources: Data source names to load (see data.sources)
+    """
 
     print("\n" + "=" * 80)
     print("🚀 MULTI-AGENT AD OPTIMIZER")
@@ -20,7 +41,7 @@ def main():
 
     # Load real campaign data from public sources
     print("STEP 1: Loading data from public datasets...\n")
-    campaign_df = load_campaign_data()
+    campaign_df = load_campaign_data(sources)
 
     # Convert to list of dicts for agent processing
     campaign_data = campaign_df.to_dict("records")
@@ -39,10 +60,7 @@ def main():
     print(f"Average ROI: {campaign_df['roi'].mean():.2f}%")
     print("=" * 80 + "\n")
 
-    # Create and run the crew
-    print("STEP 2: Initializing Multi-Agent System...\n")
-    crew = create_ad_optimizer_crew(campaign_data)
-
+    print("STEP 2: Running Multi-Agent System...\n")
     print("\n" + "=" * 80)
     print("▶️  STARTING CREW EXECUTION")
     print("=" * 80)
@@ -50,8 +68,11 @@ def main():
 
     start_time = datetime.now()
 
-    # Execute the crew
-    result = crew.kickoff()
+    # Execute the crew (profiled with PROFILE_REQUESTS=1); tasks run one by one
+    # with deadlines, retries and schema validation, as in the API
+    profile_id = f"main_{start_time.strftime('%Y%m%d_%H%M%S')}"
+    with profiled(profile_id) if PROFILE_REQUESTS else nullcontext():
+        result = run_ad_optimizer_crew(campaign_data)
 
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -63,8 +84,10 @@ def main():
     print(f"Execution Time: {duration:.2f} seconds")
     print("=" * 80 + "\n")
 
+    if result.timed_out:
+        print(f"⚠️ Timed out: {', '.join(result.timed_out)}")
     print("📄 FINAL REPORT:\n")
-    print(result)
+    print(result.report)
     print("\n" + "=" * 80)
 
     # Save results
@@ -82,7 +105,7 @@ def main():
         f.write("=" * 80 + "\n")
         f.write("RESULTS\n")
         f.write("=" * 80 + "\n\n")
-        f.write(str(result))
+        f.write(result.report)
 
     print(f"💾 Report saved: {filename}")
     print("=" * 80 + "\n")
@@ -90,5 +113,191 @@ def main():
     return result
 
 
+def _account_id(path):
+    return re.sub(r"[^A-Za-z0-9_-]", "_", os.path.splitext(os.path.basename(path))[0])
+
+
+def _fingerprint(path):
+    """Changes whenever the account's CSV is rewritten"""
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def load_checkpoint(output_dir):
+    """Per-account state of a previous batch run in ``output_dir``"""
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("accounts", {})
+
+
+def save_checkpoint(output_dir, accounts):
+    """Write the checkpoint atomically so an interrupt never leaves it half-written"""
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"updated_at": datetime.now().isoformat(), "accounts": accounts}, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def optimize_account_file(path, output_dir, mode="auto"):
+    """
+    Optimize one account CSV and save its report; runs in a worker process
+
+    Returns:
+        dict: Outcome for the checkpoint (status, timing, report path, error)
+    """
+    account_id = _account_id(path)
+    start = time.perf_counter()
+    try:
+        campaign_df = standardize_campaigns(pd.read_csv(path))
+        campaign_data = campaign_df.to_dict("records")
+        result = run_ad_optimizer_crew(campaign_data, mode=mode)
+
+        report_path = os.path.join(output_dir, f"{account_id}.txt")
+        with open(report_path, "w") as f:
+            f.write(f"Optimization Report - {account_id} - {datetime.now().isoformat()}\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(result.report)
+        return {
+            "status": "partial" if result.timed_out else "success",
+            "campaigns": len(campaign_data),
+            "report": report_path,
+            "error": None,
+            "execution_time": time.perf_counter() - start,
+        }
+    except Exception as e:
+        return {
+            "status": "failed",
+            "campaigns": None,
+            "report": None,
+            "error": str(e),
+            "execution_time": time.perf_counter() - start,
+        }
+
+
+def _failed_outcome(error):
+    return {"status": "failed", "campaigns": None, "report": None, "error": error,
+            "execution_time": 0.0}
+
+
+def _outcome(future, error):
+    """A finished account's outcome, or a failure with ``error`` if it did not finish"""
+    if future.done() and not future.cancelled() and future.exception() is None:
+        return future.result()
+    return _failed_outcome(error)
+
+
+def run_batch_dir(input_dir, output_dir=None, workers=None, fresh=False, mode="auto",
+                  optimize=optimize_account_file):
+    """
+    Optimize every account CSV in ``input_dir`` across a process pool
+
+    Completed accounts are checkpointed in ``output_dir`` as they finish;
+    running again skips accounts that succeeded on an unchanged CSV, so an
+    interrupted or partly failed batch resumes where it stopped.
+
+    Args:
+        input_dir: Directory of CSVs, one account per file (named after the file)
+        output_dir: Where reports, the checkpoint and the summary go
+        workers: Accounts optimized at once (default BATCH_WORKERS)
+        fresh: Ignore the checkpoint and run every account
+        mode: Crew mode, see crew.run_ad_optimizer_crew()
+        optimize: Called as optimize(path, output_dir, mode) in the workers
+
+    Returns:
+        pd.DataFrame: Summary row per account, also saved as SUMMARY_FILE
+    """
+    output_dir = output_dir or BATCH_OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    paths = sorted(glob.glob(os.path.join(input_dir, "*.csv")))
+    accounts = {} if fresh else load_checkpoint(output_dir)
+
+    pending = []
+    for path in paths:
+        done = accounts.get(_account_id(path))
+        if done and done["status"] == "success" and done["fingerprint"] == _fingerprint(path):
+            continue
+        pending.append(path)
+
+    print(f"📦 Batch: {len(paths)} accounts, {len(paths) - len(pending)} already done, "
+          f"{len(pending)} to run")
+
+    if pending:
+        workers = max(1, min(workers or BATCH_WORKERS, len(pending)))
+        # spawn, not fork: the parent may already hold crewai/litellm threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {pool.submit(optimize, path, output_dir, mode): path for path in pending}
+
+            finished = set()
+
+            def record(path, outcome):
+                finished.add(path)
+                accounts[_account_id(path)] = {
+                    **outcome,
+                    "file": path,
+                    "fingerprint": _fingerprint(path),
+                    "finished_at": datetime.now().isoformat(),
+                }
+                save_checkpoint(output_dir, accounts)
+                icon = "✅" if outcome["status"] == "success" else "⚠️"
+                print(f"{icon} {_account_id(path)}: {outcome['status']} "
+                      f"in {outcome['execution_time']:.1f}s")
+
+            try:
+                for future in as_completed(futures):
+                    try:
+                        outcome = future.result()
+                    except BrokenProcessPool as e:
+                        # A worker died (e.g. OOM-killed) and took the pool down:
+                        # record every account it left unfinished
+                        for other, path in futures.items():
+                            if path not in finished:
+                                record(path, _outcome(other, f"Worker process died: {e}"))
+                        break
+                    except Exception as e:
+                        outcome = _failed_outcome(f"{type(e).__name__}: {e}")
+                    record(futures[future], outcome)
+            except KeyboardInterrupt:
+                pool.shutdown(wait=False, cancel_futures=True)
+                print("⏸️  Interrupted; rerun with the same output directory to resume")
+                raise
+
+    wanted = {_account_id(p) for p in paths}
+    summary = pd.DataFrame(
+        [{"account_id": account_id, **state} for account_id, state in accounts.items()
+         if account_id in wanted],
+        columns=["account_id", "status", "campaigns", "execution_time", "report", "error",
+                 "finished_at"],
+    )
+    summary.to_csv(os.path.join(output_dir, SUMMARY_FILE), index=False)
+    succeeded = int((summary["status"] == "success").sum())
+    print(f"📊 Batch finished: {succeeded}/{len(summary)} succeeded, "
+          f"{summary['execution_time'].sum():.1f}s of account time")
+    print(f"💾 Summary saved: {os.path.join(output_dir, SUMMARY_FILE)}")
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-Agent Ad Optimizer")
+    parser.add_argument("--batch", metavar="DIR", help="Optimize every account CSV in DIR")
+    parser.add_argument("--output", metavar="DIR", default=None,
+                        help=f"Batch output directory (default {BATCH_OUTPUT_DIR})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"Accounts optimized at once (default {BATCH_WORKERS})")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignore the batch checkpoint and run every account again")
+    parser.add_argument("--mode", choices=["auto", "single", "map_reduce"], default="auto")
+    parser.add_argument("--sources", metavar="NAMES", default=None,
+                        help="Comma-separated data sources to load, e.g. kaggle,facebook_sample "
+                             "(default DATA_SOURCES or kaggle,uci)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.batch:
+        run_batch_dir(args.batch, args.output, args.workers, args.fresh, args.mode)
+    else:
+        main(args.sources.split(",") if args.sources else None)
@@ -43,3 +43,114 @@ active_optimizations = Gauge(
     "active_optimizations",
     "Currently running optimizations",
 )
+
+# LLM rate limiting
+llm_rate_limit_wait = Histogram(
+    "llm_rate_limit_wait_seconds",
+    "Time LLM calls waited for the shared rate limiter",
+    ["priority"],
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0),
+)
+
+llm_queue_depth = Gauge(
+    "llm_queue_depth",
+    "LLM calls waiting for the shared rate limiter",
+)
+
+llm_retries = Counter(
+    "llm_retries_total",
+    "LLM calls retried after a provider error",
+    ["reason"],
+)
+
+llm_circuit_open = Gauge(
+    "llm_circuit_open",
+    "1 while the LLM circuit breaker is open",
+)
+
+# Startup metrics
+warmup_duration = Gauge(
+    "startup_warmup_seconds",
+    "Time spent pre-importing the crew machinery after startup",
+)
+
+llm_model_routing = Counter(
+    "llm_model_routing_total",
+    "Tasks routed to each model, per agent",
+    ["agent_name", "model"],
+)
+
+llm_model_latency = Histogram(
+    "llm_model_latency_seconds",
+    "Task execution time per agent and model",
+    ["agent_name", "model"],
+    buckets=(1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+crew_task_timeouts = Counter(
+    "crew_task_timeouts_total",
+    "Tasks stopped by their deadline or the run's cancellation",
+    ["agent_name"],
+)
+
+crew_runs_stopped = Counter(
+    "crew_runs_stopped_total",
+    "Crew runs returned with partial results",
+    ["reason"],
+)
+
+anomalies_detected = Counter(
+    "campaign_anomalies_total",
+    "Metric anomalies flagged in the incoming campaign stream",
+    ["metric", "scope"],
+)
+
+# Runtime metrics (RSS, open fds and CPU come from prometheus_client's
+# default process collector as process_*)
+process_threads = Gauge(
+    "process_threads",
+    "Live Python threads",
+)
+
+event_loop_lag = Gauge(
+    "event_loop_lag_seconds",
+    "How late the last event-loop heartbeat ran",
+)
+
+event_loop_lag_histogram = Histogram(
+    "event_loop_lag_distribution_seconds",
+    "Event-loop heartbeat lateness",
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+executor_queue_depth = Gauge(
+    "executor_queue_depth",
+    "Work items waiting for a worker thread",
+    ["executor"],
+)
+
+executor_busy_workers = Gauge(
+    "executor_busy_workers",
+    "Worker threads currently running work",
+    ["executor"],
+)
+
+gc_pause = Histogram(
+    "python_gc_pause_seconds",
+    "Garbage collection pause duration",
+    ["generation"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5),
+)
+
+# Crew worker processes (see api.workers)
+crew_worker_recycles = Counter(
+    "crew_worker_recycles_total",
+    "Crew worker processes replaced",
+    ["reason"],
+)
+
+crew_worker_rss = Gauge(
+    "crew_worker_rss_bytes",
+    "Resident memory of a crew worker after its last run",
+    ["worker"],
+)
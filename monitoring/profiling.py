@@ -0,0 +1,149 @@
+"""
+Opt-in profiling of single optimization runs
+
+A run is profiled when the request carries ``X-Profile: 1`` or the process
+runs with PROFILE_REQUESTS=1. The run's own thread and every worker thread
+it starts (crew tasks, map partitions) get a cProfile profiler; their stats
+are merged and saved under the request id in PROFILE_DIR as ``<id>.prof``
+(load with pstats or snakeviz) and ``<id>.txt`` (top functions by
+cumulative time). When profiling is off, the only cost is one context
+variable lookup per worker thread.
+"""
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_REQUESTS = os.getenv("PROFILE_REQUESTS", "0") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "results/profiles")
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "60"))
+
+_session = contextvars.ContextVar("profile_session", default=None)
+_active = threading.local()
+
+
+class ProfileSession:
+    """Profiles collected from all threads of one run"""
+
+    def __init__(self, profile_id):
+        self.profile_id = profile_id
+        self.profiles = []
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self.profiles.append(profile)
+
+    def stats(self):
+        with self._lock:
+            profiles = list(self.profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+def safe_profile_id(profile_id):
+    """Profile id usable as a file name"""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", profile_id)[:128]
+
+
+def profile_path(profile_id, suffix=".prof"):
+    return os.path.join(PROFILE_DIR, safe_profile_id(profile_id) + suffix)
+
+
+@contextmanager
+def profile_thread():
+    """
+    Profile the current thread if it works for a profiled run
+
+    Wrap the body of worker threads with this; it is a no-op outside a
+    profiled run.
+    """
+    session = _session.get()
+    if session is None or getattr(_active, "profile", None) is not None:
+        yield
+        return
+
+    profile = cProfile.Profile()
+    _active.profile = profile
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        _active.profile = None
+        session.add(profile)
+
+
+def in_profiled_thread(fn):
+    """Wrap ``fn`` so a worker thread running it is profiled along with its run"""
+    def run(*args, **kwargs):
+        with profile_thread():
+            return fn(*args, **kwargs)
+    return run
+
+
+@contextmanager
+def profiled(profile_id):
+    """
+    Profile the enclosed run and save it under ``profile_id``
+
+    Yields:
+        ProfileSession: The session collecting the run's profiles
+    """
+    session = ProfileSession(profile_id)
+    token = _session.set(session)
+    try:
+        with profile_thread():
+            yield session
+    finally:
+        _session.reset(token)
+        save_profile(session)
+
+
+def save_profile(session):
+    """Write a session's merged stats and a text summary to PROFILE_DIR"""
+    if not session.profiles:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stats = session.stats()
+    stats.dump_stats(profile_path(session.profile_id))
+
+    summary = io.StringIO()
+    summary.write(f"Profile {session.profile_id} - {datetime.now().isoformat()}\n")
+    summary.write(f"Threads profiled: {len(session.profiles)}\n\n")
+    stats.stream = summary
+    stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+    with open(profile_path(session.profile_id, ".txt"), "w") as f:
+        f.write(summary.getvalue())
+
+    print(f"🔬 Profile saved: {profile_path(session.profile_id)}")
+    return profile_path(session.profile_id)
+
+
+def list_profiles():
+    """Saved profiles, newest first"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    entries = []
+    for name in os.listdir(PROFILE_DIR):
+        if name.endswith(".prof"):
+            path = os.path.join(PROFILE_DIR, name)
+            entries.append({
+                "profile_id": name[:-len(".prof")],
+                "created_at": datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+                "size_bytes": os.path.getsize(path),
+            })
+    return sorted(entries, key=lambda e: e["created_at"], reverse=True)
+
+
+def call_profiled(profile_id, fn, *args, **kwargs):
+    """Call ``fn`` under profiled(profile_id)"""
+    with profiled(profile_id):
+        return fn(*args, **kwargs)
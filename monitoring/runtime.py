@@ -0,0 +1,99 @@
+"""
+Process and runtime gauges for the API
+
+Complements prometheus_client's default process collector (RSS, open file
+descriptors, CPU) with what it lacks: thread count, garbage-collection
+pauses, event-loop lag and how busy the worker thread pools are. A blocked
+event loop shows up as lag long before health probes start timing out.
+"""
+import asyncio
+import gc
+import os
+import threading
+import time
+
+from monitoring.metrics import (
+    event_loop_lag,
+    event_loop_lag_histogram,
+    executor_busy_workers,
+    executor_queue_depth,
+    gc_pause,
+    process_threads,
+)
+
+RUNTIME_METRICS_INTERVAL = float(os.getenv("RUNTIME_METRICS_INTERVAL", "1.0"))
+
+# name -> callable returning (queued, busy)
+_executors = {}
+_gc_started = {}
+_installed = False
+_install_lock = threading.Lock()
+
+
+def register_executor(name, stats):
+    """
+    Export a worker pool's load as executor_queue_depth / executor_busy_workers
+
+    Args:
+        name: Label value for the pool
+        stats: Callable returning (queued work items, busy workers)
+    """
+    _executors[name] = stats
+
+
+def _on_gc(phase, info):
+    thread = threading.get_ident()
+    if phase == "start":
+        _gc_started[thread] = time.perf_counter()
+    else:
+        start = _gc_started.pop(thread, None)
+        if start is not None:
+            gc_pause.labels(generation=str(info["generation"])).observe(time.perf_counter() - start)
+
+
+def install_runtime_metrics():
+    """Start timing GC pauses and counting threads (idempotent)"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        gc.callbacks.append(_on_gc)
+        process_threads.set_function(threading.active_count)
+        _installed = True
+
+
+def _sample_executors():
+    for name, stats in list(_executors.items()):
+        try:
+            queued, busy = stats()
+        except Exception:
+            continue
+        executor_queue_depth.labels(executor=name).set(queued)
+        executor_busy_workers.labels(executor=name).set(busy)
+
+
+async def monitor_event_loop(interval=None):
+    """
+    Heartbeat task measuring event-loop lag; also samples the executors
+
+    Run it as a background task for the lifetime of the server. The API's
+    own threadpool (used by run_in_threadpool) is reported as "api_threadpool".
+    """
+    import anyio.to_thread
+
+    interval = interval or RUNTIME_METRICS_INTERVAL
+    limiter = anyio.to_thread.current_default_thread_limiter()
+
+    def threadpool_stats():
+        statistics = limiter.statistics()
+        return statistics.tasks_waiting, statistics.borrowed_tokens
+
+    register_executor("api_threadpool", threadpool_stats)
+
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - start - interval)
+        event_loop_lag.set(lag)
+        event_loop_lag_histogram.observe(lag)
+        _sample_executors()
@@ -0,0 +1 @@
+"""Persistence of past optimization runs"""
@@ -0,0 +1,161 @@
+"""
+Per-run checkpoints of task outputs
+
+Every API run gets a run id. Its input is written once when it starts and
+each account-level task output as soon as the task completes, so a run that
+fails (e.g. the orchestrator call errors after the four specialists
+finished) can be resumed: only the missing tasks and those downstream of
+them run again. Checkpoints of runs that succeed are deleted; the others
+expire after CHECKPOINT_MAX_AGE_HOURS.
+"""
+import contextvars
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from runs.snapshots import _json_default
+
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", "results/checkpoints")
+CHECKPOINT_MAX_AGE_HOURS = float(os.getenv("CHECKPOINT_MAX_AGE_HOURS", "24"))
+
+RUN_FILE = "run.json"
+TASKS_DIR = "tasks"
+
+_current = contextvars.ContextVar("checkpoint_run", default=None)
+
+
+def new_run_id():
+    return uuid.uuid4().hex
+
+
+def _run_dir(run_id):
+    return os.path.join(CHECKPOINT_DIR, re.sub(r"[^A-Za-z0-9_-]", "_", str(run_id)))
+
+
+def _write_json(path, data):
+    # Write-then-rename so a crash never leaves a truncated checkpoint
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f, default=_json_default)
+    os.replace(path + ".tmp", path)
+
+
+def start_run(run_id, campaigns, **settings):
+    """
+    Create the checkpoint of a new run
+
+    Args:
+        run_id: Id the run is resumed by
+        campaigns: Input campaign dictionaries
+        **settings: Run options needed to resume it (mode, partition_by,
+            account_id, models, ...)
+    """
+    prune_checkpoints()
+    directory = _run_dir(run_id)
+    os.makedirs(os.path.join(directory, TASKS_DIR), exist_ok=True)
+    _write_json(os.path.join(directory, RUN_FILE), {
+        "run_id": run_id,
+        "created_at": datetime.now().isoformat(),
+        "status": "running",
+        "error": None,
+        "settings": settings,
+        "campaigns": campaigns,
+    })
+
+
+def save_task_output(run_id, key, output):
+    """Persist one completed task's raw output"""
+    directory = os.path.join(_run_dir(run_id), TASKS_DIR)
+    if not os.path.isdir(directory):
+        return
+    _write_json(os.path.join(directory, f"{key}.json"), {
+        "key": key,
+        "completed_at": datetime.now().isoformat(),
+        "output": output,
+    })
+
+
+def task_outputs(run_id):
+    """Raw output per completed task key"""
+    directory = os.path.join(_run_dir(run_id), TASKS_DIR)
+    if not os.path.isdir(directory):
+        return {}
+    outputs = {}
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                record = json.load(f)
+            outputs[record["key"]] = record["output"]
+    return outputs
+
+
+def load_run(run_id, include_campaigns=True):
+    """
+    Checkpoint of a run, or None if there is none
+
+    Returns:
+        dict: run_id, created_at, status, error, settings, campaigns (unless
+            excluded) and ``task_outputs``
+    """
+    path = os.path.join(_run_dir(run_id), RUN_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        run = json.load(f)
+    if not include_campaigns:
+        run.pop("campaigns", None)
+    run["task_outputs"] = task_outputs(run_id)
+    return run
+
+
+def finish_run(run_id, status, error=None):
+    """
+    Record how a run ended; successful runs need no checkpoint and are deleted
+    """
+    if status == "success":
+        delete_run(run_id)
+        return
+    path = os.path.join(_run_dir(run_id), RUN_FILE)
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        run = json.load(f)
+    run.update(status=status, error=error, finished_at=datetime.now().isoformat())
+    _write_json(path, run)
+
+
+def delete_run(run_id):
+    shutil.rmtree(_run_dir(run_id), ignore_errors=True)
+
+
+def prune_checkpoints(max_age_hours=None):
+    """Delete checkpoints older than ``max_age_hours`` (CHECKPOINT_MAX_AGE_HOURS)"""
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return
+    max_age = (CHECKPOINT_MAX_AGE_HOURS if max_age_hours is None else max_age_hours) * 3600
+    cutoff = time.time() - max_age
+    for name in os.listdir(CHECKPOINT_DIR):
+        path = os.path.join(CHECKPOINT_DIR, name)
+        if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+@contextmanager
+def checkpointing(run_id):
+    """Record task outputs completed in the enclosed code under ``run_id``"""
+    token = _current.set(run_id)
+    try:
+        yield run_id
+    finally:
+        _current.reset(token)
+
+
+def record_output(key, output):
+    """Checkpoint a task output of the run in progress; no-op outside one"""
+    run_id = _current.get()
+    if run_id is not None:
+        save_task_output(run_id, key, output)
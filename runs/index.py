@@ -0,0 +1,336 @@
+"""
+Nearest-neighbour index over past optimization runs
+
+Each finished run is stored with a small, fixed-length metric vector of its
+input: pooled KPIs, spend-weighted per-campaign KPIs, spend scale and
+concentration, and platform mix. Features are logs (or shares), so a
+difference of 0.05 in any of them means a change of about 5%. A new request
+is vectorized the same way and compared against every stored run in one
+numpy pass. The nearest runs either stand in for a new run when they are
+close enough (opt-in, see RUN_INDEX_REUSE_TOLERANCE) or give the
+orchestrator their recommendations as compact context.
+
+Reports name campaigns and dollar amounts, so lookups only ever see runs of
+the same account: a run without an account reuses nothing and gets no
+precedents, and reuse additionally needs RUN_INDEX_MIN_OVERLAP of the
+request's campaign ids to be in the past run.
+
+The index lives in RUN_INDEX_PATH as JSON lines, compacted to the newest
+RUN_INDEX_MAX_ENTRIES once it holds twice that many. When it does not exist yet
+it is seeded from the account snapshots (runs.snapshots), which hold both
+the input and the report of past runs; the plain-text reports in results/
+have no input to vectorize and are not indexed.
+"""
+import contextvars
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from runs.snapshots import SNAPSHOT_DIR, _json_default
+
+RUN_INDEX_PATH = os.getenv("RUN_INDEX_PATH", "results/index/runs.jsonl")
+RUN_INDEX_MAX_ENTRIES = int(os.getenv("RUN_INDEX_MAX_ENTRIES", "5000"))
+# Largest per-feature difference at which a past run can stand in for a new one
+RUN_INDEX_REUSE_TOLERANCE = float(os.getenv("RUN_INDEX_REUSE_TOLERANCE", "0.05"))
+RUN_INDEX_CONTEXT_K = int(os.getenv("RUN_INDEX_CONTEXT_K", "3"))
+# Share of a request's campaign ids a past run must contain to be reused
+RUN_INDEX_MIN_OVERLAP = float(os.getenv("RUN_INDEX_MIN_OVERLAP", "0.5"))
+# Characters of each past report passed to the agents
+PRECEDENT_CHARS = int(os.getenv("RUN_INDEX_PRECEDENT_CHARS", "600"))
+
+PLATFORMS = ("Google", "Facebook", "Instagram", "LinkedIn", "Twitter", "TikTok")
+KPI_FEATURES = ("ctr", "conversion_rate", "cpc", "cpa")
+FEATURE_NAMES = (
+    [f"pooled_{k}" for k in KPI_FEATURES] + ["pooled_roi"]
+    + [f"median_{k}" for k in ("ctr", "cpa")]
+    + ["spend", "campaigns", "top_decile_spend_share"]
+    + [f"share_{p.lower()}" for p in PLATFORMS] + ["share_other"]
+)
+# Keeps logs of rates that can be zero finite
+EPSILON = 0.01
+VALUE_PER_CONVERSION = 50
+
+_current_account = contextvars.ContextVar("run_index_account", default=None)
+_current_precedents = contextvars.ContextVar("run_index_precedents", default=None)
+
+
+def _column(df, name):
+    if name not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[name], errors="coerce").fillna(0.0).clip(lower=0)
+
+
+def _weighted_median(values, weights):
+    order = np.argsort(values)
+    values, weights = values[order], weights[order]
+    cumulative = np.cumsum(weights)
+    if cumulative[-1] <= 0:
+        return float(np.median(values))
+    return float(values[np.searchsorted(cumulative, cumulative[-1] / 2)])
+
+
+def campaign_ids(campaigns):
+    """Sorted distinct campaign ids of a campaign set"""
+    df = pd.DataFrame(campaigns)
+    for col in ("campaign_id", "ad_id"):
+        if col in df.columns:
+            return sorted(df[col].dropna().astype(str).unique())
+    return []
+
+
+def run_vector(campaigns):
+    """
+    Metric vector of a campaign set, comparable across accounts
+
+    Args:
+        campaigns: List of campaign dicts or a DataFrame
+
+    Returns:
+        np.ndarray: One value per FEATURE_NAMES entry
+    """
+    df = pd.DataFrame(campaigns)
+    impressions, clicks = _column(df, "impressions"), _column(df, "clicks")
+    conversions, spend = _column(df, "conversions"), _column(df, "spend")
+    total = {k: float(v.sum()) for k, v in
+             (("impressions", impressions), ("clicks", clicks),
+              ("conversions", conversions), ("spend", spend))}
+
+    def ratio(num, den, scale=1.0):
+        return num / den * scale if den > 0 else 0.0
+
+    pooled = [
+        ratio(total["clicks"], total["impressions"], 100),
+        ratio(total["conversions"], total["clicks"], 100),
+        ratio(total["spend"], total["clicks"]),
+        ratio(total["spend"], total["conversions"]),
+    ]
+    roi = ratio(total["conversions"] * VALUE_PER_CONVERSION - total["spend"], total["spend"], 100)
+
+    weights = spend.to_numpy() if total["spend"] > 0 else np.ones(len(df))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ctr = np.where(impressions > 0, clicks / impressions * 100, 0.0)
+        cpa = np.where(conversions > 0, spend / conversions, 0.0)
+    medians = [_weighted_median(ctr, weights), _weighted_median(cpa, weights)] if len(df) else [0, 0]
+
+    top = spend.nlargest(max(1, len(df) // 10)).sum()
+    if "platform" in df.columns:
+        platform = df["platform"].astype(str)
+        shares = [ratio(spend[platform == p].sum(), total["spend"]) for p in PLATFORMS]
+    else:
+        shares = [0.0] * len(PLATFORMS)
+    other = max(0.0, 1.0 - sum(shares)) if total["spend"] > 0 else 0.0
+
+    return np.concatenate([
+        np.log(np.array(pooled) + EPSILON),
+        [np.arcsinh(roi / 100)],
+        np.log(np.array(medians) + EPSILON),
+        [np.log1p(total["spend"]), np.log(max(len(df), 1)), ratio(top, total["spend"])],
+        shares,
+        [other],
+    ]).astype(float)
+
+
+class RunIndex:
+    """Past runs' metric vectors and reports, with vectorized kNN lookup"""
+
+    def __init__(self, path=None):
+        self.path = path or RUN_INDEX_PATH
+        self._entries = []
+        self._matrix = np.empty((0, len(FEATURE_NAMES)))
+        self._loaded = False
+        self._file_entries = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._loaded:
+            return
+        entries = []
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+            self._file_entries = len(entries)
+        else:
+            entries = list(_entries_from_snapshots())
+        self._set(entries[-RUN_INDEX_MAX_ENTRIES:])
+        self._loaded = True
+
+    def _set(self, entries):
+        self._entries = entries
+        self._matrix = (
+            np.array([e["vector"] for e in entries], dtype=float)
+            if entries else np.empty((0, len(FEATURE_NAMES)))
+        )
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+    def add(self, run_id, campaigns, report, account_id=None, mode=None):
+        """Index a finished run and append it to RUN_INDEX_PATH"""
+        entry = {
+            "run_id": run_id,
+            "account_id": account_id,
+            "created_at": datetime.now().isoformat(),
+            "mode": mode,
+            "campaigns": len(campaigns),
+            "campaign_ids": campaign_ids(campaigns),
+            "vector": run_vector(campaigns).round(6).tolist(),
+            "report": report,
+        }
+        with self._lock:
+            self._load()
+            self._set((self._entries + [entry])[-RUN_INDEX_MAX_ENTRIES:])
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if self._file_entries + 1 > 2 * RUN_INDEX_MAX_ENTRIES:
+                self._compact()
+            else:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(entry, default=_json_default) + "\n")
+                self._file_entries += 1
+        return entry
+
+    def _compact(self):
+        # Rewrite the file with the entries kept in memory, atomically
+        with open(self.path + ".tmp", "w") as f:
+            for entry in self._entries:
+                f.write(json.dumps(entry, default=_json_default) + "\n")
+        os.replace(self.path + ".tmp", self.path)
+        self._file_entries = len(self._entries)
+
+    def nearest(self, campaigns, k=None, account_id=None):
+        """
+        The ``k`` past runs of ``account_id`` closest to a campaign set
+
+        Returns:
+            list: (entry, distance, max_difference) tuples, nearest first.
+                ``distance`` is Euclidean over the feature vector,
+                ``max_difference`` the largest single-feature difference.
+                Empty without an ``account_id``.
+        """
+        if account_id is None:
+            return []
+        vector = run_vector(campaigns)
+        k = k or RUN_INDEX_CONTEXT_K
+        with self._lock:
+            self._load()
+            matrix, entries = self._matrix, self._entries
+        rows = np.array([i for i, e in enumerate(entries) if e.get("account_id") == account_id], dtype=int)
+        if not len(rows):
+            return []
+        diff = np.abs(matrix[rows] - vector)
+        distances = np.sqrt((diff ** 2).sum(axis=1))
+        nearest = np.argsort(distances)[:k]
+        return [(entries[rows[i]], float(distances[i]), float(diff[i].max())) for i in nearest]
+
+    def reusable(self, campaigns, account_id=None, tolerance=None):
+        """
+        Past run of ``account_id`` that can stand in for this campaign set
+
+        No feature may differ by more than ``tolerance`` and the run must
+        contain RUN_INDEX_MIN_OVERLAP of the request's campaign ids.
+
+        Returns:
+            dict: Index entry, or None (always without an ``account_id``)
+        """
+        tolerance = RUN_INDEX_REUSE_TOLERANCE if tolerance is None else tolerance
+        ids = set(campaign_ids(campaigns))
+        for entry, _, max_difference in self.nearest(campaigns, account_id=account_id):
+            if max_difference > tolerance:
+                break
+            overlap = len(ids & set(entry.get("campaign_ids", ()))) / len(ids) if ids else 0.0
+            if overlap >= RUN_INDEX_MIN_OVERLAP:
+                return entry
+        return None
+
+
+def _entries_from_snapshots():
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return
+    for account in sorted(os.listdir(SNAPSHOT_DIR)):
+        directory = os.path.join(SNAPSHOT_DIR, account)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(n for n in os.listdir(directory) if n.endswith(".json")):
+            with open(os.path.join(directory, name)) as f:
+                snapshot = json.load(f)
+            yield {
+                "run_id": f"snapshot:{account}/{name[:-len('.json')]}",
+                "account_id": snapshot.get("account_id"),
+                "created_at": snapshot.get("created_at"),
+                "mode": snapshot.get("mode"),
+                "campaigns": len(snapshot["campaigns"]),
+                "campaign_ids": campaign_ids(snapshot["campaigns"]),
+                "vector": run_vector(snapshot["campaigns"]).round(6).tolist(),
+                "report": snapshot["report"],
+            }
+
+
+_run_index = None
+_run_index_lock = threading.Lock()
+
+
+def get_run_index():
+    """Process-wide RunIndex, loaded on first use"""
+    global _run_index
+    with _run_index_lock:
+        if _run_index is None:
+            _run_index = RunIndex()
+        return _run_index
+
+
+@contextmanager
+def account_scope(account_id, precedents=None):
+    """
+    Make precedent_summary() in the enclosed code use ``account_id``'s runs
+
+    Args:
+        precedents: Summary already built for the run (e.g. by the API for a
+            crew worker process, whose own index would be stale); returned
+            as is instead of querying this process's index
+    """
+    tokens = _current_account.set(account_id), _current_precedents.set(precedents)
+    try:
+        yield account_id
+    finally:
+        _current_account.reset(tokens[0])
+        _current_precedents.reset(tokens[1])
+
+
+def precedent_summary(campaign_data, k=None, account_id=None):
+    """
+    Recommendations of the account's most similar past runs, trimmed for a prompt
+
+    Args:
+        account_id: Account whose runs are searched (default: the one set
+            by account_scope()). Other accounts' reports are never used.
+
+    Returns:
+        str: One section per past run, or a note when there are none
+    """
+    if account_id is None:
+        if _current_precedents.get() is not None:
+            return _current_precedents.get()
+        account_id = _current_account.get()
+    if not campaign_data or account_id is None:
+        return "None available."
+    matches = get_run_index().nearest(campaign_data, k, account_id=account_id)
+    if not matches:
+        return "None available."
+    sections = []
+    for entry, _, max_difference in matches:
+        report = " ".join(str(entry["report"]).split())
+        if len(report) > PRECEDENT_CHARS:
+            report = report[:PRECEDENT_CHARS].rsplit(" ", 1)[0] + " ..."
+        sections.append(
+            f"- Run {entry['run_id']} ({entry['campaigns']} campaigns, {str(entry['created_at'])[:10]}, "
+            f"metrics within {max_difference:.0%}): {report}"
+        )
+    return "\n".join(sections)
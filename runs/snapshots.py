@@ -0,0 +1,164 @@
+"""
+Per-account snapshots of optimization runs
+
+A snapshot holds a run's input campaigns and the raw output of every task.
+Diffing a new campaign set against the account's latest snapshot tells the
+incremental mode which tasks actually need to run again.
+"""
+import json
+import os
+import re
+from datetime import datetime
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "results/snapshots")
+SNAPSHOT_HISTORY = int(os.getenv("SNAPSHOT_HISTORY", "10"))
+
+# Relative change below which a metric is considered unchanged
+INCREMENTAL_TOLERANCE = float(os.getenv("INCREMENTAL_TOLERANCE", "0.05"))
+
+# Account-level totals compared to decide whether the overview is stale
+TOTAL_FIELDS = ("impressions", "clicks", "conversions", "spend")
+
+
+def _account_dir(account_id):
+    return os.path.join(SNAPSHOT_DIR, re.sub(r"[^A-Za-z0-9_-]", "_", str(account_id)))
+
+
+def _json_default(value):
+    # numpy / pandas scalars coming from DataFrame.to_dict()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def save_snapshot(account_id, campaigns, task_outputs, report, mode="single"):
+    """
+    Save a run as the account's latest snapshot
+
+    Args:
+        account_id: Account the campaigns belong to
+        campaigns: Input campaign dictionaries
+        task_outputs: Raw output per task key
+        report: Final report text
+        mode: Crew mode the run used
+
+    Returns:
+        str: Path of the snapshot file
+    """
+    directory = _account_dir(account_id)
+    os.makedirs(directory, exist_ok=True)
+
+    created_at = datetime.now()
+    path = os.path.join(directory, created_at.strftime("%Y%m%d_%H%M%S_%f") + ".json")
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "account_id": str(account_id),
+                "created_at": created_at.isoformat(),
+                "mode": mode,
+                "campaigns": campaigns,
+                "task_outputs": task_outputs,
+                "report": report,
+            },
+            f,
+            default=_json_default,
+        )
+
+    for old in sorted(os.listdir(directory))[:-SNAPSHOT_HISTORY]:
+        os.remove(os.path.join(directory, old))
+    return path
+
+
+def load_latest_snapshot(account_id):
+    """Return the account's most recent snapshot, or None if it has none"""
+    directory = _account_dir(account_id)
+    if not os.path.isdir(directory):
+        return None
+    names = sorted(n for n in os.listdir(directory) if n.endswith(".json"))
+    if not names:
+        return None
+    with open(os.path.join(directory, names[-1])) as f:
+        return json.load(f)
+
+
+def campaign_key(campaign, index):
+    """Stable identity of a campaign row across snapshots"""
+    for field in ("campaign_id", "ad_id"):
+        if campaign.get(field) not in (None, ""):
+            return str(campaign[field])
+    return f"#{index}"
+
+
+def _keyed(campaigns):
+    """
+    Campaigns by key; repeated keys (e.g. one campaign split across rows)
+    get an occurrence suffix, ``c1``, ``c1#2``, ... in row order, so every
+    row is compared and counted instead of the last one winning
+    """
+    keyed = {}
+    seen = {}
+    for i, campaign in enumerate(campaigns):
+        key = campaign_key(campaign, i)
+        seen[key] = seen.get(key, 0) + 1
+        keyed[key if seen[key] == 1 else f"{key}#{seen[key]}"] = campaign
+    return keyed
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _changed(old, new, tolerance):
+    if _is_number(old) and _is_number(new):
+        if old == new:
+            return False
+        if old == 0:
+            return True
+        return abs(new - old) / abs(old) > tolerance
+    return old != new
+
+
+def diff_campaigns(old_campaigns, new_campaigns, tolerance=None):
+    """
+    Compare two campaign sets
+
+    Args:
+        old_campaigns: Campaigns of the previous snapshot
+        new_campaigns: Campaigns of the new request
+        tolerance: Relative change a numeric field needs to count as changed
+
+    Rows sharing a campaign key are paired in order (see _keyed()); an
+    extra or missing row shows up as added or removed.
+
+    Returns:
+        dict: ``added`` / ``removed`` campaign keys, ``changed`` mapping
+            campaign key -> changed fields, and ``totals_changed`` listing
+            account-level totals that moved materially
+    """
+    tolerance = INCREMENTAL_TOLERANCE if tolerance is None else tolerance
+    old = _keyed(old_campaigns)
+    new = _keyed(new_campaigns)
+
+    changed = {}
+    for key in old.keys() & new.keys():
+        fields = [
+            field
+            for field in old[key].keys() | new[key].keys()
+            if _changed(old[key].get(field), new[key].get(field), tolerance)
+        ]
+        if fields:
+            changed[key] = sorted(fields)
+
+    totals_changed = []
+    for field in TOTAL_FIELDS:
+        old_total = sum(c.get(field) or 0 for c in old.values() if _is_number(c.get(field) or 0))
+        new_total = sum(c.get(field) or 0 for c in new.values() if _is_number(c.get(field) or 0))
+        if _changed(old_total, new_total, tolerance):
+            totals_changed.append(field)
+
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "changed": changed,
+        "totals_changed": totals_changed,
+    }
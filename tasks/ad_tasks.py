@@ -1,68 +1,96 @@
+"""
+Task definitions for the 5-agent crew.
+
+Task descriptions are module-level templates so that per-request task
+construction is a single str.format() over values computed once per request.
+"""
+from collections import namedtuple
+from string import Formatter
+
 from crewai import Task
 
+from analysis.anomalies import anomaly_summary
+from analysis.response_curves import projection_summary
+from analysis.segments import segment_summary
+from runs.index import precedent_summary
+from tasks.schemas import compact_output, output_instructions
 
-def create_analytics_task(agent, campaign_data):
-    return Task(
-        description=f"""Analyze campaign performance metrics from this data:
+TaskTemplate = namedtuple("TaskTemplate", ["description", "expected_output"])
+
+ANALYTICS_TEMPLATE = TaskTemplate(
+    description="""Analyze campaign performance metrics from this data:
 
-Total campaigns: {len(campaign_data)}
-Sample campaigns: {campaign_data[:3]}
+Total campaigns: {total_campaigns}
+Campaign segments (every campaign, clustered by KPIs and dimensions):
+{segments}
+
+Sample campaigns: {sample}
+
+Anomalies flagged in the live metrics stream:
+{anomalies}
 
 Provide a comprehensive analysis:
 1. Calculate and report key metrics: Total CTR, Average CPC, Total Conversions, Total Spend
 2. Identify top 3 performing campaigns (by ROI and conversion rate)
 3. Identify bottom 3 underperforming campaigns
 4. Spot trends across platforms (Google, Facebook, Instagram, etc.)
-5. Provide 3–5 actionable insights
+5. Explain any flagged anomalies (likely cause, urgency)
+6. Provide 3–5 actionable insights
 
 Be specific with numbers and percentages.""",
-        agent=agent,
-        expected_output="Comprehensive analytics report with metrics, trends, and actionable insights",
-    )
+    expected_output="Comprehensive analytics report with metrics, trends, and actionable insights",
+)
 
+BID_OPTIMIZATION_TEMPLATE = TaskTemplate(
+    description="""Analyze bid performance and suggest optimizations:
 
-def create_bid_optimization_task(agent, campaign_data):
-    return Task(
-        description=f"""Analyze bid performance and suggest optimizations:
+Campaign segments (all {total_campaigns} campaigns, clustered by KPIs and dimensions):
+{segments}
 
-Campaign data: {campaign_data[:3]}
+Sample campaigns: {sample}
+
+Projected impact of spend changes (fitted spend-response curves):
+{projections}
 
 For each high-opportunity campaign:
 1. Analyze current CPC vs industry benchmarks
 2. Recommend specific bid adjustments (increase/decrease by X%)
-3. Project expected ROI impact
+3. Project expected ROI impact (use the fitted projections above where available)
 4. Assess risk level (low/medium/high)
 
 Focus on campaigns with CTR > 3% or conversion rate > 5%.""",
-        agent=agent,
-        expected_output="Bid optimization recommendations with specific adjustments and ROI projections",
-    )
+    expected_output="Bid optimization recommendations with specific adjustments and ROI projections",
+)
 
+BUDGET_TEMPLATE = TaskTemplate(
+    description="""Analyze budget allocation and recommend reallocation:
 
-def create_budget_task(agent, campaign_data):
-    return Task(
-        description=f"""Analyze budget allocation and recommend reallocation:
+Campaign segments (all {total_campaigns} campaigns, clustered by KPIs and dimensions):
+{segments}
+
+Sample campaigns: {sample}
 
-Campaign data: {campaign_data[:3]}
+Projected impact of spend changes (fitted spend-response curves):
+{projections}
 
 Provide:
 1. Current budget distribution analysis (% per platform/campaign)
 2. Identify campaigns to reduce budget (underperformers with ROI < 50%)
 3. Identify campaigns to increase budget (high performers with ROI > 200%)
 4. Specific reallocation plan with dollar amounts
-5. Expected overall ROI improvement
+5. Expected overall ROI improvement, based on the projected marginal returns above
 
 Be specific: "Move $X from Campaign Y to Campaign Z".""",
-        agent=agent,
-        expected_output="Budget reallocation strategy with specific dollar amounts and expected ROI impact",
-    )
+    expected_output="Budget reallocation strategy with specific dollar amounts and expected ROI impact",
+)
 
+CREATIVE_TEMPLATE = TaskTemplate(
+    description="""Evaluate ad creative performance:
 
-def create_creative_task(agent, campaign_data):
-    return Task(
-        description=f"""Evaluate ad creative performance:
+Campaign segments (all {total_campaigns} campaigns, clustered by KPIs and dimensions):
+{segments}
 
-Campaign data: {campaign_data[:3]}
+Sample campaigns: {sample}
 
 Analyze:
 1. CTR patterns across different platforms
@@ -72,14 +100,11 @@ Analyze:
 5. Identify winning creative patterns
 
 Provide specific, actionable creative recommendations.""",
-        agent=agent,
-        expected_output="Creative optimization recommendations with A/B test suggestions and best practices",
-    )
-
+    expected_output="Creative optimization recommendations with A/B test suggestions and best practices",
+)
 
-def create_orchestration_task(agent):
-    return Task(
-        description="""Synthesize all agent insights into a comprehensive campaign optimization strategy.
+ORCHESTRATION_TEMPLATE = TaskTemplate(
+    description="""Synthesize all agent insights into a comprehensive campaign optimization strategy.
 
 Create an executive summary with:
 1. Key Findings (top 3–5 insights from all agents)
@@ -91,7 +116,162 @@ Create an executive summary with:
 4. Expected Overall Impact (ROI improvement, cost savings)
 5. Risk Assessment
 
+Recommendations from the most similar past runs (keep advice consistent with them
+unless this account's data says otherwise):
+{precedents}
+
 Make it executive-ready: clear, concise, actionable.""",
+    expected_output="Executive summary with prioritized action plan and implementation roadmap",
+)
+
+
+REDUCE_TEMPLATE = TaskTemplate(
+    description="""Merge partial findings into one account-wide result.
+
+The account has {total_campaigns} campaigns, analyzed in {partition_count} partitions
+(split by {partition_by}). Each section below is your own analysis of one partition.
+
+{findings}
+
+Produce a single consolidated result:
+1. Recompute account-wide figures from the partition figures (weight by spend/volume)
+2. Merge duplicate or overlapping recommendations
+3. Resolve conflicts between partitions and say which one wins and why
+4. Rank recommendations by expected impact across the whole account
+
+Keep the specific numbers, campaign ids and dollar amounts from the partitions.""",
+    expected_output="{expected_output}",
+)
+
+
+def _template_fields(campaign_data, names=None):
+    """
+    Values substituted into the templates, computed once per request
+
+    Args:
+        names: Fields to compute (default: all); summaries no template
+            asks for are not built
+    """
+    summaries = {
+        "segments": segment_summary,
+        "projections": projection_summary,
+        "anomalies": anomaly_summary,
+        "precedents": precedent_summary,
+    }
+    fields = {"total_campaigns": len(campaign_data), "sample": campaign_data[:3]}
+    fields.update(
+        {name: fn(campaign_data) for name, fn in summaries.items() if names is None or name in names}
+    )
+    return fields
+
+
+def _placeholders(templates):
+    """Field names used by ``templates``"""
+    return {
+        name
+        for template in templates
+        for text in template
+        for _, name, _, _ in Formatter().parse(text)
+        if name
+    }
+
+
+def _task_from_template(template, agent, fields, key):
+    # The schema is appended after format(): its braces are not placeholders
+    return Task(
+        description=template.description.format(**fields),
         agent=agent,
-        expected_output="Executive summary with prioritized action plan and implementation roadmap",
+        expected_output=f"{template.expected_output.format(**fields)}\n\n{output_instructions(key)}",
+    )
+
+
+def create_analytics_task(agent, campaign_data):
+    return _task_from_template(ANALYTICS_TEMPLATE, agent, _template_fields(campaign_data), "analytics")
+
+
+def create_bid_optimization_task(agent, campaign_data):
+    return _task_from_template(BID_OPTIMIZATION_TEMPLATE, agent, _template_fields(campaign_data), "bid")
+
+
+def create_budget_task(agent, campaign_data):
+    return _task_from_template(BUDGET_TEMPLATE, agent, _template_fields(campaign_data), "budget")
+
+
+def create_creative_task(agent, campaign_data):
+    return _task_from_template(CREATIVE_TEMPLATE, agent, _template_fields(campaign_data), "creative")
+
+
+def create_orchestration_task(agent, campaign_data=None):
+    return _task_from_template(
+        ORCHESTRATION_TEMPLATE, agent, {"precedents": precedent_summary(campaign_data)},
+        "orchestration",
+    )
+
+
+TASK_TEMPLATES = {
+    "analytics": ANALYTICS_TEMPLATE,
+    "bid": BID_OPTIMIZATION_TEMPLATE,
+    "budget": BUDGET_TEMPLATE,
+    "creative": CREATIVE_TEMPLATE,
+    "orchestration": ORCHESTRATION_TEMPLATE,
+}
+
+
+def build_tasks(agents, campaign_data, keys=None, scope=None):
+    """
+    Instantiate the tasks for one request
+
+    Args:
+        agents: Agent set keyed like TASK_TEMPLATES
+        campaign_data: List of campaign dictionaries
+        keys: Subset of TASK_TEMPLATES keys to build (default: all five)
+        scope: Optional note prepended to each description, e.g. to tell
+            an agent it only sees one partition of the account
+
+    Returns:
+        dict: Task per key, in execution order
+    """
+    templates = {
+        key: template for key, template in TASK_TEMPLATES.items() if keys is None or key in keys
+    }
+    # Only what the chosen tasks use: e.g. precedents are for the orchestrator
+    fields = _template_fields(campaign_data, _placeholders(templates.values()))
+    tasks = {}
+    for key, template in templates.items():
+        task = _task_from_template(template, agents[key], fields, key)
+        if scope:
+            task.description = f"{scope}\n\n{task.description}"
+        tasks[key] = task
+    return tasks
+
+
+def create_reduce_task(agent, key, partial_findings, total_campaigns, partition_by):
+    """
+    Task that merges one specialist's per-partition findings
+
+    Args:
+        agent: The specialist agent that produced the findings
+        key: TASK_TEMPLATES key of the specialist task
+        partial_findings: Mapping of partition label -> raw output
+        total_campaigns: Campaign count of the whole account
+        partition_by: How the account was partitioned
+
+    Returns:
+        Task: Reduce task for the specialist
+    """
+    findings = "\n\n".join(
+        f"### Partition: {label}\n{compact_output(key, output)}"
+        for label, output in partial_findings.items()
+    )
+    return _task_from_template(
+        REDUCE_TEMPLATE,
+        agent,
+        {
+            "total_campaigns": total_campaigns,
+            "partition_count": len(partial_findings),
+            "partition_by": partition_by,
+            "findings": findings,
+            "expected_output": TASK_TEMPLATES[key].expected_output,
+        },
+        key,
     )
@@ -0,0 +1,184 @@
+"""
+Structured task outputs
+
+Every task is asked for a JSON object matching its schema below instead of
+free-form prose. A valid answer is validated into the schema's model. The
+orchestrator receives the compact JSON form of the specialists' results, the
+final report is rendered from the orchestrator's result, and the API returns
+all results next to the report. An answer that does not validate is kept as
+is: downstream tasks get the prose, and the task has no structured result.
+"""
+import json
+import re
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+
+class AnalyticsResult(BaseModel):
+    total_ctr: float = Field(..., description="Account CTR, percent")
+    average_cpc: float = Field(..., description="Average cost per click, dollars")
+    total_conversions: float
+    total_spend: float = Field(..., description="Dollars")
+    top_campaigns: List[str] = Field(..., description="Ids of the best campaigns by ROI and conversion rate")
+    bottom_campaigns: List[str] = Field(..., description="Ids of the worst campaigns")
+    platform_trends: List[str] = Field(default_factory=list)
+    anomalies: List[str] = Field(default_factory=list, description="Flagged anomalies with likely cause")
+    insights: List[str] = Field(..., description="Actionable insights")
+
+
+class BidChange(BaseModel):
+    campaign_id: str
+    change_pct: float = Field(..., ge=-100, description="Bid change, percent (negative to decrease)")
+    expected_roi_impact_pct: Optional[float] = Field(None, description="Projected ROI change, percentage points")
+    risk: Literal["low", "medium", "high"]
+    rationale: str
+
+
+class BidResult(BaseModel):
+    changes: List[BidChange]
+    notes: List[str] = Field(default_factory=list)
+
+
+class BudgetMove(BaseModel):
+    from_campaign: str
+    to_campaign: str
+    amount: float = Field(..., gt=0, description="Dollars moved")
+    rationale: str = ""
+
+
+class BudgetResult(BaseModel):
+    distribution: Dict[str, float] = Field(
+        default_factory=dict, description="Current share of spend per platform, percent"
+    )
+    decrease: List[str] = Field(default_factory=list, description="Ids of campaigns to cut")
+    increase: List[str] = Field(default_factory=list, description="Ids of campaigns to grow")
+    moves: List[BudgetMove]
+    expected_roi_improvement_pct: Optional[float] = None
+
+
+class ABTest(BaseModel):
+    campaign_id: str
+    hypothesis: str
+    variant: str = Field(..., description="What the challenger changes (headline, visual, CTA, ...)")
+    success_metric: Literal["ctr", "conversion_rate", "cpa", "roi"] = "ctr"
+
+
+class CreativeResult(BaseModel):
+    ab_tests: List[ABTest]
+    improvements: List[str] = Field(default_factory=list)
+    winning_patterns: List[str] = Field(default_factory=list)
+
+
+class Action(BaseModel):
+    priority: int = Field(..., ge=1, description="1 is the highest expected impact")
+    title: str
+    horizon: Literal["quick_win", "short_term", "long_term"]
+    expected_impact: str
+
+
+class OrchestrationResult(BaseModel):
+    key_findings: List[str]
+    actions: List[Action]
+    expected_impact: str = Field(..., description="Overall ROI improvement and cost savings")
+    risks: List[str] = Field(default_factory=list)
+
+
+TASK_SCHEMAS = {
+    "analytics": AnalyticsResult,
+    "bid": BidResult,
+    "budget": BudgetResult,
+    "creative": CreativeResult,
+    "orchestration": OrchestrationResult,
+}
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def output_instructions(key):
+    """Expected-output note asking for ``key``'s JSON schema"""
+    schema = json.dumps(TASK_SCHEMAS[key].model_json_schema(), separators=(",", ":"))
+    return (
+        "Respond with a single JSON object and nothing else, valid against this JSON schema "
+        f"(use campaign ids as given in the data): {schema}"
+    )
+
+
+def _json_candidates(raw):
+    text = str(raw).strip()
+    yield text
+    for block in _FENCE.findall(text):
+        yield block.strip()
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        yield text[start:end + 1]
+
+
+def parse_output(key, raw):
+    """
+    Validated result of a task's raw output
+
+    Returns:
+        BaseModel: Instance of TASK_SCHEMAS[key], or None if the output is
+            not a JSON object valid against it
+    """
+    model = TASK_SCHEMAS.get(key)
+    if model is None or raw is None:
+        return None
+    for candidate in _json_candidates(raw):
+        try:
+            return model.model_validate_json(candidate)
+        except (ValidationError, ValueError):
+            continue
+    return None
+
+
+def compact_output(key, raw):
+    """Minified JSON of a valid output, else the raw output unchanged"""
+    result = parse_output(key, raw)
+    return raw if result is None else result.model_dump_json(exclude_defaults=True)
+
+
+def structured_outputs(outputs):
+    """
+    Validated results of raw task outputs as plain dicts
+
+    Returns:
+        dict: Task key -> result, only for outputs that validate
+    """
+    structured = {}
+    for key, raw in outputs.items():
+        result = parse_output(key, raw)
+        if result is not None:
+            structured[key] = result.model_dump()
+    return structured
+
+
+HORIZONS = {
+    "quick_win": "Quick Wins (this week)",
+    "short_term": "Short-term (this month)",
+    "long_term": "Long-term (strategic initiatives)",
+}
+
+
+def render_report(result):
+    """
+    Executive report text of an OrchestrationResult
+
+    Returns:
+        str: Findings, prioritized actions grouped by horizon, impact and risks
+    """
+    lines = ["# Campaign Optimization Strategy", "", "## Key Findings"]
+    lines += [f"{i}. {finding}" for i, finding in enumerate(result.key_findings, start=1)]
+    lines += ["", "## Prioritized Action Items"]
+    actions = sorted(result.actions, key=lambda a: a.priority)
+    lines += [f"{a.priority}. {a.title} (expected impact: {a.expected_impact})" for a in actions]
+    lines += ["", "## Implementation Roadmap"]
+    for horizon, title in HORIZONS.items():
+        planned = [a.title for a in actions if a.horizon == horizon]
+        if planned:
+            lines += [f"### {title}"] + [f"- {t}" for t in planned]
+    lines += ["", "## Expected Overall Impact", result.expected_impact]
+    if result.risks:
+        lines += ["", "## Risk Assessment"] + [f"- {risk}" for risk in result.risks]
+    return "\n".join(lines)
@@ -2,12 +2,18 @@
 Pytest configuration and shared fixtures for Ad Optimizer tests.
 """
 
+import os
 import sys
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
 
+# Keep crewai from phoning home or prompting during tests
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("CREWAI_TRACING_ENABLED", "false")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
 from api.app import app
 
 # Add project root to PYTHONPATH
@@ -109,3 +115,22 @@ def env_vars(monkeypatch):
         monkeypatch.setenv(key, value)
 
     return env_vars
+
+
+@pytest.fixture
+def stub_agent_pool(monkeypatch):
+    """
+    Agent pool whose agents answer from the stub LLM instead of OpenAI.
+
+    Each answer echoes the first line of the task prompt, so tests can
+    tell which task produced it.
+
+    Returns:
+        AgentPool: Pool installed as the process-wide crew agent pool
+    """
+    import crew
+
+    monkeypatch.setenv("LLM_MODEL", "stub")
+    pool = crew.AgentPool(size=4)
+    monkeypatch.setattr(crew, "_agent_pool", pool)
+    return pool
@@ -0,0 +1,49 @@
+import pytest
+
+from analysis.anomalies import AnomalyDetector, RunningStats, detector
+
+
+def _row(day, clicks=50, conversions=5, spend=100.0, campaign_id="c1"):
+    return {
+        "campaign_id": campaign_id,
+        "platform": "Google",
+        "impressions": 1000 + day % 3,
+        "clicks": clicks + day % 2,
+        "conversions": conversions,
+        "spend": spend,
+        "date": f"2026-01-{day + 1:02d}",
+    }
+
+
+def test_running_stats_match_batch_statistics():
+    values = [3.0, 5.0, 4.0, 8.0, 6.0]
+    stats = RunningStats()
+    for v in values:
+        stats.update(v)
+    assert stats.mean == pytest.approx(5.2)
+    assert stats.variance == pytest.approx(3.7)
+
+
+def test_flags_ctr_drop_and_cpa_spike_after_warmup():
+    stream = AnomalyDetector(threshold=3, min_observations=5)
+    assert stream.observe_many(_row(d) for d in range(20)) == []
+
+    found = stream.observe(_row(20, clicks=5, conversions=1))
+    by_metric = {(a["scope"], a["metric"]): a for a in found}
+    assert by_metric[("campaign", "ctr")]["direction"] == "drop"
+    assert by_metric[("campaign", "cpa")]["direction"] == "spike"
+    assert stream.recent(campaign_ids=["c1"])[0]["observed_at"] == "2026-01-21"
+
+
+def test_ingest_endpoint_feeds_analytics_prompt(test_client):
+    from tasks.ad_tasks import _template_fields
+
+    detector.reset()
+    rows = [_row(d) for d in range(10)] + [_row(10, clicks=2)]
+    body = test_client.post("/v1/metrics/ingest", json={"records": rows}).json()
+    assert body["records_observed"] == 11 and body["anomalies"]
+
+    listed = test_client.get("/v1/anomalies", params={"campaign_id": "c1"}).json()
+    assert listed["anomalies"][0]["metric"] == "ctr"
+    assert "CTR drop" in _template_fields([{"campaign_id": "c1"}])["anomalies"]
+    detector.reset()
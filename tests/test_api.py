@@ -0,0 +1,150 @@
+import json
+import time
+
+import api.app as api_app
+
+
+def _fake_optimization(campaign_data, **kwargs):
+    return api_app.OptimizationResponse(
+        status="success",
+        execution_time=0.0,
+        campaigns_analyzed=len(campaign_data),
+        report="ok",
+        timestamp="2026-01-01T00:00:00",
+    )
+
+
+def test_health(test_client):
+    response = test_client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+def test_job_submit_and_poll(test_client, sample_campaign_data, monkeypatch):
+    monkeypatch.setattr(api_app, "run_optimization", _fake_optimization)
+
+    response = test_client.post("/v1/jobs", json={"campaigns": sample_campaign_data})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(50):
+        job = test_client.get(f"/v1/jobs/{job_id}").json()
+        if job["status"] == "succeeded":
+            break
+        time.sleep(0.02)
+
+    assert job["status"] == "succeeded"
+    assert job["result"]["campaigns_analyzed"] == len(sample_campaign_data)
+
+
+def test_unknown_job_returns_404(test_client):
+    assert test_client.get("/v1/jobs/does-not-exist").status_code == 404
+
+
+def test_batch_reports_per_account_failures(test_client, sample_campaign_data, monkeypatch):
+    def flaky(campaign_data, account_id=None, **kwargs):
+        if account_id == "bad":
+            raise RuntimeError("boom")
+        return _fake_optimization(campaign_data)
+
+    monkeypatch.setattr(api_app, "run_optimization", flaky)
+    payload = {
+        "accounts": [
+            {"account_id": "good", "campaigns": sample_campaign_data},
+            {"account_id": "bad", "campaigns": sample_campaign_data},
+        ],
+        "max_parallelism": 2,
+    }
+
+    body = test_client.post("/v1/optimize/batch", json=payload).json()
+
+    assert body["status"] == "partial"
+    assert [r["account_id"] for r in body["results"]] == ["good", "bad"]
+    assert body["results"][1]["error"] == "boom"
+
+
+def test_batch_reports_partial_runs_separately(test_client, sample_campaign_data, monkeypatch):
+    def slow(campaign_data, account_id=None, **kwargs):
+        response = _fake_optimization(campaign_data)
+        if account_id == "slow":
+            response.status = "partial"
+        return response
+
+    monkeypatch.setattr(api_app, "run_optimization", slow)
+    payload = {"accounts": [{"account_id": a, "campaigns": sample_campaign_data}
+                            for a in ("fast", "slow")]}
+
+    body = test_client.post("/v1/optimize/batch", json=payload).json()
+    assert [r["status"] for r in body["results"]] == ["success", "partial"]
+    assert (body["status"], body["succeeded"], body["partial"], body["failed"]) == ("partial", 1, 1, 0)
+
+    response = test_client.post("/v1/optimize/batch?stream=true", json=payload)
+    summary = json.loads(response.text.splitlines()[-1])
+    assert (summary["succeeded"], summary["partial"], summary["failed"]) == (1, 1, 0)
+
+
+def test_batch_streams_ndjson(test_client, sample_campaign_data, monkeypatch):
+    monkeypatch.setattr(api_app, "run_optimization", lambda c, **kwargs: _fake_optimization(c))
+    payload = {"accounts": [{"account_id": str(i), "campaigns": sample_campaign_data} for i in range(3)]}
+
+    response = test_client.post("/v1/optimize/batch?stream=true", json=payload)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert len(lines) == 4
+    assert lines[-1]["type"] == "summary"
+    assert lines[-1]["succeeded"] == 3
+
+
+def test_profiled_request_is_served_by_admin_endpoint(test_client, sample_campaign_data,
+                                                      monkeypatch, tmp_path):
+    import monitoring.profiling as profiling
+
+    monkeypatch.setattr(api_app, "run_optimization", _fake_optimization)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+
+    # Without the admin token the header is ignored and admin endpoints are off
+    response = test_client.post(
+        "/v1/optimize", json={"campaigns": sample_campaign_data}, headers={"X-Profile": "1"}
+    )
+    assert response.status_code == 200 and "X-Profile-ID" not in response.headers
+    assert test_client.get("/admin/profiles").status_code == 404
+
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    admin = {"X-Admin-Token": "secret"}
+    response = test_client.post(
+        "/v1/optimize",
+        json={"campaigns": sample_campaign_data},
+        headers={"X-Profile": "1", "X-Request-ID": "req-42", **admin},
+    )
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-ID"]
+    assert profile_id != "req-42"
+
+    profile = test_client.get(f"/admin/profiles/{profile_id}", headers=admin)
+    assert profile.status_code == 200
+    assert "Threads profiled" in profile.text
+    profiles = test_client.get("/admin/profiles", headers=admin).json()["profiles"]
+    assert profiles[0]["profile_id"] == profile_id
+    assert test_client.get(f"/admin/profiles/{profile_id}").status_code == 403
+
+
+def test_metrics_include_runtime_gauges(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(api_app, "WARMUP_ON_STARTUP", False)
+    with TestClient(api_app.app) as client:
+        body = client.get("/metrics").text
+
+    for name in ("process_threads", "process_resident_memory_bytes", "process_open_fds",
+                 "event_loop_lag_seconds", "python_gc_pause_seconds"):
+        assert name in body
+
+
+def test_request_metrics_are_labelled_by_route_template(test_client):
+    test_client.get("/v1/jobs/abc123")
+    test_client.get("/no/such/path")
+    body = test_client.get("/metrics").text
+
+    assert 'endpoint="/v1/jobs/{job_id}"' in body
+    assert 'endpoint="unmatched"' in body
+    assert "abc123" not in body and "/no/such/path" not in body
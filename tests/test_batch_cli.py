@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+
+import main
+
+
+def fake_optimize(path, output_dir, mode):
+    """Fails accounts whose CSV has a 'fail' column, like a crew error would"""
+    df = pd.read_csv(path)
+    status = "failed" if "fail" in df.columns else "success"
+    return {"status": status, "campaigns": len(df), "report": None,
+            "error": "boom" if status == "failed" else None, "execution_time": 0.01}
+
+
+def test_batch_resumes_from_checkpoint(tmp_path, sample_campaign_data):
+    input_dir, output_dir = tmp_path / "accounts", tmp_path / "out"
+    input_dir.mkdir()
+    for name in ("acme", "globex"):
+        pd.DataFrame(sample_campaign_data).to_csv(input_dir / f"{name}.csv", index=False)
+    pd.DataFrame(sample_campaign_data).assign(fail=1).to_csv(input_dir / "initech.csv", index=False)
+
+    summary = main.run_batch_dir(str(input_dir), str(output_dir), workers=2, optimize=fake_optimize)
+    assert dict(zip(summary["account_id"], summary["status"])) == {
+        "acme": "success", "globex": "success", "initech": "failed",
+    }
+    assert os.path.exists(output_dir / main.SUMMARY_FILE)
+
+    # Only the failed account runs again once its data is fixed
+    pd.DataFrame(sample_campaign_data).to_csv(input_dir / "initech.csv", index=False)
+    before = main.load_checkpoint(str(output_dir))
+    summary = main.run_batch_dir(str(input_dir), str(output_dir), workers=2, optimize=fake_optimize)
+    after = main.load_checkpoint(str(output_dir))
+
+    assert (summary["status"] == "success").all()
+    assert after["acme"]["finished_at"] == before["acme"]["finished_at"]
+    assert after["initech"]["finished_at"] != before["initech"]["finished_at"]
+
+
+def crash_optimize(path, output_dir, mode):
+    """Kills its worker process for accounts with a 'crash' column, like an OOM kill"""
+    if "crash" in pd.read_csv(path).columns:
+        os._exit(1)
+    return fake_optimize(path, output_dir, mode)
+
+
+def unpicklable_optimize(path, output_dir, mode):
+    return {"status": "success", "report": lambda: None}
+
+
+def test_worker_crash_is_recorded_instead_of_aborting_the_batch(tmp_path, sample_campaign_data):
+    input_dir, output_dir = tmp_path / "accounts", tmp_path / "out"
+    input_dir.mkdir()
+    pd.DataFrame(sample_campaign_data).assign(crash=1).to_csv(input_dir / "acme.csv", index=False)
+    pd.DataFrame(sample_campaign_data).to_csv(input_dir / "globex.csv", index=False)
+
+    summary = main.run_batch_dir(str(input_dir), str(output_dir), workers=1, optimize=crash_optimize)
+
+    assert len(summary) == 2
+    statuses = dict(zip(summary["account_id"], summary["status"]))
+    assert statuses["acme"] == "failed"
+    assert set(main.load_checkpoint(str(output_dir))) == {"acme", "globex"}
+
+    summary = main.run_batch_dir(str(input_dir), str(output_dir), workers=1,
+                                 optimize=unpicklable_optimize, fresh=True)
+    assert (summary["status"] == "failed").all()
+    assert summary["error"].str.contains("pickle").all()
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ui import charts
+
+
+def _campaigns(n):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "campaign_id": np.arange(n),
+        "spend": rng.gamma(2.0, 100.0, n),
+        "conversions": rng.poisson(5, n),
+        "clicks": rng.poisson(100, n),
+        "impressions": rng.poisson(5000, n) + 1,
+    })
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    charts.clear_cache()
+
+
+def test_top_n_pools_the_rest_into_other():
+    df = _campaigns(50)
+    ctr = charts.top_n_with_other(df, "clicks", "impressions", n=5)
+
+    assert len(ctr) == 6 and ctr.index[-1] == charts.OTHER_LABEL
+    rest = df.drop(df["spend"].nlargest(5).index)
+    assert ctr[charts.OTHER_LABEL] == pytest.approx(rest["clicks"].sum() / rest["impressions"].sum())
+
+
+def test_large_accounts_render_as_density(monkeypatch):
+    monkeypatch.setattr(charts, "SCATTER_POINT_LIMIT", 100)
+    fig = charts.plot_spend_vs_conversions(_campaigns(1000))
+
+    ax = fig.axes[0]
+    assert "density" in ax.get_title()
+    assert len(ax.texts) == charts.ANNOTATE_LIMIT
+
+
+def test_renders_are_cached_by_data():
+    df = _campaigns(30)
+    assert charts.plot_ctr(df) is charts.plot_ctr(df.copy())
+
+    changed = df.copy()
+    changed.loc[0, "clicks"] += 1
+    assert charts.plot_ctr(changed) is not charts.plot_ctr(df)
@@ -0,0 +1,41 @@
+import crew
+from crew import tasks_to_resume
+
+
+def test_tasks_to_resume_includes_downstream():
+    done = {"analytics": "a", "bid": "b", "budget": "c", "creative": "d"}
+    assert tasks_to_resume(done) == ["orchestration"]
+    assert tasks_to_resume({"analytics": "a", "budget": "c"}) == ["bid", "creative", "orchestration"]
+    assert tasks_to_resume({"creative": "d"}) == list(crew.TASK_ORDER)
+
+
+def test_failed_run_resumes_with_one_agent_call(test_client, stub_agent_pool, sample_campaign_data,
+                                                 tmp_path, monkeypatch):
+    # Reports and checkpoints are written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    execute = crew._execute_task
+    calls, failures = [], ["orchestration"]
+
+    def flaky_orchestrator(key, *args, **kwargs):
+        calls.append(key)
+        if key in failures:
+            failures.remove(key)
+            raise RuntimeError("provider error")
+        return execute(key, *args, **kwargs)
+
+    monkeypatch.setattr(crew, "_execute_task", flaky_orchestrator)
+
+    failed = test_client.post("/v1/optimize", json={"campaigns": sample_campaign_data})
+    assert failed.status_code == 500
+    run_id = failed.headers["X-Run-ID"]
+
+    run = test_client.get(f"/v1/runs/{run_id}").json()
+    assert run["status"] == "failed"
+    assert run["completed_tasks"] == ["analytics", "bid", "budget", "creative"]
+
+    calls.clear()
+    resumed = test_client.post(f"/v1/runs/{run_id}/resume")
+    assert resumed.status_code == 200
+    assert resumed.json()["tasks_run"] == ["orchestration"] and calls == ["orchestration"]
+    # A finished run needs no checkpoint
+    assert test_client.get(f"/v1/runs/{run_id}").status_code == 404
@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from client import async_client as async_module
+from client import sync_client as sync_module
+from client.async_client import AsyncOptimizerClient
+from client.base import OptimizerAPIError, backoff_delay, normalize_base_url
+from client.sync_client import OptimizerClient
+
+
+def test_normalize_base_url_accepts_optimize_endpoint():
+    assert normalize_base_url("http://host:8000/v1/optimize") == "http://host:8000"
+    assert normalize_base_url("http://host:8000/") == "http://host:8000"
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(10, 0.5, 30.0) for _ in range(100)]
+    assert all(0 <= d <= 30.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_backoff_delay_honors_retry_after():
+    assert backoff_delay(0, 0.5, 30.0, retry_after="7") == 7.0
+    assert backoff_delay(0, 0.5, 30.0, retry_after="120") == 30.0
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    """Transport answering from a list of (status, headers, body) or exceptions"""
+
+    def __init__(self, answers):
+        super().__init__()
+        self.answers = list(answers)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append((request.method, request.path_url))
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        status, headers, body = answer
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = json.dumps(body).encode()
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def sync_client(monkeypatch, answers, **kwargs):
+    sleeps = []
+    monkeypatch.setattr(sync_module.time, "sleep", sleeps.append)
+    client = OptimizerClient("http://api", **kwargs)
+    adapter = FakeAdapter(answers)
+    client.session.mount("http://", adapter)
+    return client, adapter, sleeps
+
+
+def async_client(monkeypatch, answers, **kwargs):
+    sleeps = []
+    calls = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        status, headers, body = answer
+        return httpx.Response(status, headers=headers, json=body)
+
+    monkeypatch.setattr(async_module.asyncio, "sleep", sleep)
+    client = AsyncOptimizerClient("http://api", **kwargs)
+    client.client = httpx.AsyncClient(base_url="http://api", transport=httpx.MockTransport(handler))
+    return client, calls, sleeps
+
+
+def test_sync_client_retries_429_and_503_after_retry_after(monkeypatch):
+    client, adapter, sleeps = sync_client(monkeypatch, [
+        (429, {"Retry-After": "3"}, {}),
+        (503, {"Retry-After": "7"}, {}),
+        (200, {}, {"status": "success"}),
+    ])
+    assert client.optimize([{"campaign_id": "c1"}]) == {"status": "success"}
+    assert sleeps == [3.0, 7.0]
+    assert adapter.requests == [("POST", "/v1/optimize")] * 3
+
+
+def test_sync_client_gives_up_after_max_retries(monkeypatch):
+    client, adapter, sleeps = sync_client(
+        monkeypatch, [(503, {"Retry-After": "1"}, {"detail": "busy"})] * 3, max_retries=2
+    )
+    with pytest.raises(OptimizerAPIError) as error:
+        client.health()
+    assert error.value.status_code == 503
+    assert len(adapter.requests) == 3 and len(sleeps) == 2
+
+
+def test_sync_client_retries_connect_failures_but_not_sent_requests(monkeypatch):
+    refused = requests.exceptions.ConnectionError(
+        MaxRetryError(None, "/v1/jobs", NewConnectionError(None, "Connection refused"))
+    )
+    client, adapter, _ = sync_client(monkeypatch, [
+        refused, requests.exceptions.ConnectTimeout(), (202, {}, {"job_id": "j1"}),
+    ])
+    assert client.submit_job([]) == "j1"
+    assert len(adapter.requests) == 3
+
+    reset = requests.exceptions.ConnectionError("Connection reset by peer")
+    client, adapter, _ = sync_client(monkeypatch, [reset, (202, {}, {"job_id": "j2"})])
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.submit_job([])
+    assert len(adapter.requests) == 1
+
+
+def test_sync_client_submits_and_polls_a_job(monkeypatch):
+    client, adapter, _ = sync_client(monkeypatch, [
+        (202, {}, {"job_id": "j1", "status": "queued"}),
+        (200, {}, {"job_id": "j1", "status": "queued"}),
+        (200, {}, {"job_id": "j1", "status": "running"}),
+        (200, {}, {"job_id": "j1", "status": "succeeded", "result": {"report": "done"}}),
+    ])
+    job_id = client.submit_job([{"campaign_id": "c1"}])
+    assert client.wait_for_job(job_id, poll_interval=0) == {"report": "done"}
+    assert adapter.requests == [("POST", "/v1/jobs")] + [("GET", "/v1/jobs/j1")] * 3
+
+
+async def test_async_client_retries_like_the_sync_client(monkeypatch):
+    client, calls, sleeps = async_client(monkeypatch, [
+        httpx.ConnectError("Connection refused"),
+        (429, {"Retry-After": "2"}, {}),
+        (200, {}, {"status": "success"}),
+    ])
+    assert await client.optimize([]) == {"status": "success"}
+    assert sleeps[1:] == [2.0] and len(calls) == 3
+
+    client, calls, _ = async_client(monkeypatch, [httpx.ReadError("reset"), (200, {}, {})])
+    with pytest.raises(httpx.ReadError):
+        await client.optimize([])
+    assert len(calls) == 1
+
+    client, calls, _ = async_client(monkeypatch, [(429, {}, {})] * 2, max_retries=1)
+    with pytest.raises(OptimizerAPIError):
+        await client.health()
+    assert len(calls) == 2
+
+
+async def test_async_client_submits_and_polls_a_job(monkeypatch):
+    client, calls, _ = async_client(monkeypatch, [
+        (202, {}, {"job_id": "j1", "status": "queued"}),
+        (200, {}, {"job_id": "j1", "status": "running"}),
+        (200, {}, {"job_id": "j1", "status": "failed", "error": "boom"}),
+    ])
+    job_id = await client.submit_job([])
+    with pytest.raises(OptimizerAPIError, match="boom"):
+        await client.wait_for_job(job_id, poll_interval=0)
+    assert calls == [("POST", "/v1/jobs"), ("GET", "/v1/jobs/j1"), ("GET", "/v1/jobs/j1")]
+    await client.close()
+
+
+def test_wait_for_job_timeout_names_the_default_timeout(monkeypatch):
+    running = (200, {}, {"job_id": "j1", "status": "running"})
+    client, _, _ = sync_client(monkeypatch, [running], timeout=0)
+    with pytest.raises(TimeoutError, match="still running after 0s"):
+        client.wait_for_job("j1")
+
+    client, _, _ = async_client(monkeypatch, [running], timeout=0)
+    with pytest.raises(TimeoutError, match="still running after 0s"):
+        asyncio.run(client.wait_for_job("j1"))
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+
+import pytest
+
+from agents.deadlines import RunCancelled, RunControl
+from agents.rate_limiter import CircuitOpenError
+from api.workers import CrewWorkerError, CrewWorkerPool
+
+
+def worker_pid(delay=0.0):
+    time.sleep(delay)
+    return os.getpid()
+
+
+def fail():
+    raise CircuitOpenError(12)
+
+
+def test_workers_are_reused_then_recycled_and_errors_cross_processes():
+    pool = CrewWorkerPool(workers=1, max_runs=2)
+    try:
+        first, second, third = (pool.run(worker_pid) for _ in range(3))
+        assert first == second != third != os.getpid()
+
+        with pytest.raises(CircuitOpenError) as error:
+            pool.run(fail)
+        assert error.value.retry_after == 12
+        assert pool.stats() == (0, 0)
+    finally:
+        pool.shutdown()
+
+
+def test_cancelled_run_kills_its_worker():
+    pool = CrewWorkerPool(workers=1)
+    try:
+        control = RunControl(60)
+        control.cancel("client_disconnected")
+        start = time.monotonic()
+        with pytest.raises(RunCancelled, match="client_disconnected"):
+            pool.run(worker_pid, 30, control=control)
+        assert time.monotonic() - start < 10
+        assert pool.run(worker_pid) != os.getpid()
+    finally:
+        pool.shutdown()
+
+
+def capture_prompts(*args, **kwargs):
+    import crew
+    from api.workers import run_crew_in_worker
+
+    prompts = []
+    execute_task = crew._execute_task
+
+    def recording(key, agent, task, *rest, **kw):
+        prompts.append(task.description)
+        return execute_task(key, agent, task, *rest, **kw)
+
+    crew._execute_task = recording
+    result = run_crew_in_worker(*args, **kwargs)
+    result.report = "\n".join(prompts)
+    return result
+
+
+def test_worker_prompts_get_the_api_process_anomalies(test_client, monkeypatch, tmp_path):
+    from analysis.anomalies import detector
+    from api import app as api_app
+    from tests.test_anomalies import _row
+
+    monkeypatch.setenv("LLM_MODEL", "stub")
+    monkeypatch.chdir(tmp_path)
+    pool = CrewWorkerPool(workers=1)
+    monkeypatch.setattr(api_app, "crew_workers", pool)
+    monkeypatch.setattr(api_app, "run_crew_in_worker", capture_prompts)
+    detector.reset()
+    try:
+        rows = [_row(d) for d in range(10)] + [_row(10, clicks=2)]
+        assert test_client.post("/v1/metrics/ingest", json={"records": rows}).json()["anomalies"]
+
+        campaigns = [{"campaign_id": "c1", "platform": "Google", "impressions": 1000,
+                      "clicks": 2, "conversions": 5, "spend": 100.0}]
+        response = test_client.post("/v1/optimize", json={"campaigns": campaigns, "mode": "single"})
+        assert response.status_code == 200
+        assert "CTR drop" in response.json()["report"]
+    finally:
+        detector.reset()
+        pool.shutdown()
+
+
+def test_queued_interactive_run_gets_the_next_worker_before_batch():
+    pool = CrewWorkerPool(workers=1)
+    order = []
+
+    def submit(priority):
+        order.append((priority, pool.run(worker_pid, priority=priority)))
+
+    try:
+        busy = threading.Thread(target=pool.run, args=(worker_pid, 2))
+        busy.start()
+        while pool.stats() != (0, 1):
+            time.sleep(0.01)
+        batch = threading.Thread(target=submit, args=("batch",))
+        batch.start()
+        while pool.stats() != (1, 1):
+            time.sleep(0.01)
+        interactive = threading.Thread(target=submit, args=("interactive",))
+        interactive.start()
+        for thread in (busy, batch, interactive):
+            thread.join()
+        assert [priority for priority, _ in order] == ["interactive", "batch"]
+    finally:
+        pool.shutdown()
+
+
+def hold_memory(megabytes, seconds):
+    block = bytearray(megabytes * 1024 * 1024)
+    time.sleep(seconds)
+    return len(block)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_worker_exceeding_memory_mid_run_is_killed():
+    pool = CrewWorkerPool(workers=1, max_memory_mb=150)
+    try:
+        start = time.monotonic()
+        with pytest.raises(CrewWorkerError, match="exceeded"):
+            pool.run(hold_memory, 300, 30)
+        assert time.monotonic() - start < 10
+        assert pool.stats() == (0, 0)
+        assert pool.run(worker_pid) != os.getpid()
+    finally:
+        pool.shutdown()
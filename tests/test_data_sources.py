@@ -0,0 +1,57 @@
+import time
+
+import pandas as pd
+import pytest
+
+from data import sources
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(sources, "_sources", dict(sources._sources))
+    monkeypatch.setattr(sources, "DATA_SOURCES", [])
+    sources.clear_source_cache()
+    yield sources
+    sources.clear_source_cache()
+
+
+def _frame(campaign_id):
+    return pd.DataFrame([{"campaign_id": campaign_id, "impressions": 1000, "clicks": 50,
+                          "conversions": 5, "spend": 100.0, "platform": "Google"}])
+
+
+def test_sources_load_concurrently_in_order_and_skip_failures(registry):
+    calls = []
+
+    def slow(campaign_id):
+        def load():
+            calls.append(campaign_id)
+            time.sleep(0.2)
+            return _frame(campaign_id)
+        return load
+
+    registry.register_source("a", slow("A"), default=False)
+    registry.register_source("b", slow("B"), default=False)
+
+    @registry.register_source("broken", default=False)
+    def broken():
+        raise OSError("unreachable")
+
+    start = time.perf_counter()
+    df = registry.load_sources(["b", "broken", "a"])
+    assert time.perf_counter() - start < 0.35
+    assert df["campaign_id"].tolist() == ["B", "A"]
+    assert df["roi"].tolist() == [150.0, 150.0]
+
+    registry.load_sources(["a"])
+    assert sorted(calls) == ["A", "B"]
+    with pytest.raises(KeyError):
+        registry.load_sources(["missing"])
+
+
+def test_builtin_sources_are_standardized(registry):
+    assert registry.default_sources() == ["kaggle", "uci"]
+    df = registry.load_sources(["facebook_sample", "google_keywords"])
+    assert set(df["platform"]) == {"Facebook", "Google"}
+    for col in ("campaign_id", "impressions", "clicks", "conversions", "spend", "conversion_rate"):
+        assert df[col].notna().all()
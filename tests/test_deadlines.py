@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from agents.deadlines import (
+    DeadlineExceeded,
+    RunCancelled,
+    RunControl,
+    call_with_deadline,
+    check_current_run,
+    run_control,
+)
+
+
+def test_call_with_deadline_gives_up_on_slow_calls():
+    with pytest.raises(DeadlineExceeded):
+        call_with_deadline(time.sleep, 2, timeout=0.2)
+    assert call_with_deadline(sum, [1, 2], timeout=1) == 3
+
+
+def test_child_deadline_never_outlives_the_run():
+    run = RunControl(timeout=0.1)
+    with run_control(run):
+        with pytest.raises(DeadlineExceeded):
+            call_with_deadline(time.sleep, 2, timeout=60)
+
+
+def test_cancellation_reaches_checks_in_the_run():
+    run = RunControl()
+    with run_control(run):
+        check_current_run()
+        run.cancel("client_disconnected")
+        with pytest.raises(RunCancelled) as excinfo:
+            check_current_run()
+    assert excinfo.value.reason == "client_disconnected"
+    check_current_run()
@@ -0,0 +1,82 @@
+import hashlib
+
+import pytest
+import requests
+
+from data import http_cache
+
+URL = "https://example.com/Advertising.csv"
+BODY = b"TV,radio,newspaper,sales\n230.1,37.8,69.2,22.1\n"
+
+
+class FakeServer:
+    """Answers like a server with an ETag, counting requests"""
+
+    def __init__(self):
+        self.requests = []
+        self.down = False
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        if self.down:
+            raise requests.ConnectionError("network is down")
+        response = requests.Response()
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            response._content = BODY
+            response.headers["ETag"] = '"v1"'
+        return response
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "DATA_CACHE_DIR", str(tmp_path))
+    fake = FakeServer()
+    monkeypatch.setattr(http_cache.requests, "get", fake.get)
+    return fake
+
+
+def test_cache_revalidates_and_works_offline(server):
+    assert http_cache.read_csv(URL)["sales"].tolist() == [22.1]
+    http_cache.fetch(URL)
+    assert len(server.requests) == 1  # fresh within the TTL
+
+    http_cache.fetch(URL, ttl=0)
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+
+    server.down = True
+    assert http_cache.read_csv(URL, ttl=0)["TV"].tolist() == [230.1]
+    assert http_cache.fetch(URL, offline=True)
+    with pytest.raises(http_cache.DatasetUnavailable):
+        http_cache.fetch("https://example.com/other.csv")
+
+
+def test_checksums_are_verified(server):
+    with pytest.raises(ValueError):
+        http_cache.fetch(URL, sha256="0" * 64)
+    path = http_cache.fetch(URL, sha256=hashlib.sha256(BODY).hexdigest())
+
+    # A corrupted copy is downloaded again
+    with open(path, "ab") as f:
+        f.write(b"garbage")
+    assert http_cache.cached_entry(URL) is None
+    http_cache.fetch(URL)
+    assert open(path, "rb").read() == BODY
+
+
+def test_unreadable_metadata_and_other_versions_are_cache_misses(server):
+    http_cache.fetch(URL)
+    meta = http_cache._paths(URL)[1]
+    with open(meta, "w") as f:
+        f.write("{not json")
+    assert http_cache.cached_entry(URL) is None
+    http_cache.fetch(URL)
+    assert len(server.requests) == 2 and http_cache.cached_entry(URL) is not None
+
+    # A fresh copy of another version is not returned for an expected checksum
+    with pytest.raises(ValueError):
+        http_cache.fetch(URL, sha256="0" * 64)
+    assert len(server.requests) == 3
+    assert "If-None-Match" not in server.requests[-1]
@@ -1,3 +1,5 @@
+import pytest
+
 from crew import create_ad_optimizer_crew
 
 
@@ -20,3 +22,165 @@ def test_crew_structure(sample_campaign_data):
     assert hasattr(crew, "tasks")
     assert crew.tasks is not None
     assert len(crew.tasks) > 0
+
+
+def test_agent_pool_reuses_agent_sets(sample_campaign_data):
+    """Agent sets are built once and handed back out after release."""
+    from crew import AgentPool
+
+    pool = AgentPool(size=2)
+    with pool.checkout() as first:
+        crew = create_ad_optimizer_crew(sample_campaign_data, agents=first)
+        assert crew.agents[0] is first["analytics"]
+    with pool.checkout() as second:
+        assert second is first
+
+    assert pool.created == 1
+
+
+def test_tasks_built_from_templates(sample_campaign_data):
+    from crew import create_agents
+    from tasks.ad_tasks import build_tasks
+
+    tasks = build_tasks(create_agents(), sample_campaign_data)
+
+    assert list(tasks) == ["analytics", "bid", "budget", "creative", "orchestration"]
+    assert f"Total campaigns: {len(sample_campaign_data)}" in tasks["analytics"].description
+
+
+def test_partition_campaigns_splits_large_groups():
+    from crew import partition_campaigns
+
+    campaigns = [{"campaign_id": i, "platform": "Google" if i < 5 else "Meta"} for i in range(8)]
+    partitions = partition_campaigns(campaigns, by="platform", max_partition_size=3)
+
+    assert list(partitions) == ["Google #1", "Google #2", "Meta"]
+    assert sum(len(rows) for rows in partitions.values()) == 8
+
+
+def test_map_reduce_runs_orchestrator_on_merged_findings(stub_agent_pool, sample_campaign_data):
+    from crew import run_map_reduce
+
+    campaigns = [dict(c, platform=p) for c in sample_campaign_data for p in ("Google", "Meta")]
+    result = run_map_reduce(campaigns, partition_by="platform")
+
+    assert "Synthesize all agent insights" in result.report
+    assert result.mode == "map_reduce"
+
+
+def test_map_reduce_builds_partition_fields_once_and_reports_tasks_run(
+        stub_agent_pool, sample_campaign_data, monkeypatch):
+    from crew import run_map_reduce
+    from tasks import ad_tasks
+
+    calls = {"segments": 0, "precedents": 0}
+
+    def counting(name, fn):
+        def wrapper(campaign_data):
+            calls[name] += 1
+            return fn(campaign_data)
+        return wrapper
+
+    monkeypatch.setattr(ad_tasks, "segment_summary", counting("segments", ad_tasks.segment_summary))
+    monkeypatch.setattr(ad_tasks, "precedent_summary", counting("precedents", ad_tasks.precedent_summary))
+    campaigns = [dict(c, platform=p) for c in sample_campaign_data for p in ("Google", "Meta")]
+    result = run_map_reduce(
+        campaigns, partition_by="platform", reuse={"analytics": "kept", "bid": "kept"}
+    )
+
+    # One set of fields per partition; precedents only for the orchestrator
+    assert calls == {"segments": 2, "precedents": 1}
+    assert result.tasks_run == ["budget", "creative", "orchestration"]
+    assert result.task_outputs["analytics"] == "kept"
+
+
+def test_incremental_run_reruns_after_changes_and_reuses_when_unchanged(stub_agent_pool, sample_campaign_data):
+    from crew import TASK_ORDER, run_ad_optimizer_crew
+
+    previous = {
+        "campaigns": sample_campaign_data,
+        "task_outputs": {key: f"previous {key}" for key in TASK_ORDER},
+        "report": "previous report",
+        "mode": "single",
+    }
+    updated = [dict(c) for c in sample_campaign_data]
+    updated[1]["cpa"] = 30.0
+
+    result = run_ad_optimizer_crew(updated, mode="single", previous=previous)
+
+    assert result.tasks_run == list(TASK_ORDER)
+    assert result.task_outputs["analytics"] != "previous analytics"
+    assert result.task_outputs["budget"] != "previous budget"
+
+    unchanged = run_ad_optimizer_crew(sample_campaign_data, mode="single", previous=previous)
+    assert unchanged.tasks_run == []
+    assert unchanged.report == "previous report"
+
+
+def test_model_override_applies_to_one_run(stub_agent_pool, sample_campaign_data, monkeypatch):
+    from agents import models
+    from crew import run_ad_optimizer_crew
+
+    with stub_agent_pool.checkout() as agents:
+        echo_llm_class = type(agents["bid"].llm)
+    monkeypatch.setitem(models._llm_cache, "stub-large", echo_llm_class(model="stub-large"))
+
+    result = run_ad_optimizer_crew(sample_campaign_data, mode="single", models={"bid": "stub-large"})
+    assert result.models["bid"] == "stub-large"
+    assert result.models["analytics"] == "stub"
+
+    with stub_agent_pool.checkout() as agents:
+        assert agents["bid"].llm.model == "stub"
+
+
+def test_model_override_validation(monkeypatch):
+    from agents.models import validate_overrides
+
+    monkeypatch.setenv("ALLOWED_MODELS", "gpt-4o-mini,gpt-4o")
+    validate_overrides({"orchestration": "gpt-4o"})
+    with pytest.raises(ValueError):
+        validate_overrides({"unknown": "gpt-4o"})
+    with pytest.raises(ValueError):
+        validate_overrides({"bid": "gpt-5"})
+
+
+def test_task_deadline_returns_partial_results(stub_agent_pool, sample_campaign_data):
+    import time
+
+    from agents.deadlines import RunControl
+    from crew import run_ad_optimizer_crew
+
+    with stub_agent_pool.checkout() as agents:
+        echo_llm_class = type(agents["bid"].llm)
+
+    class HangingLLM(echo_llm_class):
+        def call(self, messages, *args, **kwargs):
+            time.sleep(1.5)
+            return super().call(messages, *args, **kwargs)
+
+    with stub_agent_pool.checkout() as agents:
+        agents["bid"].llm = HangingLLM(model="stub")
+        hanging_agent = agents["bid"]
+
+    result = run_ad_optimizer_crew(
+        sample_campaign_data, mode="single", control=RunControl(30, task_timeout=0.5)
+    )
+    assert result.timed_out == ["bid"]
+    assert "bid" not in result.task_outputs
+    assert "Synthesize all agent insights" in result.report
+
+    # The set the hung task ran on is retired rather than reused
+    with stub_agent_pool.checkout() as agents:
+        assert agents["bid"] is not hanging_agent
+
+
+def test_cancelled_run_skips_remaining_tasks(stub_agent_pool, sample_campaign_data):
+    from agents.deadlines import RunControl
+    from crew import TASK_ORDER, run_ad_optimizer_crew
+
+    control = RunControl(30)
+    control.cancel("client_disconnected")
+    result = run_ad_optimizer_crew(sample_campaign_data, mode="single", control=control)
+
+    assert result.timed_out == list(TASK_ORDER)
+    assert result.report.startswith("Partial results")
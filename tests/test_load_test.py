@@ -0,0 +1,14 @@
+from benchmarks.load_test import make_campaigns, percentile, summarize_latencies
+
+
+def test_percentiles_use_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) is None
+    assert summarize_latencies([0.2, 0.1])["max"] == 0.2
+
+
+def test_payloads_are_deterministic():
+    assert make_campaigns(20) == make_campaigns(20)
+    assert len({c["platform"] for c in make_campaigns(8)}) == 4
@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+import agents.rate_limiter as rl
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = rl.LLMRateLimiter(rpm=60, tpm=100000, breaker_threshold=2, breaker_cooldown=60)
+    monkeypatch.setattr(rl, "_limiter", limiter)
+    return limiter
+
+
+def test_interactive_calls_go_ahead_of_batch(limiter):
+    limiter.requests.level = 0  # empty bucket: one request per second
+    order = []
+
+    def call(priority):
+        limiter.acquire(priority=priority)
+        order.append(priority)
+
+    batch = threading.Thread(target=call, args=("batch",))
+    batch.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=call, args=("interactive",))
+    interactive.start()
+    batch.join(5)
+    interactive.join(5)
+
+    assert order == ["interactive", "batch"]
+
+
+def test_rate_limit_errors_are_retried(limiter, monkeypatch):
+    monkeypatch.setattr(rl.time, "sleep", lambda s: None)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError("slow down")
+        return "ok"
+
+    assert rl.call_with_retries(flaky, backoff_base=0.01) == "ok"
+    assert len(attempts) == 3
+
+
+def test_breaker_opens_after_repeated_failures(limiter, monkeypatch):
+    monkeypatch.setattr(rl.time, "sleep", lambda s: None)
+
+    class ServiceUnavailable(Exception):
+        status_code = 503
+
+    def down():
+        raise ServiceUnavailable("down")
+
+    with pytest.raises(rl.CircuitOpenError):
+        rl.call_with_retries(down, max_retries=5)
+    with pytest.raises(rl.CircuitOpenError):
+        limiter.acquire()
+
+
+class SlowDown(RateLimitError):
+    def __init__(self, retry_after):
+        super().__init__("slow down")
+        self.response = type("Response", (), {"headers": {"retry-after": str(retry_after)}})()
+
+
+def test_retry_after_is_capped_by_backoff_max_and_the_run_deadline(limiter, monkeypatch):
+    from agents.deadlines import RunControl, run_control
+
+    sleeps = []
+    monkeypatch.setattr(rl.time, "sleep", sleeps.append)
+    answers = [SlowDown(600), SlowDown(600), "ok"]
+
+    def call():
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    assert rl.call_with_retries(call, backoff_max=30) == "ok"
+    assert sleeps == [30, 30]
+
+    sleeps.clear()
+    answers[:] = [SlowDown(600), "ok"]
+    with run_control(RunControl(5)):
+        assert rl.call_with_retries(call, backoff_max=30) == "ok"
+    assert 4 < sleeps[0] <= 5
+
+
+def test_retries_repeat_one_llm_call_not_the_task(limiter, monkeypatch):
+    monkeypatch.setattr(rl.time, "sleep", lambda s: None)
+
+    class FlakyLLM:
+        def __init__(self):
+            self.calls = []
+
+        def call(self, messages):
+            self.calls.append(messages)
+            if len(self.calls) == 2:
+                raise RateLimitError("slow down")
+            return f"answer to {messages}"
+
+    llm = FlakyLLM()
+    assert rl.retry_llm_calls(rl.retry_llm_calls(llm)) is llm
+    assert [llm.call("first"), llm.call("second")] == ["answer to first", "answer to second"]
+    assert llm.calls == ["first", "second", "second"]
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.response_curves import fit_response_curves, projection_summary
+
+
+def _daily_rows(campaigns, days=30):
+    rng = np.random.default_rng(0)
+    scale = rng.uniform(50, 500, campaigns)
+    half = rng.uniform(500, 5000, campaigns)
+    ids = np.repeat(np.arange(campaigns), days)
+    spend = rng.uniform(100, 20000, campaigns * days)
+    conversions = scale[ids] * np.log1p(spend / half[ids]) * rng.normal(1, 0.02, len(ids))
+    df = pd.DataFrame({"campaign_id": ids, "spend": spend, "conversions": conversions})
+    return df, scale, half
+
+
+def test_fits_every_campaign_in_one_batch():
+    df, scale, half = _daily_rows(2000)
+    curves = fit_response_curves(df, model="log")
+
+    assert curves.by == "campaign_id" and len(curves.params) == 2000
+    assert curves.params["r2"].median() > 0.95
+    # Half-saturation is recovered to within the grid resolution
+    error = np.abs(curves.params["half_saturation"].to_numpy() / half - 1)
+    assert np.median(error) < 0.2
+
+
+def test_projection_shows_diminishing_returns():
+    df, _, _ = _daily_rows(50)
+    curves = fit_response_curves(df)
+    current = df.groupby("campaign_id", as_index=False)[["spend", "conversions"]].mean()
+
+    up = curves.project(current, 0.2)
+    down = curves.project(current, -0.2)
+    assert (up["projected_conversions"] > up["conversions"]).all()
+    assert (down["projected_conversions"] < down["conversions"]).all()
+    # Each extra dollar buys fewer conversions than the last one saved
+    assert (up["marginal_cpa"] > down["marginal_cpa"]).all()
+
+
+def test_small_groups_fall_back_to_pooled_curve(sample_campaign_data):
+    rows = [{**c, "platform": "Google"} for c in sample_campaign_data * 3]
+    rows.append({"campaign_id": 99, "spend": 10.0, "conversions": 90, "platform": "Meta"})
+    curves = fit_response_curves(rows, by="platform")
+
+    assert list(curves.params.index) == ["Google"]
+    predicted = curves.predict([1000.0], ["Meta"])
+    pooled = fit_response_curves(rows, by=None).predict([1000.0])
+    assert predicted[0] == pytest.approx(pooled[0])
+
+    assert "ROI" in projection_summary(sample_campaign_data)
+    assert projection_summary([{"campaign_id": 1}]).startswith("Not available")
+
+
+def test_forecast_endpoint(test_client, sample_campaign_data):
+    response = test_client.post(
+        "/v1/forecast", json={"campaigns": sample_campaign_data, "spend_change": 0.1}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["projections"]) == len(sample_campaign_data)
+    assert body["total"]["new_spend"] == pytest.approx(body["total"]["spend"] * 1.1)
+
+    missing = test_client.post("/v1/forecast", json={"campaigns": [{"campaign_id": 1}]})
+    assert missing.status_code == 400
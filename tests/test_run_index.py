@@ -0,0 +1,66 @@
+import json
+
+import runs.index as run_index
+from runs.index import RunIndex, run_vector
+
+
+def _scaled(campaigns, factor):
+    return [{**c, "spend": c["spend"] * factor, "conversions": c["conversions"] * factor}
+            for c in campaigns]
+
+
+def test_nearest_ranks_by_metric_similarity(tmp_path, sample_campaign_data):
+    index = RunIndex(str(tmp_path / "runs.jsonl"))
+    for factor in (0.5, 1.02, 3.0):
+        index.add(f"x{factor}", _scaled(sample_campaign_data, factor), f"report {factor}", "acme")
+
+    matches = index.nearest(sample_campaign_data, k=2, account_id="acme")
+    assert [entry["run_id"] for entry, _, _ in matches] == ["x1.02", "x0.5"]
+    assert index.reusable(sample_campaign_data, account_id="acme")["run_id"] == "x1.02"
+    assert index.reusable(_scaled(sample_campaign_data, 1.5), account_id="acme") is None
+
+    # The index survives a restart
+    assert len(RunIndex(str(tmp_path / "runs.jsonl"))) == 3
+    assert len(run_vector(sample_campaign_data)) == len(run_index.FEATURE_NAMES)
+
+
+def test_runs_are_only_reused_within_their_account(tmp_path, sample_campaign_data):
+    index = RunIndex(str(tmp_path / "runs.jsonl"))
+    index.add("acme-run", sample_campaign_data, "acme report", "acme")
+    renamed = [{**c, "campaign_id": f"other_{c['campaign_id']}"} for c in sample_campaign_data]
+
+    # Identical KPIs, but another account, no account, or other campaigns
+    assert index.reusable(sample_campaign_data, account_id="globex") is None
+    assert index.reusable(sample_campaign_data) is None
+    assert index.reusable(renamed, account_id="acme") is None
+    assert index.reusable(sample_campaign_data, account_id="acme")["run_id"] == "acme-run"
+
+
+def test_index_file_is_compacted(tmp_path, monkeypatch, sample_campaign_data):
+    monkeypatch.setattr(run_index, "RUN_INDEX_MAX_ENTRIES", 3)
+    path = tmp_path / "runs.jsonl"
+    index = RunIndex(str(path))
+    for i in range(7):
+        index.add(f"run{i}", sample_campaign_data, f"report {i}", "acme")
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["run_id"] for line in lines] == ["run4", "run5", "run6"]
+    assert len(RunIndex(str(path))) == 3
+
+
+def test_optimize_reuses_close_enough_run(test_client, tmp_path, monkeypatch, sample_campaign_data):
+    index = RunIndex(str(tmp_path / "runs.jsonl"))
+    index.add("earlier", sample_campaign_data, "earlier report", "acme")
+    index.add("foreign", sample_campaign_data, "foreign report", "globex")
+    monkeypatch.setattr(run_index, "_run_index", index)
+
+    body = test_client.post(
+        "/v1/optimize",
+        json={"campaigns": sample_campaign_data, "account_id": "acme", "reuse_similar": True},
+    ).json()
+    assert body["status"] == "reused" and body["reused_from"] == "earlier"
+    assert body["report"] == "earlier report"
+
+    precedents = run_index.precedent_summary(sample_campaign_data, account_id="acme")
+    assert "earlier report" in precedents and "foreign report" not in precedents
+    assert run_index.precedent_summary(sample_campaign_data) == "None available."
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.segments import segment_campaigns, segment_summary
+
+
+def _ads(n, seed=0):
+    rng = np.random.default_rng(seed)
+    impressions = rng.integers(100, 50000, n)
+    clicks = rng.binomial(impressions, 0.0002)
+    return pd.DataFrame({
+        "ad_id": np.arange(n),
+        "impressions": impressions,
+        "clicks": clicks,
+        "spend": clicks * rng.uniform(1.0, 2.0, n),
+        "conversions": rng.poisson(1.0, n),
+        "age": rng.choice(["30-34", "35-39", "45-49"], n),
+        "gender": rng.choice(["M", "F"], n),
+    })
+
+
+def test_segments_cover_every_campaign():
+    df = _ads(2000)
+    result = segment_campaigns(df, k=6)
+
+    assert len(result.labels) == len(df)
+    assert result.segments["campaigns"].sum() == len(df)
+    assert result.segments["spend"].sum() == pytest.approx(df["spend"].sum())
+    # S1 is the biggest spender, and exemplars are real campaign ids
+    assert list(result.segments["segment"]) == list(range(1, len(result.segments) + 1))
+    assert result.segments["spend"].is_monotonic_decreasing
+    assert set(result.segments["exemplars"].sum()) <= set(df["ad_id"].astype(str))
+
+
+def test_prompt_size_does_not_grow_with_account():
+    small = segment_summary(_ads(200).to_dict("records"), k=8)
+    large = segment_summary(_ads(20000).to_dict("records"), k=8)
+
+    assert len(small.splitlines()) == len(large.splitlines()) == 8
+    assert len(large) < 2 * len(small)
+    assert segment_summary(_ads(200).to_dict("records"), k=8) == small
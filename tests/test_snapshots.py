@@ -0,0 +1,76 @@
+import runs.snapshots as snapshots
+from crew import tasks_to_rerun
+
+
+def test_diff_ignores_changes_below_tolerance(sample_campaign_data):
+    updated = [dict(c) for c in sample_campaign_data]
+    updated[0]["spend"] *= 1.01
+
+    changes = snapshots.diff_campaigns(sample_campaign_data, updated, tolerance=0.05)
+
+    assert changes == {"added": [], "removed": [], "changed": {}, "totals_changed": []}
+    assert tasks_to_rerun(changes) == []
+
+
+def test_any_campaign_change_reruns_analytics_and_everything_after_it(sample_campaign_data):
+    updated = [dict(c) for c in sample_campaign_data]
+    updated[0]["cpa"] = 40.0
+
+    changes = snapshots.diff_campaigns(sample_campaign_data, updated, tolerance=0.05)
+
+    assert changes["changed"] == {"1": ["cpa"]}
+    assert tasks_to_rerun(changes) == ["analytics", "bid", "budget", "creative", "orchestration"]
+
+
+def test_unmapped_field_change_is_not_ignored(sample_campaign_data):
+    old = [dict(c, age="25-34") for c in sample_campaign_data]
+    updated = [dict(c) for c in old]
+    updated[0]["age"] = "45-54"
+
+    changes = snapshots.diff_campaigns(old, updated)
+
+    assert changes["changed"] == {"1": ["age"]}
+    assert tasks_to_rerun(changes) == ["analytics", "bid", "budget", "creative", "orchestration"]
+
+
+def test_conversions_moved_between_campaigns_rerun_analytics(sample_campaign_data):
+    old = [dict(c, conversions=10) for c in sample_campaign_data]
+    updated = [dict(old[0], conversions=2), dict(old[1], conversions=18)]
+
+    changes = snapshots.diff_campaigns(old, updated)
+
+    assert changes["totals_changed"] == []
+    assert tasks_to_rerun(changes)[0] == "analytics"
+
+
+def test_new_campaign_reruns_everything(sample_campaign_data):
+    changes = snapshots.diff_campaigns(sample_campaign_data[:1], sample_campaign_data)
+
+    assert changes["added"] == ["2"]
+    assert tasks_to_rerun(changes) == ["analytics", "bid", "budget", "creative", "orchestration"]
+
+
+def test_latest_snapshot_round_trip(tmp_path, monkeypatch, sample_campaign_data):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    assert snapshots.load_latest_snapshot("acme") is None
+
+    snapshots.save_snapshot("acme", sample_campaign_data, {"orchestration": "old"}, "old")
+    snapshots.save_snapshot("acme", sample_campaign_data, {"orchestration": "new"}, "new")
+
+    assert snapshots.load_latest_snapshot("acme")["report"] == "new"
+
+
+def test_rows_sharing_a_campaign_key_are_all_compared():
+    old = [
+        {"campaign_id": "c1", "platform": "Google", "spend": 100.0},
+        {"campaign_id": "c1", "platform": "Meta", "spend": 100.0},
+    ]
+    updated = [dict(old[0]), dict(old[1], spend=300.0)]
+
+    changes = snapshots.diff_campaigns(old, updated)
+    assert changes["changed"] == {"c1#2": ["spend"]}
+    assert changes["totals_changed"] == ["spend"]
+
+    changes = snapshots.diff_campaigns(old, old + [dict(old[0])])
+    assert changes["added"] == ["c1#3"]
+    assert tasks_to_rerun(changes) == ["analytics", "bid", "budget", "creative", "orchestration"]
@@ -0,0 +1,21 @@
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def test_api_import_does_not_load_crewai():
+    """Importing the API must not pull in crewai; it is loaded during warm-up."""
+    code = "import sys, api.app; print('crewai' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_warm_up_loads_crew_machinery():
+    import crew
+
+    assert crew.warm_up() >= 0
+    assert "crewai" in sys.modules
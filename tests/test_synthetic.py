@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from data import synthetic
+
+
+def test_synthetic_data_matches_kag_distributions():
+    kag = pd.read_csv(synthetic.KAG_PATH)
+    df = pd.concat(synthetic.generate(100_000, seed=1, chunk_size=30_000))
+
+    assert list(df.columns) == list(kag.columns)
+    assert len(df) == 100_000 and df["ad_id"].is_unique
+    shares = df["age"].value_counts(normalize=True)
+    for age, share in kag["age"].value_counts(normalize=True).items():
+        assert shares[age] == pytest.approx(share, abs=0.01)
+    ctr = df["Clicks"].sum() / df["Impressions"].sum()
+    assert ctr == pytest.approx(kag["Clicks"].sum() / kag["Impressions"].sum(), rel=0.2)
+    assert df["Total_Conversion"].median() == pytest.approx(kag["Total_Conversion"].median(), abs=1)
+    assert (df["Spent"][df["Clicks"] == 0] == 0).all()
+
+
+@pytest.mark.parametrize("name", ["synthetic.csv", "synthetic.parquet"])
+def test_datasets_are_written_in_chunks_reproducibly(tmp_path, name):
+    if name.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+    path = synthetic.write_dataset(str(tmp_path / name), 2_500, seed=7, chunk_size=1_000)
+    df = pd.read_parquet(path) if name.endswith(".parquet") else pd.read_csv(path)
+    expected = pd.concat(synthetic.generate(2_500, seed=7, chunk_size=1_000), ignore_index=True)
+    pd.testing.assert_frame_equal(df, expected)
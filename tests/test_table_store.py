@@ -0,0 +1,49 @@
+import pandas as pd
+
+from ui.table_store import ROW_ID, CampaignStore
+
+
+def _store(n=120):
+    return CampaignStore(pd.DataFrame({
+        "campaign_id": range(n),
+        "spend": [float((i * 37) % 101) for i in range(n)],
+        "platform": ["Google" if i % 3 else "Meta" for i in range(n)],
+    }))
+
+
+def test_pages_are_filtered_and_sorted_server_side():
+    store = _store()
+    page, number, pages, total = store.page(2, 10, platform="Meta", sort_by="spend", descending=True)
+
+    assert total == 40 and pages == 4 and number == 2
+    assert len(page) == 10 and set(page["platform"]) == {"Meta"}
+    assert page["spend"].is_monotonic_decreasing
+
+    # Out-of-range pages clamp to the last one
+    assert store.page(99, 50)[1] == 3
+
+
+def test_page_edits_are_written_back():
+    store = _store(10)
+    page = store.page(1, 5)[0]
+    page.loc[page.index[0], "spend"] = 999.0
+    new_row = pd.DataFrame([{ROW_ID: None, "campaign_id": 10, "spend": 1.0, "platform": "Meta"}])
+
+    assert store.apply_edits(pd.concat([page, new_row])) == 6
+    assert len(store) == 11
+    assert store.page(1, 1, sort_by="spend", descending=True)[0]["spend"].iloc[0] == 999.0
+    assert store.page(1, 5, search="meta")[3] == 5
+
+
+def test_rows_removed_from_a_page_are_deleted():
+    store = _store(10)
+    query = {"platform": "Meta", "sort_by": "spend"}
+    page = store.page(1, 3, **query)[0]
+    shown = page[ROW_ID]
+    removed = page["campaign_id"].iloc[1]
+
+    assert store.apply_edits(page.drop(page.index[1]), shown_rows=shown) == 3
+    assert len(store) == 9
+    assert removed not in set(store.to_frame()["campaign_id"])
+    # Rows on other pages are untouched
+    assert store.page(1, 10, platform="Google")[3] == 6
@@ -0,0 +1,43 @@
+import json
+
+from tasks.schemas import compact_output, parse_output
+
+OUTPUTS = {
+    "analytics": {"total_ctr": 2.1, "average_cpc": 1.4, "total_conversions": 120, "total_spend": 5000,
+                  "top_campaigns": ["C1"], "bottom_campaigns": ["C3"], "insights": ["Shift to Google"]},
+    "bid": {"changes": [{"campaign_id": "C1", "change_pct": 15, "risk": "low", "rationale": "CTR 4%"}]},
+    "budget": {"moves": [{"from_campaign": "C3", "to_campaign": "C1", "amount": 500}]},
+    "creative": {"ab_tests": [{"campaign_id": "C3", "hypothesis": "Clearer CTA", "variant": "CTA"}]},
+    "orchestration": {"key_findings": ["C1 is underfunded"], "expected_impact": "+12% ROI",
+                      "actions": [{"priority": 1, "title": "Move $500 to C1", "horizon": "quick_win",
+                                   "expected_impact": "+8% ROI"}]},
+}
+
+
+def test_outputs_are_validated_from_fenced_or_embedded_json():
+    raw = "Here you go:\n```json\n" + json.dumps(OUTPUTS["bid"], indent=2) + "\n```"
+    assert parse_output("bid", raw).changes[0].change_pct == 15
+    assert parse_output("bid", '{"changes": [{"campaign_id": "C1", "change_pct": -150}]}') is None
+    assert parse_output("bid", "Raise bids on C1 by 15%") is None
+    assert compact_output("bid", "Raise bids on C1 by 15%") == "Raise bids on C1 by 15%"
+
+
+def test_orchestrator_gets_compact_results_and_report_is_rendered(
+        stub_agent_pool, sample_campaign_data, monkeypatch):
+    import crew
+
+    contexts = {}
+
+    def execute(key, agent, task, context="", tools=None):
+        contexts[key] = context
+        return "```json\n" + json.dumps(OUTPUTS[key], indent=2) + "\n```"
+
+    monkeypatch.setattr(crew, "_execute_task", execute)
+    result = crew.run_ad_optimizer_crew(sample_campaign_data, mode="single")
+
+    assert compact_output("bid", result.task_outputs["bid"]) in contexts["orchestration"]
+    assert "\n" not in compact_output("bid", result.task_outputs["bid"])
+    assert set(result.structured) == set(crew.TASK_ORDER)
+    assert result.structured["budget"]["moves"][0]["amount"] == 500
+    assert result.report.startswith("# Campaign Optimization Strategy")
+    assert "- Move $500 to C1" in result.report
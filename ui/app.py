@@ -1,12 +1,24 @@
 import json
 import os
-import requests
+import sys
+from pathlib import Path
+
 import pandas as pd
 import gradio as gr
-import matplotlib.pyplot as plt
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from client import OptimizerClient, OptimizerAPIError
+from ui.charts import plot_cpa, plot_ctr, plot_spend_vs_conversions
+from ui.table_store import ALL_PLATFORMS, DEFAULT_PAGE_SIZE, PAGE_SIZES, ROW_ID, CampaignStore
 
 API_URL = os.getenv("API_URL", "http://127.0.0.1:8000/v1/optimize")
 TIMEOUT_S = int(os.getenv("OPTIMIZE_TIMEOUT", "300"))
+# Larger accounts are paged server-side; these bound what reaches the browser
+JSON_SYNC_LIMIT = int(os.getenv("UI_JSON_SYNC_LIMIT", "1000"))
+METRICS_TABLE_ROWS = int(os.getenv("UI_METRICS_TABLE_ROWS", "500"))
+
+client = OptimizerClient(API_URL, timeout=TIMEOUT_S)
 
 DEFAULT_HEADERS = ["campaign_id", "spend", "conversions", "impressions", "clicks", "platform"]
 
@@ -50,48 +62,6 @@ def _compute_metrics(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def _plot_spend_vs_conversions(df: pd.DataFrame):
-    fig = plt.figure()
-    ax = fig.add_subplot(111)
-    x = df["spend"].fillna(0)
-    y = df["conversions"].fillna(0)
-    labels = df["campaign_id"].astype(str)
-    ax.scatter(x, y)
-    for i, txt in enumerate(labels):
-        ax.annotate(txt, (x.iloc[i], y.iloc[i]))
-    ax.set_xlabel("Spend")
-    ax.set_ylabel("Conversions")
-    ax.set_title("Spend vs Conversions (by campaign)")
-    ax.grid(True, alpha=0.2)
-    return fig
-
-
-def _plot_ctr(df: pd.DataFrame):
-    fig = plt.figure()
-    ax = fig.add_subplot(111)
-    vals = df["ctr"].fillna(0)
-    labels = df["campaign_id"].astype(str)
-    ax.bar(labels, vals)
-    ax.set_xlabel("Campaign ID")
-    ax.set_ylabel("CTR")
-    ax.set_title("CTR by Campaign")
-    ax.grid(True, axis="y", alpha=0.2)
-    return fig
-
-
-def _plot_cpa(df: pd.DataFrame):
-    fig = plt.figure()
-    ax = fig.add_subplot(111)
-    vals = df["cpa"].fillna(0)
-    labels = df["campaign_id"].astype(str)
-    ax.bar(labels, vals)
-    ax.set_xlabel("Campaign ID")
-    ax.set_ylabel("CPA")
-    ax.set_title("CPA by Campaign")
-    ax.grid(True, axis="y", alpha=0.2)
-    return fig
-
-
 def _make_curl(space_base_url: str, payload: dict) -> str:
     base = space_base_url.rstrip("/")
     url = f"{base}/v1/optimize"
@@ -102,41 +72,96 @@ def _make_curl(space_base_url: str, payload: dict) -> str:
     )
 
 
+def _new_store(campaigns) -> CampaignStore:
+    return CampaignStore(_normalize_df(pd.DataFrame(campaigns)))
+
+
+def _page_view(store: CampaignStore, search, platform, sort_by, descending, page, page_size):
+    df, page, pages, total = store.page(
+        page or 1,
+        int(page_size or DEFAULT_PAGE_SIZE),
+        search=search,
+        platform=platform,
+        sort_by=sort_by or None,
+        descending=descending,
+    )
+    info = f"Page {page} of {pages} · {total:,} of {len(store):,} campaigns"
+    return df, page, info
+
+
+def _store_loaded(store: CampaignStore):
+    table, page, info = _page_view(store, "", ALL_PLATFORMS, None, False, 1, DEFAULT_PAGE_SIZE)
+    platforms = gr.update(choices=[ALL_PLATFORMS] + store.platforms(), value=ALL_PLATFORMS)
+    return store, table, page, info, "", platforms
+
+
+def show_page(store, search, platform, sort_by, descending, page, page_size):
+    table, page, info = _page_view(store, search, platform, sort_by, descending, page, page_size)
+    return table, page, info
+
+
+def first_page(store, search, platform, sort_by, descending, page, page_size):
+    return show_page(store, search, platform, sort_by, descending, 1, page_size)
+
+
+def previous_page(store, search, platform, sort_by, descending, page, page_size):
+    return show_page(store, search, platform, sort_by, descending, (page or 1) - 1, page_size)
+
+
+def next_page(store, search, platform, sort_by, descending, page, page_size):
+    return show_page(store, search, platform, sort_by, descending, (page or 1) + 1, page_size)
+
+
+def save_page(store, table, search, platform, sort_by, descending, page, page_size):
+    # The page as served, to tell which rows were deleted in the browser
+    shown = _page_view(store, search, platform, sort_by, descending, page, page_size)[0]
+    changed = store.apply_edits(table, shown_rows=shown[ROW_ID])
+    page_table, page, info = _page_view(store, search, platform, sort_by, descending, page, page_size)
+    return store, page_table, page, info, f"💾 Saved {changed} row(s)."
+
+
 def load_example(name: str):
     campaigns = EXAMPLES[name]
-    df = _normalize_df(pd.DataFrame(campaigns))
     json_text = json.dumps({"campaigns": campaigns}, indent=2)
-    return df, json_text
+    return (*_store_loaded(_new_store(campaigns)), json_text)
 
 
-def table_to_json(table: pd.DataFrame):
-    if table is None or len(table) == 0:
-        return json.dumps({"campaigns": []}, indent=2)
-    df = _normalize_df(table)
-    payload = {"campaigns": df.fillna("").to_dict(orient="records")}
-    return json.dumps(payload, indent=2)
+def load_csv(file):
+    if file is None:
+        return _store_loaded(CampaignStore(_normalize_df(pd.DataFrame())))
+    path = file if isinstance(file, str) else file.name
+    return _store_loaded(CampaignStore(_normalize_df(pd.read_csv(path))))
+
+
+def table_to_json(store: CampaignStore):
+    if store is None or len(store) == 0:
+        return json.dumps({"campaigns": []}, indent=2), ""
+    payload = {"campaigns": store.records(limit=JSON_SYNC_LIMIT)}
+    note = ""
+    if len(store) > JSON_SYNC_LIMIT:
+        note = (f"⚠️ JSON shows the first {JSON_SYNC_LIMIT:,} of {len(store):,} campaigns; "
+                "use **Optimize Table** to send them all.")
+    return json.dumps(payload, indent=2), note
 
 
 def json_to_table(json_text: str):
     obj = json.loads(json_text)
     campaigns = obj.get("campaigns", [])
-    df = _normalize_df(pd.DataFrame(campaigns))
-    return df
+    return _store_loaded(_new_store(campaigns))
 
 
 def optimize_from_payload(payload: dict, space_url: str, df_for_charts: pd.DataFrame):
     # Call backend
     try:
-        r = requests.post(API_URL, json=payload, timeout=TIMEOUT_S)
-        if r.status_code != 200:
-            return (
-                f"❌ API error {r.status_code}:\n{r.text}",
-                None, None, None,
-                pd.DataFrame(),
-                {},
-                _make_curl(space_url, payload)
-            )
-        result = r.json()
+        result = client.optimize(payload["campaigns"])
+    except OptimizerAPIError as e:
+        return (
+            f"❌ API error {e.status_code}:\n{e.text}",
+            None, None, None,
+            pd.DataFrame(),
+            {},
+            _make_curl(space_url, payload)
+        )
     except Exception as e:
         return (
             f"❌ Failed to call backend: {e}",
@@ -162,27 +187,32 @@ def optimize_from_payload(payload: dict, space_url: str, df_for_charts: pd.DataF
 
     metrics_df = _compute_metrics(df_for_charts)
 
-    spend_conv_fig = _plot_spend_vs_conversions(metrics_df)
-    ctr_fig = _plot_ctr(metrics_df)
-    cpa_fig = _plot_cpa(metrics_df)
+    spend_conv_fig = plot_spend_vs_conversions(metrics_df)
+    ctr_fig = plot_ctr(metrics_df)
+    cpa_fig = plot_cpa(metrics_df)
+
+    # The browser gets the biggest spenders, not every campaign
+    metrics_view = metrics_df[DEFAULT_HEADERS + ["ctr", "cpc", "cpa"]]
+    if len(metrics_view) > METRICS_TABLE_ROWS:
+        metrics_view = metrics_view.nlargest(METRICS_TABLE_ROWS, "spend")
 
     return (
         report_md,
         spend_conv_fig,
         ctr_fig,
         cpa_fig,
-        metrics_df[DEFAULT_HEADERS + ["ctr", "cpc", "cpa"]],
+        metrics_view,
         result,
-        _make_curl(space_url, payload)
+        _make_curl(space_url, {"campaigns": payload["campaigns"][:JSON_SYNC_LIMIT]})
     )
 
 
-def optimize_table(table: pd.DataFrame, space_url: str):
-    if table is None or len(table) == 0:
+def optimize_table(store: CampaignStore, space_url: str):
+    if store is None or len(store) == 0:
         return "❌ Add at least 1 campaign row.", None, None, None, pd.DataFrame(), {}, ""
 
-    df = _normalize_df(table)
-    payload = {"campaigns": df.fillna("").to_dict(orient="records")}
+    df = _normalize_df(store.to_frame())
+    payload = {"campaigns": store.records()}
     return optimize_from_payload(payload, space_url, df)
 
 
@@ -221,13 +251,33 @@ with gr.Blocks(title="Multi-Agent Ad Campaign Optimizer") as demo:
 
     with gr.Tabs():
         with gr.Tab("✅ Table Input"):
+            # The full table lives server-side; the browser holds one page
+            store_state = gr.State(CampaignStore(_normalize_df(pd.DataFrame())))
+            with gr.Row():
+                search_box = gr.Textbox(label="Search", placeholder="campaign id, platform, ...")
+                platform_filter = gr.Dropdown(
+                    choices=[ALL_PLATFORMS], value=ALL_PLATFORMS, label="Platform"
+                )
+                sort_by = gr.Dropdown(choices=[""] + DEFAULT_HEADERS, value="", label="Sort by")
+                descending = gr.Checkbox(label="Descending", value=False)
+                page_size = gr.Dropdown(choices=PAGE_SIZES, value=DEFAULT_PAGE_SIZE, label="Rows per page")
             campaign_table = gr.Dataframe(
-                headers=DEFAULT_HEADERS,
-                datatype=["number", "number", "number", "number", "number", "str"],
-                label="Campaign Data (Editable Table)",
+                headers=[ROW_ID] + DEFAULT_HEADERS,
+                datatype=["number", "number", "number", "number", "number", "number", "str"],
+                label="Campaign Data (Editable Table, leave 'row' empty for new campaigns)",
                 interactive=True,
             )
-            sync_to_json_btn = gr.Button("↔️ Update JSON from Table")
+            with gr.Row():
+                prev_btn = gr.Button("◀ Previous")
+                page_number = gr.Number(value=1, precision=0, label="Page")
+                next_btn = gr.Button("Next ▶")
+                page_info = gr.Markdown()
+            with gr.Row():
+                save_page_btn = gr.Button("💾 Save Page Edits")
+                sync_to_json_btn = gr.Button("↔️ Update JSON from Table")
+                optimize_table_btn = gr.Button("🚀 Optimize Table", variant="primary")
+            csv_upload = gr.File(label="Load campaigns from CSV", file_types=[".csv"])
+            table_status = gr.Markdown()
 
         with gr.Tab("🧾 JSON Input (paste multiple campaigns)"):
             campaign_json = gr.Code(
@@ -253,12 +303,29 @@ with gr.Blocks(title="Multi-Agent Ad Campaign Optimizer") as demo:
         with gr.Tab("API Call (curl)"):
             curl_box = gr.Code(label="Copy-paste curl", language="shell")
 
+    query_inputs = [store_state, search_box, platform_filter, sort_by, descending, page_number, page_size]
+    page_outputs = [campaign_table, page_number, page_info]
+    loaded_outputs = [store_state, campaign_table, page_number, page_info, table_status, platform_filter]
+
     # Example loads both
-    example_select.change(load_example, inputs=example_select, outputs=[campaign_table, campaign_json])
+    example_select.change(load_example, inputs=example_select, outputs=loaded_outputs + [campaign_json])
+    csv_upload.change(load_csv, inputs=csv_upload, outputs=loaded_outputs)
+
+    # Paging, sorting and filtering run server-side
+    for control in (search_box, platform_filter, sort_by, descending, page_size):
+        control.change(first_page, inputs=query_inputs, outputs=page_outputs)
+    page_number.submit(show_page, inputs=query_inputs, outputs=page_outputs)
+    prev_btn.click(previous_page, inputs=query_inputs, outputs=page_outputs)
+    next_btn.click(next_page, inputs=query_inputs, outputs=page_outputs)
+    save_page_btn.click(
+        save_page,
+        inputs=[store_state, campaign_table] + query_inputs[1:],
+        outputs=[store_state] + page_outputs + [table_status],
+    )
 
     # Sync buttons
-    sync_to_json_btn.click(table_to_json, inputs=campaign_table, outputs=campaign_json)
-    sync_to_table_btn.click(json_to_table, inputs=campaign_json, outputs=campaign_table)
+    sync_to_json_btn.click(table_to_json, inputs=store_state, outputs=[campaign_json, table_status])
+    sync_to_table_btn.click(json_to_table, inputs=campaign_json, outputs=loaded_outputs)
 
     # Optimize: uses JSON tab content (always accurate for multi-campaign),
     # but keeps table in sync so charts/metrics work.
@@ -267,5 +334,10 @@ with gr.Blocks(title="Multi-Agent Ad Campaign Optimizer") as demo:
         inputs=[campaign_json, space_url],
         outputs=[report, spend_conv, ctr_plot, cpa_plot, metrics_table, raw_json, curl_box],
     )
+    optimize_table_btn.click(
+        fn=optimize_table,
+        inputs=[store_state, space_url],
+        outputs=[report, spend_conv, ctr_plot, cpa_plot, metrics_table, raw_json, curl_box],
+    )
 
 demo.launch(server_name="0.0.0.0", server_port=7860)
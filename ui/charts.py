@@ -0,0 +1,150 @@
+"""
+Chart rendering for the Gradio UI
+
+Figures are built with matplotlib's object API (``Figure``), not pyplot, so
+they are never registered with pyplot's global figure manager and are freed
+once Gradio is done with them. Render cost is bounded regardless of account
+size: bar charts show the top campaigns by spend plus one "Other" bar,
+scatter plots switch to a hexbin density above SCATTER_POINT_LIMIT points,
+and only the largest campaigns are labelled. Renders are cached by a hash of
+the data they depend on.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+CHART_TOP_N = int(os.getenv("CHART_TOP_N", "20"))
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "32"))
+SCATTER_POINT_LIMIT = int(os.getenv("SCATTER_POINT_LIMIT", "2000"))
+# Above this, the hexbin is computed from a fixed random sample
+HEXBIN_SAMPLE_LIMIT = int(os.getenv("HEXBIN_SAMPLE_LIMIT", "200000"))
+ANNOTATE_LIMIT = 15
+
+OTHER_LABEL = "Other"
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def data_key(df, columns, kind):
+    """Hash of the columns a chart depends on"""
+    present = [c for c in columns if c in df.columns]
+    digest = hashlib.sha1(kind.encode())
+    digest.update(",".join(present).encode())
+    digest.update(pd.util.hash_pandas_object(df[present], index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _cached(key, render):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    fig = render()
+    with _cache_lock:
+        _cache[key] = fig
+        while len(_cache) > CHART_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return fig
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def top_n_with_other(df, numerator, denominator, n=None, rank_by="spend"):
+    """
+    Ratio metric for the top ``n`` campaigns by ``rank_by``, plus "Other"
+
+    The "Other" bar is the pooled ratio of the remaining campaigns
+    (sum of numerators / sum of denominators), not an average of ratios.
+
+    Returns:
+        pd.Series: Ratio indexed by campaign label
+    """
+    n = n or CHART_TOP_N
+    num = pd.to_numeric(df[numerator], errors="coerce").fillna(0)
+    den = pd.to_numeric(df[denominator], errors="coerce").fillna(0)
+    rank = pd.to_numeric(df[rank_by], errors="coerce").fillna(0)
+    labels = df["campaign_id"].astype(str)
+
+    top = rank.nlargest(n).index
+    ratio = (num[top] / den[top].where(den[top] > 0)).fillna(0)
+    series = pd.Series(ratio.values, index=labels[top].values)
+
+    rest = df.index.difference(top)
+    if len(rest):
+        rest_den = den[rest].sum()
+        series[OTHER_LABEL] = num[rest].sum() / rest_den if rest_den > 0 else 0.0
+    return series
+
+
+def _bar_chart(values, ylabel, title):
+    fig = Figure(figsize=(8, 4))
+    ax = fig.add_subplot(111)
+    colors = ["#9e9e9e" if label == OTHER_LABEL else "#1f77b4" for label in values.index]
+    ax.bar(np.arange(len(values)), values.values, color=colors)
+    ax.set_xticks(np.arange(len(values)))
+    ax.set_xticklabels(values.index, rotation=45 if len(values) > 8 else 0, ha="right")
+    ax.set_xlabel("Campaign ID (top by spend)")
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.grid(True, axis="y", alpha=0.2)
+    fig.tight_layout()
+    return fig
+
+
+def plot_spend_vs_conversions(df):
+    """Scatter of spend vs conversions; a hexbin density for large accounts"""
+    def render():
+        spend = pd.to_numeric(df["spend"], errors="coerce").fillna(0)
+        conversions = pd.to_numeric(df["conversions"], errors="coerce").fillna(0)
+        x, y = spend.to_numpy(), conversions.to_numpy()
+
+        fig = Figure(figsize=(8, 5))
+        ax = fig.add_subplot(111)
+        if len(x) <= SCATTER_POINT_LIMIT:
+            ax.scatter(x, y, s=12 if len(x) > 100 else 36)
+            title = "Spend vs Conversions (by campaign)"
+        else:
+            if len(x) > HEXBIN_SAMPLE_LIMIT:
+                sample = np.random.default_rng(0).choice(len(x), HEXBIN_SAMPLE_LIMIT, replace=False)
+                x, y = x[sample], y[sample]
+            density = ax.hexbin(x, y, gridsize=40, bins="log", mincnt=1, cmap="viridis")
+            fig.colorbar(density, ax=ax, label="Campaigns")
+            title = f"Spend vs Conversions ({len(df):,} campaigns, density)"
+
+        # Label only the biggest spenders so the plot stays readable
+        labels = df["campaign_id"].astype(str)
+        for i in spend.nlargest(ANNOTATE_LIMIT).index:
+            ax.annotate(labels[i], (spend[i], conversions[i]), fontsize=8)
+
+        ax.set_xlabel("Spend")
+        ax.set_ylabel("Conversions")
+        ax.set_title(title)
+        ax.grid(True, alpha=0.2)
+        return fig
+
+    return _cached(data_key(df, ["campaign_id", "spend", "conversions"], "spend_conv"), render)
+
+
+def plot_ctr(df):
+    """CTR of the top campaigns by spend, plus the pooled CTR of the rest"""
+    def render():
+        return _bar_chart(top_n_with_other(df, "clicks", "impressions"), "CTR", "CTR by Campaign")
+
+    return _cached(data_key(df, ["campaign_id", "spend", "clicks", "impressions"], "ctr"), render)
+
+
+def plot_cpa(df):
+    """CPA of the top campaigns by spend, plus the pooled CPA of the rest"""
+    def render():
+        return _bar_chart(top_n_with_other(df, "spend", "conversions"), "CPA", "CPA by Campaign")
+
+    return _cached(data_key(df, ["campaign_id", "spend", "conversions"], "cpa"), render)
@@ -11,7 +11,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from crew import create_ad_optimizer_crew
+from crew import run_ad_optimizer_crew
 
 
 def run_optimization(campaign_json):
@@ -35,12 +35,9 @@ def run_optimization(campaign_json):
         if len(campaigns) == 0:
             return "❌ Error: Provide at least one campaign\n\nExample:\n[{\"campaign_id\": 1, \"spend\": 1000}]"
 
-        # Create crew and run optimization
-        print("🤖 Creating optimization crew...")
-        crew = create_ad_optimizer_crew(campaigns)
-
+        # Run optimization on a pooled agent set
         print("🚀 Running optimization...")
-        result = crew.kickoff()
+        result = run_ad_optimizer_crew(campaigns)
 
         # Format results nicely
         output = "✅ OPTIMIZATION COMPLETE\n\n"
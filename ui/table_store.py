@@ -0,0 +1,166 @@
+"""
+Server-side campaign table for the Gradio UI
+
+The full campaign set stays in a CampaignStore on the server (one per
+session, held in ``gr.State``); the browser only ever receives the page it
+is looking at. Filtering and sorting run vectorized in pandas, and the
+resulting row order is cached until the query or the data changes, so
+turning pages is a cheap slice even for accounts with 50k+ campaigns.
+"""
+import pandas as pd
+
+ROW_ID = "row"
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZES = [25, 50, 100, 250]
+ALL_PLATFORMS = "All"
+
+
+class CampaignStore:
+    """In-memory campaign table with paging, sorting and filtering"""
+
+    def __init__(self, df=None, columns=None):
+        df = pd.DataFrame(columns=columns or []) if df is None else df
+        self._df = df.reset_index(drop=True)
+        self._version = 0
+        self._view_key = None
+        self._view = None
+        self._search_text = None
+
+    @classmethod
+    def from_records(cls, records, columns=None):
+        df = pd.DataFrame(records)
+        for col in columns or []:
+            if col not in df.columns:
+                df[col] = None
+        return cls(df[columns] if columns else df, columns=columns)
+
+    def __len__(self):
+        return len(self._df)
+
+    @property
+    def columns(self):
+        return list(self._df.columns)
+
+    def to_frame(self):
+        return self._df
+
+    def records(self, limit=None):
+        df = self._df if limit is None else self._df.head(limit)
+        return df.astype(object).where(df.notna(), "").to_dict(orient="records")
+
+    def platforms(self):
+        if "platform" not in self._df.columns:
+            return []
+        return sorted(str(p) for p in self._df["platform"].dropna().unique())
+
+    def _search_index(self):
+        if self._search_text is None:
+            text = pd.Series("", index=self._df.index)
+            for col in self._df.columns:
+                text = text + " " + self._df[col].astype(str)
+            self._search_text = text.str.lower()
+        return self._search_text
+
+    def query(self, search="", platform=None, sort_by=None, descending=False):
+        """
+        Row positions matching the filters, in sort order
+
+        Args:
+            search: Case-insensitive substring matched against every column
+            platform: Only rows on this platform (None or "All" for every one)
+            sort_by: Column to sort on; numeric columns sort numerically
+            descending: Sort direction
+
+        Returns:
+            np.ndarray: Positions into the stored table
+        """
+        key = (self._version, search or "", platform or ALL_PLATFORMS, sort_by, bool(descending))
+        if key == self._view_key:
+            return self._view
+
+        mask = pd.Series(True, index=self._df.index)
+        if search:
+            mask &= self._search_index().str.contains(search.lower(), regex=False)
+        if platform and platform != ALL_PLATFORMS and "platform" in self._df.columns:
+            mask &= self._df["platform"].astype(str) == platform
+
+        matching = self._df.index[mask]
+        if sort_by in self._df.columns:
+            values = self._df.loc[matching, sort_by]
+            numeric = pd.to_numeric(values, errors="coerce")
+            keys = numeric if numeric.notna().any() else values.astype(str)
+            matching = keys.sort_values(ascending=not descending, kind="stable",
+                                        na_position="last").index
+
+        self._view_key, self._view = key, matching.to_numpy()
+        return self._view
+
+    def page(self, page=1, page_size=DEFAULT_PAGE_SIZE, **query):
+        """
+        One page of the filtered, sorted table
+
+        Returns:
+            tuple: (page DataFrame with a leading ROW_ID column, 1-based page
+                number actually shown, page count, matching row count)
+        """
+        positions = self.query(**query)
+        pages = max(1, -(-len(positions) // page_size))
+        page = min(max(1, int(page)), pages)
+        chunk = positions[(page - 1) * page_size: page * page_size]
+
+        df = self._df.iloc[chunk].copy()
+        df.insert(0, ROW_ID, chunk)
+        return df, page, pages, len(positions)
+
+    def apply_edits(self, page_df, shown_rows=None):
+        """
+        Write an edited page back into the store
+
+        Rows keep their place through the ROW_ID column; rows without one
+        (added in the browser) are appended.
+
+        Args:
+            page_df: The page as edited in the browser
+            shown_rows: ROW_ID values of the page as it was served (e.g.
+                ``store.page(...)[0][ROW_ID]`` with the same query); those
+                missing from ``page_df`` were deleted in the browser
+
+        Returns:
+            int: Rows updated, added or deleted
+        """
+        if page_df is None:
+            return 0
+        edits = page_df.copy()
+        columns = [c for c in edits.columns if c != ROW_ID]
+        for col in columns:
+            if col not in self._df.columns:
+                self._df[col] = None
+
+        row_ids = pd.to_numeric(edits.get(ROW_ID, pd.Series(float("nan"), index=edits.index)),
+                                errors="coerce")
+        existing = row_ids.notna() & row_ids.between(0, len(self._df) - 1)
+
+        updated = edits[existing]
+        if len(updated):
+            positions = row_ids[existing].astype(int).to_numpy()
+            for col in columns:
+                self._df.loc[positions, col] = updated[col].to_numpy()
+
+        deleted = []
+        if shown_rows is not None and ROW_ID in edits.columns:
+            kept = set(row_ids[existing].astype(int))
+            deleted = sorted({int(r) for r in shown_rows} - kept)
+        if deleted:
+            self._df = self._df.drop(index=deleted).reset_index(drop=True)
+
+        added = edits.loc[~existing, columns]
+        added = added[added.notna().any(axis=1) & (added.astype(str) != "").any(axis=1)]
+        if len(added):
+            self._df = pd.concat([self._df, added], ignore_index=True)
+
+        self._invalidate()
+        return len(updated) + len(added) + len(deleted)
+
+    def _invalidate(self):
+        self._version += 1
+        self._search_text = None